@@ -4,6 +4,7 @@ Controllers - HTTP request handlers for news endpoints
 from models import News, ApiResponse
 from services import NewsService, CategoryService, MediaService
 from utils import parse_json, get_query_param
+from core.responses import RawJSON
 import json
 
 
@@ -65,14 +66,14 @@ class NewsController:
     def get_news_by_id(news_id: int, query_params: dict = None) -> tuple:
         """GET /api/news/{id} - Get a specific news article"""
         try:
-            news = NewsService.get_news_by_id(news_id)
+            body = NewsService.get_news_json(news_id)
             
-            if not news:
+            if body is None:
                 response = ApiResponse(success=False, error='News article not found')
                 return (404, response.to_dict())
             
-            response = ApiResponse(success=True, data=news.to_dict())
-            return (200, response.to_dict())
+            # The cached article bytes are spliced in without re-encoding
+            return (200, RawJSON.object(success=True, data=RawJSON(body)))
             
         except Exception as e:
             response = ApiResponse(success=False, error=str(e))
@@ -430,18 +431,13 @@ class PageController:
     def get_categories_page(query_params: dict = None) -> tuple:
         """GET /api/pages/categories - Get categories page data"""
         try:
-            categories = CategoryService.get_all_categories()
+            # Optional number of newest articles to include per category
+            preview = min(max(int(get_query_param(query_params, 'preview', 0)), 0), 10)
             
-            # Get article count for each category
-            categories_with_counts = []
-            for category in categories:
-                articles = NewsService.get_news_by_category(category.name, limit=1)
-                category_dict = category.to_dict()
-                category_dict['article_count'] = len(NewsService.get_news_by_category(category.name))
-                categories_with_counts.append(category_dict)
+            categories = CategoryService.get_categories_overview(preview_limit=preview)
             
             data = {
-                'categories': categories_with_counts
+                'categories': categories
             }
             
             response = ApiResponse(success=True, data=data)
@@ -3,10 +3,18 @@ Database layer - SQLite connection management and initialization
 """
 import sqlite3
 import os
+import sys
 from typing import Optional, List, Dict, Any
 from contextlib import contextmanager
 import threading
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from core.instrumentation import InstrumentedConnection
+from core.search import trigram_script
+
+# Schema scripts shared with the root database package
+SQL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'database', 'sql')
+
 class DatabaseManager:
     """Manages SQLite database connections and operations"""
     
@@ -43,7 +51,7 @@ class DatabaseManager:
                         title TEXT NOT NULL,
                         content TEXT NOT NULL,
                         author TEXT,
-                        category TEXT,
+                        category_id INTEGER REFERENCES categories(id),
                         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                         updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                     )
@@ -72,12 +80,12 @@ class DatabaseManager:
                     )
                 ''')
                 
-                # Create index for faster queries
-                cursor.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_category 
-                    ON news(category)
-                ''')
+                # Databases created before category_id still store the category name
+                cursor.execute('PRAGMA table_info(news)')
+                if any(column[1] == 'category' for column in cursor.fetchall()):
+                    self.run_sql_script(cursor, 'migrate_category_id.sql')
                 
+                # Create index for faster queries
                 cursor.execute('''
                     CREATE INDEX IF NOT EXISTS idx_created_at 
                     ON news(created_at DESC)
@@ -88,15 +96,29 @@ class DatabaseManager:
                     ON categories(slug)
                 ''')
                 
+                # Category foreign key index, search indexes, trigger-maintained row counters and the change log
+                self.run_sql_script(cursor, 'categories.sql')
+                self.run_sql_script(cursor, 'listing.sql')
+                self.run_sql_script(cursor, 'search.sql')
+                self.run_sql_script(cursor, trigram_script(cursor))
+                self.run_sql_script(cursor, 'counters.sql')
+                self.run_sql_script(cursor, 'statistics.sql')
+                self.run_sql_script(cursor, 'changes.sql')
+                
                 conn.commit()
                 self.initialized = True
         except sqlite3.Error as e:
             raise Exception(f"Database initialization error: {str(e)}")
     
+    def run_sql_script(self, cursor, name: str):
+        """Run one of the shared schema scripts in database/sql"""
+        with open(os.path.join(SQL_DIR, name), 'r') as f:
+            cursor.executescript(f.read())
+    
     @contextmanager
     def get_connection(self):
         """Get database connection context manager"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, factory=InstrumentedConnection)
         conn.row_factory = sqlite3.Row
         try:
             yield conn
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Bulk import script - Stream NDJSON or CSV articles into the news table
+
+Usage:
+    python3 import_news.py archive.ndjson
+    python3 import_news.py archive.csv --batch-size 20000 --rejects rejects.ndjson
+    zcat archive.ndjson.gz | python3 import_news.py --format ndjson
+
+Each record needs `title` and `content`; `author`, `category`, `created_at`
+and `updated_at` are optional; categories are given by name and created if
+they do not exist yet, and dates are ISO 8601 (stored in local time, like
+the app's own writes). Records are validated with `News.validate`
+and written in large batched transactions instead of one connection per
+insert. Secondary indexes on `news` are dropped for the duration of the
+import and rebuilt once at the end. Within each batch the per-row triggers
+are suspended: the search indexes, counters and statistics are brought up
+to date in one pass per batch, and the change log gets a single `reset`
+marker instead of a row per article. Each batch commits with every trigger
+back in place, so an interrupted import leaves only whole batches behind.
+"""
+import argparse
+import csv
+import functools
+import io
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, Optional, TextIO, Tuple
+
+sys.path.append(os.path.dirname(__file__))
+
+from database import db_manager
+from models import News
+from services import CategoryService
+
+INSERT_SQL = '''
+    INSERT INTO news (title, content, author, category_id, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+FORMATS_BY_EXTENSION = {
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+    '.json': 'ndjson',
+    '.csv': 'csv'
+}
+
+
+class ImportStats:
+    """Running counters for an import"""
+
+    def __init__(self):
+        self.read = 0
+        self.inserted = 0
+        self.rejected = 0
+        self.started = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def rate(self) -> float:
+        """Inserted rows per second"""
+        elapsed = self.elapsed
+        return self.inserted / elapsed if elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'read': self.read,
+            'inserted': self.inserted,
+            'rejected': self.rejected,
+            'seconds': round(self.elapsed, 2),
+            'rows_per_second': round(self.rate, 1)
+        }
+
+
+def detect_format(path: str, explicit: Optional[str] = None) -> str:
+    """Pick the input format from --format or the file extension"""
+    if explicit:
+        return explicit
+    _, ext = os.path.splitext(path.lower())
+    return FORMATS_BY_EXTENSION.get(ext, 'ndjson')
+
+
+def read_records(stream: TextIO, fmt: str) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """Yield (line_number, record, error) without loading the input into memory"""
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record, None
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, None, f'Invalid JSON: {e}'
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, 'Record must be a JSON object'
+            continue
+        yield line_number, record, None
+
+
+def text_field(record: Dict[str, Any], name: str) -> Optional[str]:
+    """A field as text; numbers and booleans are converted, objects and lists rejected"""
+    value = record.get(name)
+    if value is None:
+        return None
+    if isinstance(value, (dict, list)):
+        raise ValueError(f'{name} must be a string')
+    return value if isinstance(value, str) else str(value)
+
+
+def timestamp_field(record: Dict[str, Any], name: str) -> Optional[str]:
+    """An ISO 8601 timestamp as the app stores it: local time, `str(datetime)`
+    
+    created_at and updated_at are compared as text by sorting, cursors and
+    date filters, so imported rows use the form the write path gives
+    `datetime.now()` ('YYYY-MM-DD HH:MM:SS[.ffffff]'). Times with an offset
+    are converted to local time; times without one are taken as local.
+    """
+    value = text_field(record, name)
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError:
+        raise ValueError(f'Invalid date for {name}: {value}')
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return str(parsed)
+
+
+def record_to_row(record: Dict[str, Any],
+                  resolve_category: Callable[[Optional[str]], Optional[int]] = CategoryService.resolve_category_id) -> tuple:
+    """Validate a record with the News model rules and build an insert row"""
+    news = News(
+        title=(text_field(record, 'title') or '').strip(),
+        content=(text_field(record, 'content') or '').strip(),
+        author=text_field(record, 'author') or None,
+        category=text_field(record, 'category') or None
+    )
+    is_valid, error = news.validate()
+    if not is_valid:
+        raise ValueError(error)
+
+    created_at = timestamp_field(record, 'created_at') or str(datetime.now())
+    updated_at = timestamp_field(record, 'updated_at') or created_at
+    return (news.title, news.content, news.author, resolve_category(news.category),
+            created_at, updated_at)
+
+
+@contextmanager
+def deferred_indexes(conn, table: str = 'news'):
+    """Drop the table's secondary indexes and rebuild them on exit
+    
+    Indexes that a crashed import leaves missing only cost speed, and the
+    server recreates them when it starts (`CREATE INDEX IF NOT EXISTS` in
+    init_db); on exit, only the ones still missing are built.
+    """
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT name, sql FROM sqlite_master "
+        "WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+        (table,)
+    )
+    indexes = [(row['name'], row['sql']) for row in cursor.fetchall()]
+    for name, _ in indexes:
+        cursor.execute(f'DROP INDEX IF EXISTS "{name}"')
+    conn.commit()
+    try:
+        yield [name for name, _ in indexes]
+    finally:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ?", (table,))
+        existing = {row['name'] for row in cursor.fetchall()}
+        for name, sql in indexes:
+            if name not in existing:
+                cursor.execute(sql)
+        conn.commit()
+
+
+# Per-row insert triggers on news, and the statements that do their work
+# for every row with an id above ?1 in one pass instead
+DEFERRED_TRIGGERS = {
+    'news_fts_insert': (
+        '''
+        INSERT INTO news_fts (rowid, title, content, author)
+        SELECT id, title, content, author FROM news WHERE id > ?1
+        ''',
+    ),
+    'news_trigram_insert': (
+        '''
+        INSERT INTO news_trigram (rowid, title, author)
+        SELECT id, title, author FROM news WHERE id > ?1
+        ''',
+    ),
+    'news_trigrams_insert': (
+        '''
+        INSERT OR IGNORE INTO news_trigrams (trigram, news_id)
+        SELECT lower(substr(n.title, p.i, 3)), n.id
+        FROM news n JOIN trigram_positions p ON p.i <= length(n.title) - 2
+        WHERE n.id > ?1
+        UNION
+        SELECT lower(substr(n.author, p.i, 3)), n.id
+        FROM news n JOIN trigram_positions p ON p.i <= length(n.author) - 2
+        WHERE n.id > ?1
+        ''',
+    ),
+    'news_counts_insert': (
+        '''
+        UPDATE row_counts SET row_count = row_count + (SELECT COUNT(*) FROM news WHERE id > ?1)
+        WHERE table_name = 'news'
+        ''',
+        '''
+        INSERT INTO category_article_counts (category_id, article_count)
+        SELECT COALESCE(category_id, 0), COUNT(*) FROM news WHERE id > ?1 GROUP BY COALESCE(category_id, 0)
+        ON CONFLICT(category_id) DO UPDATE SET article_count = article_count + excluded.article_count
+        ''',
+    ),
+    'news_authors_insert': (
+        '''
+        INSERT INTO author_article_counts (author, article_count)
+        SELECT COALESCE(author, ''), COUNT(*) FROM news WHERE id > ?1 GROUP BY COALESCE(author, '')
+        ON CONFLICT(author) DO UPDATE SET article_count = article_count + excluded.article_count
+        ''',
+    ),
+    # One reset marker per batch instead of a 'created' row per article
+    # (see database/sql/changes.sql)
+    'news_change_insert': (
+        '''
+        INSERT INTO change_log (entity, entity_id, action)
+        SELECT 'article', 0, 'reset' WHERE EXISTS (SELECT 1 FROM news WHERE id > ?1)
+        ''',
+    )
+}
+
+
+@contextmanager
+def deferred_triggers(conn):
+    """Run a batch with the per-row insert triggers on news suspended
+    
+    Opens a write transaction and drops the triggers inside it. Imported
+    rows get ids above the current maximum, so on exit each trigger's work
+    is done for all of them with the statements in DEFERRED_TRIGGERS, and
+    the triggers are recreated, all before the caller commits. Schema
+    changes are transactional in SQLite: no committed state ever lacks a
+    trigger, and an interrupted batch rolls back as a whole.
+    """
+    cursor = conn.cursor()
+    cursor.execute('BEGIN IMMEDIATE')
+    cursor.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND name IN (%s)"
+        % ', '.join('?' * len(DEFERRED_TRIGGERS)),
+        tuple(DEFERRED_TRIGGERS)
+    )
+    triggers = [(row['name'], row['sql']) for row in cursor.fetchall()]
+    
+    cursor.execute('SELECT COALESCE(MAX(id), 0) FROM news')
+    last_id = cursor.fetchone()[0]
+    for name, _ in triggers:
+        cursor.execute(f'DROP TRIGGER "{name}"')
+    yield
+    for name, sql in triggers:
+        for statement in DEFERRED_TRIGGERS[name]:
+            cursor.execute(statement, (last_id,))
+        cursor.execute(sql)
+
+
+def import_articles(stream: TextIO, fmt: str = 'ndjson', batch_size: int = 10000,
+                    defer_indexes: bool = True, rejects: Optional[TextIO] = None,
+                    progress: Optional[TextIO] = None) -> ImportStats:
+    """Stream records from `stream` into the news table in batched transactions"""
+    if batch_size < 1:
+        raise ValueError('Batch size must be at least 1')
+
+    db_manager.init_db()
+    stats = ImportStats()
+    # Category names repeat heavily; look each one up (or create it) only once
+    resolve_category = functools.lru_cache(maxsize=None)(CategoryService.resolve_category_id)
+
+    with db_manager.get_connection() as conn:
+        conn.execute('PRAGMA temp_store = MEMORY')
+        conn.execute('PRAGMA cache_size = -65536')
+
+        def flush(batch: list):
+            with deferred_triggers(conn):
+                conn.executemany(INSERT_SQL, batch)
+            conn.commit()
+            stats.inserted += len(batch)
+            if progress:
+                progress.write(f"  {stats.inserted:,} rows imported "
+                               f"({stats.rate:,.0f} rows/s, {stats.rejected:,} rejected)\n")
+                progress.flush()
+
+        def run():
+            batch = []
+            for line_number, record, error in read_records(stream, fmt):
+                stats.read += 1
+                if error is None:
+                    try:
+                        batch.append(record_to_row(record, resolve_category))
+                    except ValueError as e:
+                        error = str(e)
+                if error is not None:
+                    stats.rejected += 1
+                    if rejects:
+                        rejects.write(json.dumps({'line': line_number, 'error': error, 'record': record}) + '\n')
+                    continue
+                if len(batch) >= batch_size:
+                    flush(batch)
+                    batch = []
+            if batch:
+                flush(batch)
+
+        if defer_indexes:
+            with deferred_indexes(conn):
+                run()
+            if progress:
+                progress.write('  Indexes rebuilt\n')
+        else:
+            run()
+
+    return stats
+
+
+def open_input(path: str) -> TextIO:
+    """Open the input file, or stdin for '-'"""
+    if path == '-':
+        return io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', newline='')
+    return open(path, 'r', encoding='utf-8', newline='')
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Bulk import articles from NDJSON or CSV')
+    parser.add_argument('path', nargs='?', default='-', help="Input file, or '-' for stdin (default)")
+    parser.add_argument('--format', choices=['ndjson', 'csv'], help='Input format (default: from extension, else ndjson)')
+    parser.add_argument('--batch-size', type=int, default=10000, help='Rows per transaction (default: 10000)')
+    parser.add_argument('--rejects', help='Write rejected records to this NDJSON file')
+    parser.add_argument('--keep-indexes', action='store_true', help='Maintain indexes during the import instead of rebuilding at the end')
+    parser.add_argument('--quiet', action='store_true', help='Only print the final summary')
+    args = parser.parse_args(argv)
+
+    fmt = detect_format(args.path, args.format)
+    rejects = open(args.rejects, 'w', encoding='utf-8') if args.rejects else None
+
+    print(f"Importing {fmt} from {'stdin' if args.path == '-' else args.path}...", file=sys.stderr)
+    try:
+        with open_input(args.path) as stream:
+            stats = import_articles(
+                stream,
+                fmt=fmt,
+                batch_size=args.batch_size,
+                defer_indexes=not args.keep_indexes,
+                rejects=rejects,
+                progress=None if args.quiet else sys.stderr
+            )
+    finally:
+        if rejects:
+            rejects.close()
+
+    summary = stats.to_dict()
+    print(f"✓ Imported {summary['inserted']:,} of {summary['read']:,} records "
+          f"in {summary['seconds']}s ({summary['rows_per_second']:,} rows/s)")
+    if stats.rejected:
+        where = f" (see {args.rejects})" if args.rejects else ''
+        print(f"✗ Rejected {stats.rejected:,} records{where}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
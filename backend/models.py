@@ -16,6 +16,7 @@ class News:
     id: Optional[int] = None
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
+    category_id: Optional[int] = None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert model to dictionary"""
@@ -25,6 +26,7 @@ class News:
             'content': self.content,
             'author': self.author,
             'category': self.category,
+            'category_id': self.category_id,
             'created_at': self.created_at,
             'updated_at': self.updated_at
         }
@@ -39,7 +41,8 @@ class News:
             author=data.get('author'),
             category=data.get('category'),
             created_at=data.get('created_at'),
-            updated_at=data.get('updated_at')
+            updated_at=data.get('updated_at'),
+            category_id=data.get('category_id')
         )
     
     def validate(self) -> tuple[bool, Optional[str]]:
@@ -4,8 +4,20 @@ Service layer - Business logic for news operations
 from typing import List, Optional, Dict, Any
 from database import db_manager
 from models import News
+from core.cache import ReadThroughCache, data_generation
+from core.json_encoding import dumps
+from core.search import BM25_RANK, build_match_query
 import math
 
+# Article rows with the category name resolved from category_id
+NEWS_SELECT = '''
+    SELECT news.*, (SELECT name FROM categories WHERE categories.id = news.category_id) AS category
+    FROM news
+'''
+
+# Articles by id as encoded JSON bytes; writes to an id drop just that entry
+news_cache = ReadThroughCache(1024)
+
 
 class NewsService:
     """Service layer for news operations"""
@@ -17,27 +29,39 @@ class NewsService:
         if not is_valid:
             raise ValueError(error)
         
+        category_id = CategoryService.resolve_category_id(news.category)
         query = '''
-            INSERT INTO news (title, content, author, category)
+            INSERT INTO news (title, content, author, category_id)
             VALUES (?, ?, ?, ?)
         '''
-        params = (news.title, news.content, news.author, news.category)
+        params = (news.title, news.content, news.author, category_id)
         news_id = db_manager.execute_insert(query, params)
+        data_generation.bump()
         return news_id
     
     @staticmethod
     def get_news_by_id(news_id: int) -> Optional[News]:
         """Get a news article by ID"""
-        query = 'SELECT * FROM news WHERE id = ?'
+        query = NEWS_SELECT + ' WHERE id = ?'
         result = db_manager.fetch_one(query, (news_id,))
         if result:
             return News.from_dict(result)
         return None
     
+    @staticmethod
+    def get_news_json(news_id: int) -> Optional[bytes]:
+        """Get a news article by ID as encoded JSON, served from `news_cache`"""
+        return news_cache.get(news_id, NewsService._load_news_json)
+    
+    @staticmethod
+    def _load_news_json(news_id: int) -> Optional[bytes]:
+        news = NewsService.get_news_by_id(news_id)
+        return dumps(news.to_dict()) if news else None
+    
     @staticmethod
     def get_all_news(limit: int = None, offset: int = 0) -> List[News]:
         """Get all news articles with optional pagination"""
-        query = 'SELECT * FROM news ORDER BY created_at DESC'
+        query = NEWS_SELECT + ' ORDER BY created_at DESC'
         
         if limit:
             query += ' LIMIT ? OFFSET ?'
@@ -49,15 +73,18 @@ class NewsService:
     
     @staticmethod
     def get_news_count() -> int:
-        """Get total count of news articles"""
-        query = 'SELECT COUNT(*) as count FROM news'
+        """Get total count of news articles (trigger-maintained counter)"""
+        query = "SELECT row_count AS count FROM row_counts WHERE table_name = 'news'"
         result = db_manager.fetch_one(query)
         return result['count'] if result else 0
     
     @staticmethod
     def get_news_by_category(category: str, limit: int = None, offset: int = 0) -> List[News]:
-        """Get news articles by category"""
-        query = 'SELECT * FROM news WHERE category = ? ORDER BY created_at DESC'
+        """Get news articles by category name"""
+        query = NEWS_SELECT + '''
+            WHERE category_id = (SELECT id FROM categories WHERE name = ?)
+            ORDER BY created_at DESC
+        '''
         
         if limit:
             query += ' LIMIT ? OFFSET ?'
@@ -69,15 +96,19 @@ class NewsService:
     
     @staticmethod
     def search_news(search_term: str, limit: int = None, offset: int = 0) -> List[News]:
-        """Search news by title, content, or author"""
+        """Search news by title, content, or author (FTS5 index, best match first)"""
+        match = build_match_query(search_term)
+        if not match:
+            return []
+        
         query = '''
-            SELECT * FROM news 
-            WHERE title LIKE ? OR content LIKE ? OR author LIKE ?
-            ORDER BY created_at DESC
+            SELECT news.*, (SELECT name FROM categories WHERE categories.id = news.category_id) AS category
+            FROM news_fts
+            CROSS JOIN news ON news.id = news_fts.rowid
+            WHERE news_fts MATCH ? AND news_fts.rank MATCH ?
+            ORDER BY news_fts.rank
         '''
-        
-        search_param = f'%{search_term}%'
-        params = (search_param, search_param, search_param)
+        params = (match, BM25_RANK)
         
         if limit:
             query += ' LIMIT ? OFFSET ?'
@@ -98,13 +129,16 @@ class NewsService:
         if not is_valid:
             raise ValueError(error)
         
+        category_id = CategoryService.resolve_category_id(news.category)
         query = '''
             UPDATE news 
-            SET title = ?, content = ?, author = ?, category = ?, updated_at = CURRENT_TIMESTAMP
+            SET title = ?, content = ?, author = ?, category_id = ?, updated_at = CURRENT_TIMESTAMP
             WHERE id = ?
         '''
-        params = (news.title, news.content, news.author, news.category, news_id)
+        params = (news.title, news.content, news.author, category_id, news_id)
         result = db_manager.execute_update(query, params)
+        data_generation.bump()
+        news_cache.invalidate(news_id)
         return result > 0
     
     @staticmethod
@@ -112,6 +146,8 @@ class NewsService:
         """Delete a news article"""
         query = 'DELETE FROM news WHERE id = ?'
         result = db_manager.execute_update(query, (news_id,))
+        data_generation.bump()
+        news_cache.invalidate(news_id)
         return result > 0
     
     @staticmethod
@@ -126,10 +162,12 @@ class NewsService:
         pages = math.ceil(total / limit)
         offset = (page - 1) * limit
         
-        news_list = NewsService.get_all_news(limit, offset)
+        # Rows are already plain dicts; skip the News model round trip
+        query = NEWS_SELECT + ' ORDER BY created_at DESC LIMIT ? OFFSET ?'
+        news_list = db_manager.execute_query(query, (limit, offset))
         
         return {
-            'data': [n.to_dict() for n in news_list],
+            'data': news_list,
             'pagination': {
                 'total': total,
                 'page': page,
@@ -140,24 +178,27 @@ class NewsService:
     
     @staticmethod
     def get_statistics() -> Dict[str, Any]:
-        """Get news statistics"""
-        total = NewsService.get_news_count()
-        query = 'SELECT category, COUNT(*) as count FROM news GROUP BY category'
+        """Get news statistics from the trigger-maintained aggregates"""
+        totals_query = '''
+            SELECT
+                (SELECT row_count FROM row_counts WHERE table_name = 'news') AS total_articles,
+                (SELECT row_count FROM row_counts WHERE table_name = 'categories') AS total_categories,
+                (SELECT row_count FROM row_counts WHERE table_name = 'media') AS total_media,
+                (SELECT value FROM news_statistics WHERE name = 'distinct_authors') AS total_authors
+        '''
+        totals = db_manager.fetch_one(totals_query) or {}
+        query = '''
+            SELECT c.name AS category, cc.article_count AS count
+            FROM category_article_counts cc
+            LEFT JOIN categories c ON c.id = cc.category_id
+        '''
         categories = db_manager.execute_query(query)
 
-        # Include total categories and media counts
-        try:
-            total_categories = CategoryService.get_category_count()
-            total_media = MediaService.get_media_count()
-        except Exception:
-            # Fallback: compute category count from query or zero
-            total_categories = len(categories)
-            total_media = 0
-
         return {
-            'total_articles': total,
-            'total_categories': total_categories,
-            'total_media': total_media,
+            'total_articles': totals.get('total_articles') or 0,
+            'total_categories': totals.get('total_categories') or 0,
+            'total_media': totals.get('total_media') or 0,
+            'total_authors': totals.get('total_authors') or 0,
             'categories': {item['category'] or 'Uncategorized': item['count'] for item in categories}
         }
 
@@ -181,8 +222,26 @@ class CategoryService:
         '''
         params = (category.name, category.description, slug)
         category_id = db_manager.execute_insert(query, params)
+        data_generation.bump()
         return category_id
     
+    @staticmethod
+    def resolve_category_id(name: Optional[str]) -> Optional[int]:
+        """Map a category name to its id, creating the category on first use"""
+        if not name:
+            return None
+        
+        result = db_manager.fetch_one('SELECT id FROM categories WHERE name = ?', (name,))
+        if result:
+            return result['id']
+        
+        slug = name.lower().replace(' ', '-').replace('_', '-')
+        query = '''
+            INSERT INTO categories (name, description, slug)
+            VALUES (?, ?, ?)
+        '''
+        return db_manager.execute_insert(query, (name, '', slug))
+    
     @staticmethod
     def get_category_by_id(category_id: int):
         """Get a category by ID"""
@@ -201,6 +260,47 @@ class CategoryService:
         results = db_manager.execute_query(query)
         return [Category.from_dict(row) for row in results]
     
+    @staticmethod
+    def get_categories_overview(preview_limit: int = 0) -> List[Dict[str, Any]]:
+        """Get all categories with article counts, latest article date and previews
+        
+        Counts come from the trigger-maintained `category_article_counts`
+        table and the latest date from an index seek per category, so the
+        cost does not grow with the number of articles. With
+        `preview_limit`, the newest articles of every category are fetched in
+        one additional query.
+        """
+        query = '''
+            SELECT c.*,
+                   COALESCE(cc.article_count, 0) AS article_count,
+                   (SELECT MAX(n.created_at) FROM news n WHERE n.category_id = c.id) AS latest_article_at
+            FROM categories c
+            LEFT JOIN category_article_counts cc ON cc.category_id = c.id
+            ORDER BY c.name
+        '''
+        categories = db_manager.execute_query(query)
+        
+        if preview_limit > 0 and categories:
+            query = '''
+                SELECT c.name AS category_name, n.id, n.title, n.author, n.created_at,
+                       substr(n.content, 1, 200) AS excerpt
+                FROM categories c
+                JOIN news n ON n.id IN (
+                    SELECT id FROM news
+                    WHERE category_id = c.id
+                    ORDER BY created_at DESC, id DESC
+                    LIMIT ?
+                )
+                ORDER BY c.name, n.created_at DESC, n.id DESC
+            '''
+            previews: Dict[str, List[Dict[str, Any]]] = {}
+            for row in db_manager.execute_query(query, (preview_limit,)):
+                previews.setdefault(row.pop('category_name'), []).append(row)
+            for category in categories:
+                category['latest_articles'] = previews.get(category['name'], [])
+        
+        return categories
+    
     @staticmethod
     def update_category(category_id: int, category) -> bool:
         """Update a category"""
@@ -217,6 +317,9 @@ class CategoryService:
         '''
         params = (category.name, category.description, slug, category_id)
         result = db_manager.execute_update(query, params)
+        data_generation.bump()
+        # Cached news rows embed the category name
+        news_cache.clear()
         return result > 0
     
     @staticmethod
@@ -224,12 +327,14 @@ class CategoryService:
         """Delete a category"""
         query = 'DELETE FROM categories WHERE id = ?'
         result = db_manager.execute_update(query, (category_id,))
+        data_generation.bump()
+        news_cache.clear()
         return result > 0
     
     @staticmethod
     def get_category_count() -> int:
-        """Get total number of categories"""
-        query = 'SELECT COUNT(*) as count FROM categories'
+        """Get total number of categories (trigger-maintained counter)"""
+        query = "SELECT row_count AS count FROM row_counts WHERE table_name = 'categories'"
         result = db_manager.fetch_one(query)
         return result['count'] if result else 0
 
@@ -302,7 +407,7 @@ class MediaService:
     
     @staticmethod
     def get_media_count() -> int:
-        """Get total number of media files"""
-        query = 'SELECT COUNT(*) as count FROM media'
+        """Get total number of media files (trigger-maintained counter)"""
+        query = "SELECT row_count AS count FROM row_counts WHERE table_name = 'media'"
         result = db_manager.fetch_one(query)
         return result['count'] if result else 0
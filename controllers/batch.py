@@ -0,0 +1,80 @@
+"""
+Batch Controller - Runs several GET requests in one round trip
+"""
+from concurrent.futures import ThreadPoolExecutor
+from router import call_handler, extract_path, parse_query_string
+from core.instrumentation import set_current_route
+from core.request import parse_json
+from core.responses import ApiResponse, RawJSON
+from database.connection import db_connection
+
+# Most requests accepted in one batch
+MAX_BATCH_SIZE = 20
+
+# Threads running the requests of batches in parallel, shared by all batches
+BATCH_WORKERS = 4
+
+_executor = ThreadPoolExecutor(BATCH_WORKERS, thread_name_prefix='batch')
+
+class BatchController:
+    """Dispatches batched requests through the router it is registered on"""
+    
+    def __init__(self, router):
+        self.router = router
+    
+    def batch(self, body: bytes, query_params: dict = None) -> tuple:
+        """POST /api/batch - Run up to MAX_BATCH_SIZE GET requests in-process
+        
+        The body is `{"requests": [{"path": "/api/statistics"}, ...]}` (plain
+        path strings work too). `data` lists `{"status", "body"}` for each
+        request in order, exactly as the request would have returned it; one
+        failing request doesn't fail the batch. GET handlers only read, so
+        the requests run in parallel.
+        """
+        try:
+            data = parse_json(body)
+            requests = data.get('requests') if isinstance(data, dict) else None
+            if not isinstance(requests, list) or not requests:
+                raise ValueError('requests must be a non-empty list')
+            if len(requests) > MAX_BATCH_SIZE:
+                raise ValueError(f"At most {MAX_BATCH_SIZE} requests per batch")
+            urls = [BatchController._url(request) for request in requests]
+            
+            results = list(_executor.map(self._run, urls))
+            return (200, RawJSON.object(success=True, data=RawJSON(b'[' + b','.join(results) + b']')))
+            
+        except ValueError as e:
+            response = ApiResponse(success=False, error=str(e))
+            return (400, response.to_dict())
+        except Exception as e:
+            response = ApiResponse(success=False, error=str(e))
+            return (500, response.to_dict())
+    
+    @staticmethod
+    def _url(request) -> str:
+        url = request.get('path') if isinstance(request, dict) else request
+        if not isinstance(url, str) or not url.startswith('/api/'):
+            raise ValueError(f"Invalid batch request: {request}")
+        return url
+    
+    def _run(self, url: str) -> bytes:
+        """One request's `{"status", "body"}` as JSON bytes"""
+        path = extract_path(url)
+        route, params = self.router.dispatch('GET', path)
+        if route is None:
+            return RawJSON.object(status=404, body={'success': False, 'error': 'Not found'}).body
+        if route.streams:
+            # Refused before the handler runs, so no export query is started
+            error = f'{path} streams its response and cannot be batched'
+            return RawJSON.object(status=400, body={'success': False, 'error': error}).body
+        
+        set_current_route(f'GET {route.pattern}')
+        try:
+            status_code, response_data = call_handler(route.handler, params, parse_query_string(url))
+        except Exception as e:
+            status_code, response_data = 500, {'success': False, 'error': str(e)}
+        finally:
+            set_current_route(None)
+            db_connection.release()
+        
+        return RawJSON.object(status=status_code, body=response_data).body
@@ -0,0 +1,34 @@
+"""
+Change Feed Controller - Incremental sync over the change log
+"""
+from services.change_feed_service import change_feed
+from core.request import get_query_param, get_list_param
+from core.responses import ApiResponse
+
+class ChangeFeedController:
+    @staticmethod
+    def get_changes(query_params: dict = None) -> tuple:
+        """GET /api/changes - Article, category and media changes after seq `since`
+        
+        Returns the latest state of each changed row (`data` is null for a
+        deletion) and the `next` seq to pass as `since`. Without `since`
+        only `next` is returned; `reset` means the client must reload in
+        full. `entity` (comma-separated) narrows the feed and `fields`
+        selects article columns.
+        """
+        try:
+            since = get_query_param(query_params, 'since')
+            limit = int(get_query_param(query_params, 'limit', 100))
+            entities = get_list_param(query_params, 'entity')
+            fields = get_list_param(query_params, 'fields')
+            
+            result = change_feed.get_changes(int(since) if since else None, limit, entities, fields)
+            response = ApiResponse(success=True, data=result)
+            return (200, response.to_dict())
+            
+        except ValueError as e:
+            response = ApiResponse(success=False, error=str(e))
+            return (400, response.to_dict())
+        except Exception as e:
+            response = ApiResponse(success=False, error=str(e))
+            return (500, response.to_dict())
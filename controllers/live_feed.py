@@ -0,0 +1,34 @@
+"""
+Live Feed Controller - Streams article changes as server-sent events
+"""
+from services.live_feed_service import live_feed
+from core.request import get_query_param
+from core.responses import ApiResponse, StreamResponse
+
+class LiveFeedController:
+    @staticmethod
+    def stream_articles(query_params: dict = None) -> tuple:
+        """GET /api/stream/articles - Article created/updated/deleted events over SSE
+        
+        Each event's id is its change log seq. A reconnecting EventSource
+        sends it back as Last-Event-ID (also accepted as `last_event_id`) and
+        first receives the events it missed.
+        """
+        try:
+            last_event_id = get_query_param(query_params, 'last_event_id')
+            if last_event_id not in (None, ''):
+                try:
+                    last_event_id = int(last_event_id)
+                except ValueError:
+                    raise ValueError(f"Invalid last_event_id: {last_event_id}")
+            else:
+                last_event_id = None
+            
+            return (200, StreamResponse(live_feed.stream(last_event_id), 'text/event-stream'))
+            
+        except ValueError as e:
+            response = ApiResponse(success=False, error=str(e))
+            return (400, response.to_dict())
+        except Exception as e:
+            response = ApiResponse(success=False, error=str(e))
+            return (500, response.to_dict())
@@ -1,25 +1,79 @@
 """
 Manage Article Controller - Handles article management operations
 """
-from services.manage_article_service import ManageArticleService
-from core.request import parse_json, get_query_param
-from core.responses import ApiResponse
+from services.manage_article_service import ManageArticleService, FACET_LIMIT, LISTING_FILTERS, DEFAULT_SORT, EXPORT_FORMATS
+from services.suggest_service import suggest_service
+from core.request import parse_json, get_query_param, get_list_param, get_bool_param
+from core.responses import ApiResponse, RawJSON, StreamResponse, gzip_chunks
+from core.cache import response_cache
 
 class ManageArticleController:
     @staticmethod
     def get_all_articles(query_params: dict = None) -> tuple:
-        """GET /api/articles - Get all articles with pagination"""
+        """GET /api/articles - Get all articles with pagination
+        
+        Offset pagination uses `page`; keyset pagination is selected with an
+        `after` token (or `pagination=cursor` for the first page). Any of
+        `category`, `author`, `from`, `to` (exclusive) and `updated_since`
+        narrow the list, and `sort` is `newest`, `oldest` or `updated`.
+        """
         try:
             page = int(get_query_param(query_params, 'page', 1))
             limit = int(get_query_param(query_params, 'limit', 10))
+            fields = get_list_param(query_params, 'fields')
+            after = get_query_param(query_params, 'after')
+            filters = {name: get_query_param(query_params, name) for name in LISTING_FILTERS}
+            sort = get_query_param(query_params, 'sort', DEFAULT_SORT)
             
-            result = ManageArticleService.get_paginated_articles(page, limit)
+            if after or get_query_param(query_params, 'pagination') == 'cursor':
+                include_total = get_bool_param(query_params, 'include_total', False)
+                result = ManageArticleService.get_articles_after(
+                    limit, after, as_json=True, fields=fields, include_total=include_total,
+                    filters=filters, sort=sort
+                )
+            else:
+                include_total = get_bool_param(query_params, 'include_total', True)
+                result = ManageArticleService.get_paginated_articles(
+                    page, limit, as_json=True, fields=fields, include_total=include_total,
+                    filters=filters, sort=sort
+                )
             
-            response = ApiResponse(success=True, data=result['data'])
-            response_dict = response.to_dict()
-            response_dict['pagination'] = result['pagination']
-            return (200, response_dict)
+            response = RawJSON.object(
+                success=True,
+                data=RawJSON(result['data']),
+                pagination=result['pagination']
+            )
+            return (200, response)
             
+        except ValueError as e:
+            response = ApiResponse(success=False, error=str(e))
+            return (400, response.to_dict())
+        except Exception as e:
+            response = ApiResponse(success=False, error=str(e))
+            return (500, response.to_dict())
+    
+    @staticmethod
+    def export_articles(query_params: dict = None) -> tuple:
+        """GET /api/articles/export - Stream every matching article as a file
+        
+        `format` is `csv` (default) or `ndjson`; `gzip=true` compresses the
+        file on the fly. Takes the same filters, `sort` and `fields` as
+        GET /api/articles.
+        """
+        try:
+            fmt = get_query_param(query_params, 'format', 'csv')
+            fields = get_list_param(query_params, 'fields')
+            filters = {name: get_query_param(query_params, name) for name in LISTING_FILTERS}
+            sort = get_query_param(query_params, 'sort', DEFAULT_SORT)
+            
+            chunks = ManageArticleService.export_articles(fmt, filters, sort, fields)
+            if get_bool_param(query_params, 'gzip', False):
+                return (200, StreamResponse(gzip_chunks(chunks), 'application/gzip', f'articles.{fmt}.gz'))
+            return (200, StreamResponse(chunks, EXPORT_FORMATS[fmt], f'articles.{fmt}'))
+            
+        except ValueError as e:
+            response = ApiResponse(success=False, error=str(e))
+            return (400, response.to_dict())
         except Exception as e:
             response = ApiResponse(success=False, error=str(e))
             return (500, response.to_dict())
@@ -28,14 +82,13 @@ class ManageArticleController:
     def get_article(article_id: int, query_params: dict = None) -> tuple:
         """GET /api/articles/{id} - Get specific article"""
         try:
-            article = ManageArticleService.get_article_by_id(article_id)
+            article = ManageArticleService.get_article_json(article_id)
             
             if not article:
                 response = ApiResponse(success=False, error='Article not found')
                 return (404, response.to_dict())
             
-            response = ApiResponse(success=True, data=article)
-            return (200, response.to_dict())
+            return (200, RawJSON.object(success=True, data=RawJSON(article)))
             
         except Exception as e:
             response = ApiResponse(success=False, error=str(e))
@@ -89,58 +142,116 @@ class ManageArticleController:
     
     @staticmethod
     def search_articles(query_params: dict = None) -> tuple:
-        """GET /api/articles/search - Search articles"""
+        """GET /api/articles/search - Search articles
+        
+        `q` runs a ranked full-text search (paginated with `page`/`limit`,
+        optionally narrowed by `category`); `mode=infix` matches `q` as a
+        substring of titles and authors instead. `facets=1` adds category,
+        author and month counts over all matches (`facet_limit` buckets
+        each). `category` alone lists the whole category.
+        """
         try:
             search_term = get_query_param(query_params, 'q', '')
             category = get_query_param(query_params, 'category', None)
+            fields = get_list_param(query_params, 'fields')
             
             if not search_term and not category:
                 response = ApiResponse(success=False, error='Search term or category required')
                 return (400, response.to_dict())
             
-            results = ManageArticleService.search_articles(search_term, category)
-            response = ApiResponse(success=True, data=results)
+            if search_term:
+                page = int(get_query_param(query_params, 'page', 1))
+                limit = int(get_query_param(query_params, 'limit', 20))
+                mode = get_query_param(query_params, 'mode', 'words')
+                facets = get_bool_param(query_params, 'facets', False)
+                facet_limit = int(get_query_param(query_params, 'facet_limit', FACET_LIMIT))
+                result = ManageArticleService.search_articles(
+                    search_term, category, page, limit, as_json=True, fields=fields, mode=mode,
+                    facets=facets, facet_limit=facet_limit
+                )
+                extra = {'facets': result['facets']} if facets else {}
+                response = RawJSON.object(
+                    success=True,
+                    data=RawJSON(result['data']),
+                    pagination=result['pagination'],
+                    **extra
+                )
+            else:
+                results = ManageArticleService.get_articles_by_category(category, as_json=True, fields=fields)
+                response = RawJSON.object(success=True, data=RawJSON(results))
+            return (200, response)
+            
+        except ValueError as e:
+            response = ApiResponse(success=False, error=str(e))
+            return (400, response.to_dict())
+        except Exception as e:
+            response = ApiResponse(success=False, error=str(e))
+            return (500, response.to_dict())
+    
+    @staticmethod
+    def suggest(query_params: dict = None) -> tuple:
+        """GET /api/articles/suggest - Typeahead suggestions (titles, authors, categories)"""
+        try:
+            prefix = get_query_param(query_params, 'q', '')
+            limit = min(max(int(get_query_param(query_params, 'limit', 8)), 1), 20)
+            
+            suggestions = suggest_service.suggest(prefix, limit)
+            response = ApiResponse(success=True, data=suggestions)
             return (200, response.to_dict())
             
+        except ValueError as e:
+            response = ApiResponse(success=False, error=str(e))
+            return (400, response.to_dict())
         except Exception as e:
             response = ApiResponse(success=False, error=str(e))
             return (500, response.to_dict())
     
     @staticmethod
+    @response_cache.cached
     def get_home_data(query_params: dict = None) -> tuple:
         """GET /api/pages/home - Get home page data"""
         try:
-            featured_articles = ManageArticleService.get_featured_articles(6)
+            fields = get_list_param(query_params, 'fields')
+            featured_articles = ManageArticleService.get_featured_articles(6, as_json=True, fields=fields)
             stats = ManageArticleService.get_statistics()
             
-            data = {
-                'featured_articles': featured_articles,
-                'statistics': stats
-            }
+            data = RawJSON.object(
+                featured_articles=RawJSON(featured_articles),
+                statistics=stats
+            )
             
-            response = ApiResponse(success=True, data=data)
-            return (200, response.to_dict())
+            response = RawJSON.object(success=True, data=data)
+            return (200, response)
             
+        except ValueError as e:
+            response = ApiResponse(success=False, error=str(e))
+            return (400, response.to_dict())
         except Exception as e:
             response = ApiResponse(success=False, error=str(e))
             return (500, response.to_dict())
     
     @staticmethod
+    @response_cache.cached
     def get_latest_news(query_params: dict = None) -> tuple:
         """GET /api/pages/latest - Get latest news"""
         try:
             limit = int(get_query_param(query_params, 'limit', 20))
-            latest_articles = ManageArticleService.get_latest_articles(limit)
+            fields = get_list_param(query_params, 'fields')
+            latest_articles = ManageArticleService.get_latest_articles(limit, as_json=True, fields=fields)
             
-            data = {'latest_articles': latest_articles}
-            response = ApiResponse(success=True, data=data)
-            return (200, response.to_dict())
+            data = RawJSON.object(latest_articles=RawJSON(latest_articles))
+            response = RawJSON.object(success=True, data=data)
+            return (200, response)
             
+        except ValueError as e:
+            response = ApiResponse(success=False, error=str(e))
+            return (400, response.to_dict())
         except Exception as e:
             response = ApiResponse(success=False, error=str(e))
             return (500, response.to_dict())
     
     @staticmethod
+    @response_cache.cached
     def get_statistics(query_params: dict = None) -> tuple:
         """GET /api/statistics - Get statistics"""
         try:
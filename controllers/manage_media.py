@@ -2,19 +2,36 @@
 Manage Media Controller - Handles media management operations
 """
 from services.manage_media_service import ManageMediaService
-from core.request import parse_multipart
+from core.request import parse_multipart, get_query_param, get_bool_param
 from core.responses import ApiResponse
 import os
 
 class ManageMediaController:
     @staticmethod
     def get_all_media(query_params: dict = None) -> tuple:
-        """GET /api/media - Get all media"""
+        """GET /api/media - Get all media
+        
+        Passing `limit` (and then the returned `after` token) switches to
+        keyset pagination over (uploaded_at, id).
+        """
         try:
+            limit = get_query_param(query_params, 'limit')
+            after = get_query_param(query_params, 'after')
+            
+            if limit or after:
+                include_total = get_bool_param(query_params, 'include_total', False)
+                result = ManageMediaService.get_media_after(int(limit or 50), after, include_total)
+                response_dict = ApiResponse(success=True, data=result['data']).to_dict()
+                response_dict['pagination'] = result['pagination']
+                return (200, response_dict)
+            
             media_list = ManageMediaService.get_all_media()
             response = ApiResponse(success=True, data=media_list)
             return (200, response.to_dict())
             
+        except ValueError as e:
+            response = ApiResponse(success=False, error=str(e))
+            return (400, response.to_dict())
         except Exception as e:
             response = ApiResponse(success=False, error=str(e))
             return (500, response.to_dict())
@@ -0,0 +1,43 @@
+"""
+Metrics Controller - Exposes runtime instrumentation
+"""
+from core.cache import response_cache
+from core.instrumentation import query_stats
+from core.request import get_query_param
+from core.responses import ApiResponse
+from services.manage_article_service import ManageArticleService
+
+class MetricsController:
+    @staticmethod
+    def get_query_stats(query_params: dict = None) -> tuple:
+        """GET /api/metrics/queries - Per-statement timings, slowest first"""
+        try:
+            limit = int(get_query_param(query_params, 'limit', 50))
+            if limit < 1:
+                raise ValueError("limit must be at least 1")
+            
+            data = {
+                'slow_threshold_ms': query_stats.slow_threshold_ms,
+                'statements': query_stats.snapshot(limit)
+            }
+            response = ApiResponse(success=True, data=data)
+            return (200, response.to_dict())
+            
+        except ValueError as e:
+            response = ApiResponse(success=False, error=str(e))
+            return (400, response.to_dict())
+        except Exception as e:
+            response = ApiResponse(success=False, error=str(e))
+            return (500, response.to_dict())
+    
+    @staticmethod
+    def get_cache_stats(query_params: dict = None) -> tuple:
+        """GET /api/metrics/caches - Size and hit/miss counters of the in-memory caches"""
+        try:
+            data = dict(ManageArticleService.get_cache_stats(), responses=response_cache.stats())
+            response = ApiResponse(success=True, data=data)
+            return (200, response.to_dict())
+            
+        except Exception as e:
+            response = ApiResponse(success=False, error=str(e))
+            return (500, response.to_dict())
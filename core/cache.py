@@ -0,0 +1,239 @@
+"""
+In-memory caches - bounded LRU maps and the data generation counter
+
+Cached read results are keyed on the current `data_generation`. Every
+write to articles or categories bumps it, so entries computed before the
+write can no longer be hit and age out of the LRU. Nothing is ever
+invalidated by hand. A result computed while a write is in progress is
+stored under the generation read before the query ran, so it cannot be
+served once that write has bumped the counter.
+
+`ReadThroughCache` is the exception: it holds one value per entity id
+(e.g. a single article) across writes, and the writer of an id drops just
+that entry.
+
+`ResponseCache` stores whole GET responses as encoded JSON bytes and runs
+concurrent misses for the same response through `SingleFlight`, so a
+burst of requests right after a write recomputes the response once.
+"""
+import functools
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+from core.json_encoding import dumps
+from core.responses import RawJSON, compute_etag
+
+
+class DataGeneration:
+    """Monotonic counter of committed writes in this process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._value = 0
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def bump(self) -> int:
+        """Record a write; returns the new generation"""
+        with self._lock:
+            self._value += 1
+            return self._value
+
+
+class LRUCache:
+    """Thread-safe mapping holding at most `maxsize` entries, least recently used evicted first"""
+
+    _MISSING = object()
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default=None):
+        """Return the cached value for `key` and mark it most recently used"""
+        with self._lock:
+            value = self._entries.get(key, self._MISSING)
+            if value is self._MISSING:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        """Store `value` under `key`, evicting the least recently used entry when full"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        """Remove `key` if present"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Entry count and hit/miss counters"""
+        with self._lock:
+            return {'size': len(self._entries), 'maxsize': self.maxsize,
+                    'hits': self.hits, 'misses': self.misses}
+
+
+class ReadThroughCache:
+    """LRU of values loaded per key on a miss, invalidated key by key
+
+    A load that overlaps an invalidation of any key is returned but not
+    stored, so a row read just before a write commits can never be cached
+    after that write has invalidated it. `None` (not found) is not cached.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self._entries = LRUCache(maxsize)
+        self._lock = threading.Lock()
+        self._epoch = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, load: Callable[[Hashable], Any]):
+        """Return the cached value for `key`, calling `load(key)` on a miss"""
+        value = self._entries.get(key)
+        if value is not None:
+            return value
+
+        epoch = self._epoch
+        value = load(key)
+        if value is not None:
+            with self._lock:
+                if epoch == self._epoch:
+                    self._entries.put(key, value)
+        return value
+
+    def invalidate(self, key: Hashable):
+        """Drop `key` after a write to it"""
+        with self._lock:
+            self._epoch += 1
+            self.invalidations += 1
+            self._entries.pop(key)
+
+    def clear(self):
+        """Drop every entry, e.g. after a write that touches all of them"""
+        with self._lock:
+            self._epoch += 1
+            self.invalidations += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Entry count, hit/miss counters and invalidations"""
+        return dict(self._entries.stats(), invalidations=self.invalidations)
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one execution
+
+    The first caller for a key runs the function; callers arriving while it
+    runs wait for it and share its result (or its exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class ResponseCache:
+    """Encoded GET responses per handler and query string, until the next write"""
+
+    def __init__(self, maxsize: int = 128):
+        self._entries = LRUCache(maxsize)
+        self._flight = SingleFlight()
+
+    def cached(self, handler: Callable) -> Callable:
+        """Decorate a `handler(query_params) -> (status, data)` controller method
+
+        Successful responses are stored as pre-encoded bytes together with
+        their ETag, so revalidating a cached response hashes nothing;
+        errors are never cached.
+        """
+        name = handler.__qualname__
+
+        @functools.wraps(handler)
+        def wrapper(query_params: dict = None) -> tuple:
+            key = (data_generation.value, name, tuple(sorted((query_params or {}).items())))
+            response = self._entries.get(key)
+            if response is not None:
+                return response
+            return self._flight.do(key, lambda: self._load(key, handler, query_params))
+
+        return wrapper
+
+    def _load(self, key: tuple, handler: Callable, query_params: dict) -> tuple:
+        # A concurrent leader may have stored it between our miss and taking the flight
+        response = self._entries.get(key)
+        if response is not None:
+            return response
+
+        status, data = handler(query_params)
+        if not isinstance(data, RawJSON):
+            data = RawJSON(dumps(data))
+        response = (status, data)
+        if status == 200:
+            data.etag = data.etag or compute_etag(data.body)
+            self._entries.put(key, response)
+        return response
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Entry count, hit/miss counters and misses that waited on another thread"""
+        return dict(self._entries.stats(), coalesced=self._flight.coalesced)
+
+
+data_generation = DataGeneration()
+response_cache = ResponseCache()
@@ -0,0 +1,55 @@
+"""
+In-process event bus - notify in-memory indexes and caches of writes
+
+The change log service (services/change_log_service.py) publishes
+`(entity, action, entity_id)` for every committed write, e.g.
+`events.publish('article', 'updated', 42)`. The write path polls it right
+after committing, so subscribers run synchronously in the writing thread
+and derived state is current by the time the write request returns. A failing subscriber is logged and never
+fails the write.
+
+The action `reset` with no id means any row of the entity may have changed
+(e.g. a bulk import by another process); subscribers reload what they hold.
+"""
+import logging
+import threading
+from typing import Callable, Dict, List
+
+logger = logging.getLogger('nms.events')
+
+Handler = Callable[[str, str, int], None]
+
+
+class EventBus:
+    """Synchronous publish/subscribe keyed by entity name"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, List[Handler]] = {}
+
+    def subscribe(self, entity: str, handler: Handler):
+        """Call `handler(entity, action, entity_id)` for every event on `entity`"""
+        with self._lock:
+            handlers = self._subscribers.setdefault(entity, [])
+            if handler not in handlers:
+                handlers.append(handler)
+
+    def unsubscribe(self, entity: str, handler: Handler):
+        """Stop delivering `entity` events to `handler`"""
+        with self._lock:
+            handlers = self._subscribers.get(entity, [])
+            if handler in handlers:
+                handlers.remove(handler)
+
+    def publish(self, entity: str, action: str, entity_id: int):
+        """Deliver an event to the current subscribers of `entity`"""
+        with self._lock:
+            handlers = list(self._subscribers.get(entity, ()))
+        for handler in handlers:
+            try:
+                handler(entity, action, entity_id)
+            except Exception:
+                logger.exception('event handler failed for %s %s %s', entity, action, entity_id)
+
+
+events = EventBus()
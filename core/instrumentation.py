@@ -0,0 +1,238 @@
+"""
+Query instrumentation - per-statement timings and slow-query logging
+
+Connections opened with `factory=InstrumentedConnection` hand out cursors
+that time every statement, count the rows it produced or changed and tag it
+with the route currently being served. Statements slower than
+`SLOW_QUERY_MS` (environment variable, default 100) are logged together with
+their `EXPLAIN QUERY PLAN` output, which is cached per SQL text. Both maps
+keep at most `MAX_STATEMENTS` distinct statements, least recently executed
+evicted first, so ad-hoc SQL cannot grow them without bound.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger('nms.slow_query')
+
+_context = threading.local()
+
+
+def set_current_route(route: Optional[str]):
+    """Tag queries issued by this thread with the route being served"""
+    _context.route = route
+
+
+def get_current_route() -> str:
+    """Route being served by this thread, or 'internal' outside a request"""
+    return getattr(_context, 'route', None) or 'internal'
+
+
+def normalize_sql(sql: str) -> str:
+    """Collapse whitespace so the same statement always maps to one key"""
+    return ' '.join(sql.split())
+
+
+class QueryStats:
+    """Aggregated statement statistics and the EXPLAIN QUERY PLAN cache"""
+
+    MAX_STATEMENTS = 500
+    MAX_ROUTES_PER_STATEMENT = 20
+
+    def __init__(self, slow_threshold_ms: float = 100.0):
+        self.slow_threshold_ms = slow_threshold_ms
+        self._lock = threading.Lock()
+        self._stats: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._plans: 'OrderedDict[str, List[str]]' = OrderedDict()
+
+    def record(self, conn: sqlite3.Connection, sql: str, params, duration_ms: float,
+               rows: int, route: Optional[str] = None):
+        """Record one execution and log it if it was slow"""
+        key = normalize_sql(sql)
+        route = route or get_current_route()
+
+        with self._lock:
+            entry = self._stats.get(key)
+            if entry is None:
+                entry = self._stats[key] = {
+                    'sql': key,
+                    'calls': 0,
+                    'total_ms': 0.0,
+                    'max_ms': 0.0,
+                    'rows': 0,
+                    'slow_calls': 0,
+                    'routes': {}
+                }
+                while len(self._stats) > self.MAX_STATEMENTS:
+                    self._stats.popitem(last=False)
+            else:
+                self._stats.move_to_end(key)
+            entry['calls'] += 1
+            entry['total_ms'] += duration_ms
+            entry['rows'] += rows
+            if duration_ms > entry['max_ms']:
+                entry['max_ms'] = duration_ms
+            routes = entry['routes']
+            if route in routes or len(routes) < self.MAX_ROUTES_PER_STATEMENT:
+                routes[route] = routes.get(route, 0) + 1
+            is_slow = duration_ms >= self.slow_threshold_ms
+            if is_slow:
+                entry['slow_calls'] += 1
+
+        if is_slow:
+            plan = self.explain(conn, key, params)
+            logger.warning(
+                'slow query %.1fms rows=%d route=%s\n  SQL: %s\n  PLAN:\n%s',
+                duration_ms, rows, route, key,
+                '\n'.join(f'    {line}' for line in plan) or '    (no plan)'
+            )
+
+    def explain(self, conn: sqlite3.Connection, sql: str, params=()) -> List[str]:
+        """EXPLAIN QUERY PLAN for a statement, cached per SQL text"""
+        key = normalize_sql(sql)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+        if plan is not None:
+            return plan
+
+        plan = []
+        try:
+            # A plain cursor so the EXPLAIN itself is not recorded
+            cursor = sqlite3.Cursor(conn)
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params or ())
+            depth = {0: -1}
+            for row in cursor.fetchall():
+                node_id, parent, _, detail = row[0], row[1], row[2], row[3]
+                depth[node_id] = depth.get(parent, -1) + 1
+                plan.append('  ' * depth[node_id] + detail)
+            cursor.close()
+        except (sqlite3.Error, ValueError):
+            plan = []
+
+        with self._lock:
+            self._plans[key] = plan
+            while len(self._plans) > self.MAX_STATEMENTS:
+                self._plans.popitem(last=False)
+        return plan
+
+    def snapshot(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Statements ordered by total time spent, most expensive first"""
+        with self._lock:
+            entries = [dict(entry, routes=dict(entry['routes'])) for entry in self._stats.values()]
+            plans = dict(self._plans)
+
+        entries.sort(key=lambda e: e['total_ms'], reverse=True)
+        result = []
+        for entry in entries[:limit]:
+            entry['total_ms'] = round(entry['total_ms'], 3)
+            entry['max_ms'] = round(entry['max_ms'], 3)
+            entry['avg_ms'] = round(entry['total_ms'] / entry['calls'], 3) if entry['calls'] else 0.0
+            if entry['sql'] in plans:
+                entry['plan'] = plans[entry['sql']]
+            result.append(entry)
+        return result
+
+    def reset(self):
+        """Forget all recorded statements and cached plans"""
+        with self._lock:
+            self._stats.clear()
+            self._plans.clear()
+
+
+query_stats = QueryStats(float(os.environ.get('SLOW_QUERY_MS', 100)))
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that reports each statement to `query_stats`
+
+    SELECT timings include the time spent fetching, so a statement is
+    recorded once its rows are exhausted, the cursor is reused or closed.
+    """
+
+    _pending = None
+
+    def execute(self, sql, parameters=()):
+        self._finish()
+        route = get_current_route()
+        start = time.perf_counter()
+        result = super().execute(sql, parameters)
+        elapsed = time.perf_counter() - start
+        if self.description is None:
+            query_stats.record(self.connection, sql, parameters, elapsed * 1000,
+                               max(self.rowcount, 0), route)
+        else:
+            self._pending = [sql, parameters, elapsed, 0, route]
+        return result
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        route = get_current_route()
+        start = time.perf_counter()
+        result = super().executemany(sql, seq_of_parameters)
+        elapsed = time.perf_counter() - start
+        query_stats.record(self.connection, sql, None, elapsed * 1000,
+                           max(self.rowcount, 0), route)
+        return result
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._add(time.perf_counter() - start, 0 if row is None else 1)
+        if row is None:
+            self._finish()
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._add(time.perf_counter() - start, len(rows))
+        if not rows:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._add(time.perf_counter() - start, len(rows))
+        self._finish()
+        return rows
+
+    def __next__(self):
+        row = self.fetchone()
+        if row is None:
+            raise StopIteration
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+    def _add(self, elapsed: float, rows: int):
+        if self._pending is not None:
+            self._pending[2] += elapsed
+            self._pending[3] += rows
+
+    def _finish(self):
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            sql, parameters, elapsed, rows, route = pending
+            query_stats.record(self.connection, sql, parameters, elapsed * 1000, rows, route)
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors (including `execute()` shortcuts) are instrumented"""
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
@@ -2,13 +2,18 @@
 Core middleware and request handler
 """
 import http.server
+import logging
 import mimetypes
 import os
 import time
 from urllib.parse import urlparse, parse_qs
-from router import parse_query_string, extract_path
-from core.responses import format_response_headers
+from router import call_handler, parse_query_string, extract_path
+from core.responses import format_response_headers, RawJSON, StreamResponse, compute_etag, etag_matches
+from core.json_encoding import dumps
 from core.static import serve_static_file
+from core.instrumentation import set_current_route
+
+logger = logging.getLogger('nms.http')
 
 class RequestHandler(http.server.BaseHTTPRequestHandler):
     """Main HTTP request handler"""
@@ -32,13 +37,17 @@ class RequestHandler(http.server.BaseHTTPRequestHandler):
         self.send_response(200)
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization, If-None-Match, Last-Event-ID')
         self.end_headers()
     
     def _handle_request(self, method: str):
         """Central request handling logic"""
         path = extract_path(self.path)
         query_params = parse_query_string(self.path)
+        # A reconnecting EventSource sends its position as a header
+        last_event_id = self.headers.get('Last-Event-ID')
+        if last_event_id is not None:
+            query_params.setdefault('last_event_id', last_event_id)
         
         try:
             # Serve frontend files
@@ -51,11 +60,12 @@ class RequestHandler(http.server.BaseHTTPRequestHandler):
                 return
             
             # Handle API routes
-            handler, params = self.router.dispatch(method, path)
-            
-            if handler is None:
+            route, params = self.router.dispatch(method, path)
+            if route is None:
                 self._send_response(404, {'success': False, 'error': 'Not found'})
                 return
+            # Tagged by pattern, so /api/articles/1 and /api/articles/2 share one entry
+            set_current_route(f'{method} {route.pattern}')
             
             # Read request body
             body = b''
@@ -63,42 +73,88 @@ class RequestHandler(http.server.BaseHTTPRequestHandler):
             if content_length:
                 body = self.rfile.read(int(content_length))
             
-            # Call handler
-            if params:
-                handler_params = {}
-                for key, value in params.items():
-                    try:
-                        handler_params[key] = int(value)
-                    except (ValueError, TypeError):
-                        handler_params[key] = value
-                
-                if body:
-                    status_code, response_data = handler(handler_params.get('id'), body, query_params)
-                else:
-                    status_code, response_data = handler(handler_params.get('id'), query_params)
-            else:
-                if body:
-                    status_code, response_data = handler(body, query_params)
-                else:
-                    status_code, response_data = handler(query_params)
+            status_code, response_data = call_handler(route.handler, params, query_params, body)
             
             self._send_response(status_code, response_data)
             
         except Exception as e:
             self._send_response(500, {'success': False, 'error': str(e)})
+        finally:
+            set_current_route(None)
     
     def _send_response(self, status_code: int, data: dict):
-        """Send JSON response"""
-        import json
+        """Send JSON response
+        
+        Successful GET responses carry an ETag - precomputed for cached
+        responses, otherwise a hash of the body - and a request whose
+        If-None-Match matches it gets a 304 without the body.
+        """
+        if isinstance(data, StreamResponse):
+            self._send_stream(status_code, data)
+            return
         
-        response_body = json.dumps(data)
+        etag = None
+        if isinstance(data, RawJSON):
+            response_body = data.body
+            etag = data.etag
+        else:
+            response_body = dumps(data)
+        
+        if self.command == 'GET' and status_code == 200:
+            etag = etag or compute_etag(response_body)
+            if etag_matches(self.headers.get('If-None-Match'), etag):
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.send_header('Cache-Control', 'no-cache')
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                return
+        else:
+            etag = None
         
         self.send_response(status_code)
         self.send_header('Content-Type', 'application/json')
         self.send_header('Access-Control-Allow-Origin', '*')
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
         self.send_header('Content-Length', str(len(response_body)))
         self.end_headers()
-        self.wfile.write(response_body.encode('utf-8'))
+        self.wfile.write(response_body)
+    
+    def _send_stream(self, status_code: int, stream: StreamResponse):
+        """Send a body chunk by chunk as it is produced
+        
+        There is no Content-Length; the body ends when the connection is
+        closed. Streams are never cached, and each chunk is written as soon
+        as it is produced. Once the headers are out an error can only cut the
+        body short, so it is logged rather than turned into a 500.
+        """
+        self.send_response(status_code)
+        self.send_header('Content-Type', stream.content_type)
+        if stream.filename:
+            self.send_header('Content-Disposition', f'attachment; filename="{stream.filename}"')
+        self.send_header('Cache-Control', 'no-cache')
+        # Tell proxies such as nginx not to buffer event streams
+        self.send_header('X-Accel-Buffering', 'no')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        
+        chunks = iter(stream.chunks)
+        try:
+            for chunk in chunks:
+                if chunk:
+                    self.wfile.write(chunk)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        except Exception:
+            logger.exception('streamed response failed for %s', self.path)
+        finally:
+            close = getattr(chunks, 'close', None)
+            if close:
+                close()
     
     def _serve_frontend(self):
         """Serve frontend HTML"""
@@ -0,0 +1,24 @@
+"""
+Keyset pagination helpers - opaque `after=` tokens
+"""
+import base64
+import json
+
+def encode_page_token(position: tuple) -> str:
+    """Encode a sort-key position such as (created_at, id) as an opaque token"""
+    raw = json.dumps(list(position), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_page_token(token: str, size: int = 2) -> tuple:
+    """Decode an `after=` token back into its sort-key position"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, UnicodeError):
+        raise ValueError('Invalid pagination cursor')
+    if not isinstance(position, list) or len(position) != size:
+        raise ValueError('Invalid pagination cursor')
+    # Each value is bound as a query parameter, which must be a scalar
+    if not all(value is None or isinstance(value, (str, int, float)) for value in position):
+        raise ValueError('Invalid pagination cursor')
+    return tuple(position)
@@ -0,0 +1,159 @@
+"""
+Prefix index - in-memory word-prefix lookup ranked by a score
+
+Every word start of an indexed text becomes a key, so "New York Marathon"
+is found by "new", "york ma" and "mar". Keys are kept in one sorted list of
+`(key, ref)` tuples with the score of each entry in a parallel list: a
+lookup is two bisections plus a top-K selection over the matching slice,
+and an update is a bisect insert or delete per word.
+
+A prefix of one to three characters matches a large part of the index, so
+the best entries for each such prefix are kept once it has been looked up,
+and kept current by `add` and `remove`, instead of scanning its slice on
+every keystroke.
+"""
+import heapq
+from bisect import bisect_left
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+
+class PrefixIndex:
+    """Sorted-array prefix index over short strings (titles, names)"""
+
+    MAX_KEY_LENGTH = 48
+    _KEY_END = chr(0x10FFFF)
+
+    # Prefixes up to this long get their top entries cached
+    SHORT_PREFIX_LENGTH = 3
+    # Entries cached per short prefix; leaves room for refs matching through several words
+    SHORT_PREFIX_TOP = 64
+
+    def __init__(self):
+        self._entries: List[Tuple[str, Hashable]] = []
+        self._scores: List[Any] = []
+        self._refs: Dict[Hashable, Tuple[str, ...]] = {}
+        # Short prefix -> its highest-scoring (score, entry) pairs, best first.
+        # Each list is the top len(list) of its slice; `_complete` ones hold all of it.
+        self._top: Dict[str, List[Tuple[Any, Tuple[str, Hashable]]]] = {}
+        self._complete: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._refs)
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Case-fold and collapse whitespace"""
+        return ' '.join((text or '').casefold().split())
+
+    @classmethod
+    def keys_for(cls, text: str) -> Tuple[str, ...]:
+        """One key per word start, truncated to MAX_KEY_LENGTH"""
+        words = cls.normalize(text).split(' ')
+        keys = (' '.join(words[i:])[:cls.MAX_KEY_LENGTH] for i in range(len(words)))
+        return tuple(dict.fromkeys(key for key in keys if key))
+
+    def load(self, items: Iterable[Tuple[Hashable, str, Any]]):
+        """Replace the contents with `(ref, text, score)` items, sorting once"""
+        refs = {}
+        rows = []
+        for ref, text, score in items:
+            keys = refs[ref] = self.keys_for(text)
+            rows.extend(((key, ref), score) for key in keys)
+        rows.sort(key=lambda row: row[0])
+        self._entries = [entry for entry, _ in rows]
+        self._scores = [score for _, score in rows]
+        self._refs = refs
+        self._top = {}
+        self._complete = set()
+
+    def add(self, ref: Hashable, text: str, score):
+        """Index `text` under `ref`, replacing whatever `ref` had before"""
+        if ref in self._refs:
+            self.remove(ref)
+        keys = self.keys_for(text)
+        for key in keys:
+            position = bisect_left(self._entries, (key, ref))
+            self._entries.insert(position, (key, ref))
+            self._scores.insert(position, score)
+            self._top_add((key, ref), score)
+        self._refs[ref] = keys
+
+    def remove(self, ref: Hashable):
+        """Drop every key of `ref`"""
+        for key in self._refs.pop(ref, ()):
+            position = bisect_left(self._entries, (key, ref))
+            if position < len(self._entries) and self._entries[position] == (key, ref):
+                del self._entries[position]
+                del self._scores[position]
+                self._top_remove((key, ref))
+
+    def search(self, prefix: str, limit: int = 10) -> List[Hashable]:
+        """Refs with a word starting with `prefix`, highest score first"""
+        prefix = self.normalize(prefix)
+        if not prefix or limit < 1:
+            return []
+
+        lo = bisect_left(self._entries, (prefix,))
+        hi = bisect_left(self._entries, (prefix + self._KEY_END,), lo)
+        if lo == hi:
+            return []
+
+        if len(prefix) <= self.SHORT_PREFIX_LENGTH:
+            refs = self._search_top(prefix, lo, hi, limit)
+            if refs is not None:
+                return refs
+
+        # A ref can match through several of its words; widen until enough are unique
+        wanted = limit
+        while True:
+            positions = heapq.nlargest(wanted, range(lo, hi), key=self._scores.__getitem__)
+            refs = list(dict.fromkeys(self._entries[i][1] for i in positions))
+            if len(refs) >= limit or wanted >= hi - lo:
+                return refs[:limit]
+            wanted *= 2
+
+    def _search_top(self, prefix: str, lo: int, hi: int, limit: int) -> Optional[List[Hashable]]:
+        """Up to `limit` refs from the cached top of a short prefix, None if it holds too few"""
+        top = self._top.get(prefix)
+        if top is not None:
+            refs = list(dict.fromkeys(entry[1] for _, entry in top))
+            if len(refs) >= limit or prefix in self._complete:
+                return refs[:limit]
+
+        positions = heapq.nlargest(self.SHORT_PREFIX_TOP, range(lo, hi), key=self._scores.__getitem__)
+        top = self._top[prefix] = [(self._scores[i], self._entries[i]) for i in positions]
+        if len(top) == hi - lo:
+            self._complete.add(prefix)
+        else:
+            self._complete.discard(prefix)
+        refs = list(dict.fromkeys(entry[1] for _, entry in top))
+        if len(refs) >= limit or prefix in self._complete:
+            return refs[:limit]
+        return None
+
+    def _short_prefixes(self, key: str) -> Iterable[str]:
+        return dict.fromkeys(key[:length] for length in range(1, min(len(key), self.SHORT_PREFIX_LENGTH) + 1))
+
+    def _top_add(self, entry: Tuple[str, Hashable], score):
+        for prefix in self._short_prefixes(entry[0]):
+            top = self._top.get(prefix)
+            if top is None:
+                continue
+            # Below every cached entry of a partial list, uncached entries may outrank it
+            if prefix not in self._complete and not score >= top[-1][0]:
+                continue
+            position = next((i for i, (cached, _) in enumerate(top) if cached < score), len(top))
+            top.insert(position, (score, entry))
+            if len(top) > self.SHORT_PREFIX_TOP:
+                top.pop()
+                self._complete.discard(prefix)
+
+    def _top_remove(self, entry: Tuple[str, Hashable]):
+        # What remains of a list is still the top of its slice
+        for prefix in self._short_prefixes(entry[0]):
+            top = self._top.get(prefix)
+            if top is None:
+                continue
+            top[:] = [item for item in top if item[1] != entry]
+            if not top and prefix not in self._complete:
+                del self._top[prefix]
@@ -15,6 +15,20 @@ def get_query_param(query_params: dict, key: str, default=None):
     """Get query parameter with default"""
     return query_params.get(key, default) if query_params else default
 
+def get_bool_param(query_params: dict, key: str, default: bool = False) -> bool:
+    """Get a boolean query parameter (1/true/yes or 0/false/no)"""
+    value = get_query_param(query_params, key)
+    if value is None or value == '':
+        return default
+    return str(value).lower() in ('1', 'true', 'yes')
+
+def get_list_param(query_params: dict, key: str, default=None):
+    """Get a comma-separated query parameter as a list of non-empty values"""
+    value = get_query_param(query_params, key)
+    if not value:
+        return default
+    return [item.strip() for item in value.split(',') if item.strip()]
+
 def parse_multipart(body: bytes) -> dict:
     """A small multipart/form-data parser.
 
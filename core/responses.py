@@ -1,6 +1,9 @@
 """
 Response utilities
 """
+import hashlib
+import zlib
+from core.json_encoding import dumps
 
 class ApiResponse:
     """Standard API response format"""
@@ -24,6 +27,56 @@ class ApiResponse:
         
         return result
 
+class RawJSON:
+    """Pre-encoded JSON body that is written to the client as-is"""
+    
+    __slots__ = ('body', 'etag')
+    
+    def __init__(self, body: bytes, etag: str = None):
+        self.body = body
+        self.etag = etag
+    
+    @staticmethod
+    def object(**fields) -> 'RawJSON':
+        """Build a JSON object, splicing RawJSON field values in verbatim"""
+        parts = []
+        for key, value in fields.items():
+            encoded = value.body if isinstance(value, RawJSON) else dumps(value)
+            parts.append(dumps(key) + b':' + encoded)
+        return RawJSON(b'{' + b','.join(parts) + b'}')
+
+class StreamResponse:
+    """Body written to the client chunk by chunk as `chunks` yields bytes"""
+    
+    __slots__ = ('chunks', 'content_type', 'filename')
+    
+    def __init__(self, chunks, content_type: str, filename: str = None):
+        self.chunks = chunks
+        self.content_type = content_type
+        self.filename = filename
+
+def gzip_chunks(chunks):
+    """Gzip a stream of byte chunks on the fly"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def compute_etag(body: bytes) -> str:
+    """Strong entity tag for a response body"""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match header value matches `etag` (weak comparison)"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in candidates or any(
+        (tag[2:] if tag.startswith('W/') else tag) == etag for tag in candidates
+    )
+
 def format_response_headers(status_code: int, content_type: str = 'application/json') -> dict:
     """Format response headers"""
     return {
@@ -0,0 +1,85 @@
+"""
+Full-text search helpers - turn user input into FTS5 MATCH expressions
+
+Search boxes send free text, which is not valid FTS5 syntax in general
+(quotes, colons, parentheses and operators all have meaning). Only two
+constructs are honoured: "quoted phrases" and `prefix*` terms. Everything
+else is split into plain terms, each quoted so the tokenizer treats it as
+data. The last term is matched as a prefix so results follow the user as
+they type.
+
+Infix search (fragments such as "ohnson") goes through a trigram index on
+title and author instead: FTS5's trigram tokenizer where available, else a
+plain trigram table (see database/sql/trigram_fallback.sql).
+"""
+import re
+import sqlite3
+
+# FTS5 rank function: bm25() weighting title, content and author matches
+BM25_RANK = 'bm25(10.0, 1.0, 5.0)'
+
+_TOKEN_RE = re.compile(r'"([^"]*)"?|(\S+)')
+_WORD_RE = re.compile(r'\w+')
+
+
+def _quote(text: str) -> str:
+    """Quote a string as an FTS5 string literal"""
+    return '"' + text.replace('"', '""') + '"'
+
+
+def build_match_query(text: str, prefix_last: bool = True) -> str:
+    """Build an FTS5 MATCH expression from a user search string
+
+    Terms are ANDed together. Returns '' when the input has nothing
+    searchable, which callers should treat as "no results".
+    """
+    terms = []
+    for phrase, bare in _TOKEN_RE.findall(text or ''):
+        if phrase:
+            words = _WORD_RE.findall(phrase)
+            if words:
+                terms.append([_quote(' '.join(words)), False])
+            continue
+        words = _WORD_RE.findall(bare)
+        terms.extend([_quote(word), False] for word in words)
+        if words and bare.endswith('*'):
+            terms[-1][1] = True
+
+    if not terms:
+        return ''
+
+    if prefix_last and not text.rstrip().endswith('"') and not text[-1:].isspace():
+        terms[-1][1] = True
+    return ' '.join(term + '*' if prefix else term for term, prefix in terms)
+
+
+def build_infix_query(text: str) -> str:
+    """Build an FTS5 MATCH expression for a substring search (trigram tokenizer)"""
+    text = (text or '').strip()
+    if len(text) < 3:
+        raise ValueError('Infix search needs at least 3 characters')
+    return _quote(text)
+
+
+_ASCII_LOWER = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+
+
+def fold_case(text: str) -> str:
+    """Strip and lower-case a search fragment the way SQLite's lower() does (ASCII only)"""
+    return (text or '').strip().translate(_ASCII_LOWER)
+
+
+def trigrams(text: str) -> list:
+    """Distinct case-folded 3-character substrings of a search fragment"""
+    text = fold_case(text)
+    return list(dict.fromkeys(text[i:i + 3] for i in range(len(text) - 2)))
+
+
+def trigram_script(cursor) -> str:
+    """Schema script for the infix index this SQLite build supports"""
+    try:
+        cursor.execute("CREATE VIRTUAL TABLE temp.trigram_probe USING fts5(x, tokenize='trigram')")
+        cursor.execute('DROP TABLE temp.trigram_probe')
+        return 'trigram.sql'
+    except sqlite3.OperationalError:
+        return 'trigram_fallback.sql'
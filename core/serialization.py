@@ -0,0 +1,90 @@
+"""
+Row serialization - encode database rows straight to JSON bytes
+
+List endpoints used to build a dict per row and hand the whole structure to
+`json.dumps`. `encode_rows` instead builds one `%`-template per column set,
+encodes the row tuples column by column and fills the template, so no
+intermediate Row objects or dicts are created.
+"""
+import json
+from json.encoder import encode_basestring_ascii
+from typing import Iterable, Sequence
+
+
+def _encode_value(value) -> str:
+    """Encode a single SQLite value as a JSON fragment"""
+    if value is None:
+        return 'null'
+    value_type = type(value)
+    if value_type is str:
+        return encode_basestring_ascii(value)
+    if value_type is int:
+        return int.__repr__(value)
+    if value_type is float:
+        return json.dumps(value)
+    if value_type is bytes:
+        return encode_basestring_ascii(value.decode('utf-8', errors='replace'))
+    return json.dumps(value, default=str)
+
+
+def row_template(columns: Sequence[str]) -> str:
+    """Build a `%`-format template producing one JSON object per row"""
+    fields = ','.join(encode_basestring_ascii(name).replace('%', '%%') + ':%s' for name in columns)
+    return '{' + fields + '}'
+
+
+# Column encoders that run entirely in C when a column holds a single type
+_FAST_ENCODERS = {
+    str: encode_basestring_ascii,
+    int: int.__repr__
+}
+
+
+def _encode_column(values: tuple) -> list:
+    """Encode one column's values, mapping a C encoder over it when possible"""
+    encoder = _FAST_ENCODERS.get(type(values[0]))
+    if encoder is not None:
+        try:
+            return list(map(encoder, values))
+        except TypeError:
+            pass
+    return list(map(_encode_value, values))
+
+
+def encode_rows(columns: Sequence[str], rows: Iterable[Sequence]) -> bytes:
+    """Encode row tuples as a JSON array of objects keyed by `columns`"""
+    rows = rows if isinstance(rows, list) else list(rows)
+    if not rows:
+        return b'[]'
+
+    template = row_template(columns)
+    encoded_columns = [_encode_column(values) for values in zip(*rows)]
+    parts = [template % values for values in zip(*encoded_columns)]
+    return ('[' + ','.join(parts) + ']').encode('utf-8')
+
+
+def encode_row(columns: Sequence[str], row: Sequence) -> bytes:
+    """Encode a single row tuple as a JSON object"""
+    return (row_template(columns) % tuple(map(_encode_value, row))).encode('utf-8')
+
+
+def encode_cursor(cursor) -> bytes:
+    """Fetch all remaining rows of an executed cursor as a JSON array
+
+    Column names are read once from `cursor.description` and rows are
+    fetched as plain tuples, bypassing the connection's row factory.
+    """
+    columns = [column[0] for column in cursor.description]
+    cursor.row_factory = None
+    return encode_rows(columns, cursor.fetchall())
+
+
+def encode_ndjson(columns: Sequence[str], rows: Iterable[Sequence]) -> bytes:
+    """Encode row tuples as newline-delimited JSON objects, one line per row"""
+    rows = rows if isinstance(rows, list) else list(rows)
+    if not rows:
+        return b''
+
+    template = row_template(columns)
+    encoded_columns = [_encode_column(values) for values in zip(*rows)]
+    return ''.join(template % values + '\n' for values in zip(*encoded_columns)).encode('utf-8')
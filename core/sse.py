@@ -0,0 +1,105 @@
+"""
+Server-sent events - frame formatting and a fan-out hub with bounded client buffers
+
+A message is framed once with `sse_event` and published to the hub as
+`(seq, frame)`; every subscriber receives the same bytes object, so a
+change costs one encode and one append per open stream. Each subscriber
+buffers at most `buffer_size` frames. A subscriber that falls further
+behind is marked overflowed and receives nothing more: its stream should
+end, and the client reconnects with Last-Event-ID to catch up.
+"""
+import threading
+from collections import deque
+
+def sse_event(data: bytes, event: str = None, event_id=None) -> bytes:
+    """One event frame; `data` must not contain newlines (compact JSON never does)"""
+    frame = b''
+    if event_id is not None:
+        frame += b'id: %d\n' % event_id
+    if event:
+        frame += b'event: ' + event.encode('utf-8') + b'\n'
+    return frame + b'data: ' + data + b'\n\n'
+
+def sse_comment(text: str) -> bytes:
+    """Comment frame, ignored by EventSource; used as a heartbeat"""
+    return b': ' + text.encode('utf-8') + b'\n\n'
+
+class Subscription:
+    """One client's bounded buffer of (seq, frame) pairs"""
+
+    __slots__ = ('start_seq', 'buffer_size', 'overflowed', '_frames', '_ready')
+
+    def __init__(self, start_seq: int, buffer_size: int):
+        self.start_seq = start_seq
+        self.buffer_size = buffer_size
+        self.overflowed = False
+        self._frames = deque()
+        self._ready = threading.Condition(threading.Lock())
+
+    def push(self, seq: int, frame: bytes):
+        with self._ready:
+            if self.overflowed:
+                return
+            if len(self._frames) >= self.buffer_size:
+                self.overflowed = True
+                self._frames.clear()
+            else:
+                self._frames.append((seq, frame))
+            self._ready.notify()
+
+    def wait(self, timeout: float) -> list:
+        """Buffered (seq, frame) pairs, waiting up to `timeout` seconds for the first"""
+        with self._ready:
+            if not self._frames and not self.overflowed:
+                self._ready.wait(timeout)
+            frames = list(self._frames)
+            self._frames.clear()
+            return frames
+
+class EventHub:
+    """Fan out sequenced frames to every current subscriber"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self.last_seq = 0
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, buffer_size: int) -> Subscription:
+        """Receive frames published from now on; `start_seq` is the last seq published before"""
+        with self._lock:
+            subscription = Subscription(self.last_seq, buffer_size)
+            self._subscribers.add(subscription)
+            return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, seq: int, frame: bytes):
+        """Append a frame to every subscriber's buffer; overflowing subscribers are dropped"""
+        # Under the lock, so a subscriber's start_seq never covers a frame it missed
+        with self._lock:
+            self.last_seq = max(self.last_seq, seq)
+            self.published += 1
+            overflowed = []
+            for subscription in self._subscribers:
+                subscription.push(seq, frame)
+                if subscription.overflowed:
+                    overflowed.append(subscription)
+            self._subscribers.difference_update(overflowed)
+            self.dropped += len(overflowed)
+
+    def advance(self, seq: int) -> bool:
+        """Move last_seq to `seq` without a frame if nobody is subscribed; whether it did"""
+        with self._lock:
+            if self._subscribers:
+                return False
+            self.last_seq = max(self.last_seq, seq)
+            return True
+
+    def stats(self) -> dict:
+        """Open subscribers, frames published and subscribers dropped for falling behind"""
+        return {'subscribers': len(self._subscribers), 'last_seq': self.last_seq,
+                'published': self.published, 'dropped': self.dropped}
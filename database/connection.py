@@ -3,47 +3,111 @@ Database connection and initialization
 """
 import sqlite3
 import os
+import threading
 from datetime import datetime
 from typing import Optional
+from core.instrumentation import InstrumentedConnection
+from core.search import trigram_script
 
 class DatabaseConnection:
+    """Per-thread SQLite connections to one database file
+    
+    The server handles each request on its own thread. Every thread gets a
+    connection of its own, so one request's commit can never commit or
+    break another request's transaction. Connections are pooled: request
+    threads hand theirs back with `release()` when they finish.
+    """
     _instance: Optional['DatabaseConnection'] = None
-    _connection: Optional[sqlite3.Connection] = None
+    
+    # Idle connections kept for reuse by later request threads
+    POOL_SIZE = 16
     
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
+            cls._instance._db_path = None
+            cls._instance._local = threading.local()
+            cls._instance._lock = threading.Lock()
+            cls._instance._idle = []
+            cls._instance._open = []
         return cls._instance
     
+    def _new_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._db_path, check_same_thread=False, factory=InstrumentedConnection)
+        conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._open.append(conn)
+        return conn
+    
+    @property
+    def path(self) -> Optional[str]:
+        """File of the current database"""
+        return self._db_path
+    
     def connect(self, db_path: str = None):
-        """Connect to database"""
+        """Point at a database file (closing connections to any previous one) and connect this thread"""
         if not db_path:
             db_path = os.path.join(os.path.dirname(__file__), '..', 'backend', 'news.db')
         
-        self._connection = sqlite3.connect(db_path, check_same_thread=False)
-        self._connection.row_factory = sqlite3.Row
-        return self._connection
+        self.close()
+        self._db_path = db_path
+        self._local.connection = self._new_connection()
+        return self._local.connection
     
     def get_connection(self) -> sqlite3.Connection:
-        """Get current connection"""
-        if not self._connection:
-            self.connect()
-        return self._connection
+        """Get this thread's connection, taking an idle one from the pool if needed"""
+        conn = getattr(self._local, 'connection', None)
+        if conn is None:
+            if self._db_path is None:
+                return self.connect()
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            self._local.connection = conn or self._new_connection()
+        return self._local.connection
+    
+    def release(self):
+        """Return this thread's connection to the pool (end of a request)"""
+        conn = getattr(self._local, 'connection', None)
+        if conn is None:
+            return
+        self._local.connection = None
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            if conn in self._open and len(self._idle) < self.POOL_SIZE:
+                self._idle.append(conn)
+                return
+            if conn in self._open:
+                self._open.remove(conn)
+        conn.close()
     
     def close(self):
-        """Close connection"""
-        if self._connection:
-            self._connection.close()
-            self._connection = None
+        """Close every connection"""
+        with self._lock:
+            connections, self._open, self._idle = self._open, [], []
+        self._local.connection = None
+        for conn in connections:
+            conn.close()
 
 # Global instance
 db_connection = DatabaseConnection()
 
+# Schema scripts shared with the backend stack (triggers, derived tables)
+SQL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sql')
+
+def run_sql_script(cursor, name: str):
+    """Run one of the schema scripts in database/sql"""
+    with open(os.path.join(SQL_DIR, name), 'r') as f:
+        cursor.executescript(f.read())
+
 def init_db():
     """Initialize database with tables"""
     conn = db_connection.get_connection()
     cursor = conn.cursor()
     
+    # Write-ahead logging: readers on other connections never block the writer
+    cursor.execute('PRAGMA journal_mode=WAL')
+    
     # Create news table
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS news (
@@ -51,7 +115,7 @@ def init_db():
             title TEXT NOT NULL,
             content TEXT NOT NULL,
             author TEXT,
-            category TEXT,
+            category_id INTEGER REFERENCES categories(id),
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
@@ -79,6 +143,31 @@ def init_db():
         )
     ''')
     
+    # Databases created before category_id still store the category name
+    cursor.execute('PRAGMA table_info(news)')
+    if any(column[1] == 'category' for column in cursor.fetchall()):
+        run_sql_script(cursor, 'migrate_category_id.sql')
+    
+    # Composite indexes backing keyset pagination on (timestamp, id)
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_news_created_id
+        ON news(created_at DESC, id DESC)
+    ''')
+    
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_media_uploaded_id
+        ON media(uploaded_at DESC, id DESC)
+    ''')
+    
+    # Category foreign key and listing indexes, search indexes, trigger-maintained row counters and the change log
+    run_sql_script(cursor, 'categories.sql')
+    run_sql_script(cursor, 'listing.sql')
+    run_sql_script(cursor, 'search.sql')
+    run_sql_script(cursor, trigram_script(cursor))
+    run_sql_script(cursor, 'counters.sql')
+    run_sql_script(cursor, 'statistics.sql')
+    run_sql_script(cursor, 'changes.sql')
+    
     # Insert default categories if none exist
     cursor.execute('SELECT COUNT(*) FROM categories')
     if cursor.fetchone()[0] == 0:
@@ -0,0 +1,95 @@
+"""
+Article listing engine - filtered and sorted article lists from a whitelist
+
+`/api/articles` combines any of the filters below with one sort key. The
+SQL is assembled only from the fragments in LISTING_FILTERS and
+LISTING_SORTS, with every user value bound as a parameter, and the text
+of each statement is compiled once per filter shape (which filters are
+set, the sort, the columns and the paging mode). Identical text also lets
+sqlite3 reuse its prepared statement.
+
+Every shape is served by one of the composite indexes in
+database/sql/listing.sql and categories.sql, so rows come out of the
+index in order and the query stops at LIMIT without a sort. A range
+filter on a timestamp column other than the sort column is written as
+`+column`, which stops SQLite from narrowing on that column's index and
+then sorting; it is checked row by row while walking the sort index.
+"""
+from functools import lru_cache
+
+# Filter name -> (column, comparison taking exactly one parameter)
+LISTING_FILTERS = {
+    'category': ('category_id', '= (SELECT id FROM categories WHERE name = ?)'),
+    'author': ('author', '= ?'),
+    'from': ('created_at', '>= ?'),
+    'to': ('created_at', '< ?'),
+    'updated_since': ('updated_at', '>= ?')
+}
+
+# Sort name -> (column, direction); id breaks ties in the same direction
+LISTING_SORTS = {
+    'newest': ('created_at', 'DESC'),
+    'oldest': ('created_at', 'ASC'),
+    'updated': ('updated_at', 'DESC')
+}
+
+DEFAULT_SORT = 'newest'
+
+def listing_shape(filters: dict = None) -> tuple:
+    """Names of the filters that are set, in canonical order"""
+    filters = filters or {}
+    unknown = [name for name in filters if name not in LISTING_FILTERS]
+    if unknown:
+        raise ValueError(f"Unknown filter(s): {', '.join(unknown)}")
+    return tuple(name for name in LISTING_FILTERS if filters.get(name) not in (None, ''))
+
+def listing_params(shape: tuple, filters: dict = None) -> tuple:
+    """Parameters for the conditions of `shape`, in statement order"""
+    return tuple(filters[name] for name in shape)
+
+def _where(conditions: list) -> str:
+    return ' WHERE ' + ' AND '.join(conditions) if conditions else ''
+
+def _conditions(shape: tuple, sort_column: str = None) -> list:
+    """WHERE conditions for `shape`, keeping range filters off other sort indexes"""
+    sort_columns = {column for column, _ in LISTING_SORTS.values()}
+    conditions = []
+    for name in shape:
+        column, comparison = LISTING_FILTERS[name]
+        if sort_column and column in sort_columns and column != sort_column:
+            column = '+' + column
+        conditions.append(f'{column} {comparison}')
+    return conditions
+
+@lru_cache(maxsize=512)
+def compile_listing(shape: tuple, sort: str, columns: str, keyset: bool = False,
+                    after: bool = False) -> str:
+    """SELECT statement for a filter shape and sort
+
+    Offset statements take the filter parameters then LIMIT and OFFSET.
+    Keyset statements (`keyset`) also select the sort key as the last two
+    columns and take LIMIT only; with `after` they continue past a
+    `(sort value, id)` position given after the filter parameters.
+    """
+    if sort not in LISTING_SORTS:
+        raise ValueError(f"Unknown sort: {sort}")
+    column, direction = LISTING_SORTS[sort]
+
+    conditions = _conditions(shape, column)
+    if after:
+        operator = '<' if direction == 'DESC' else '>'
+        conditions.append(f'({column}, id) {operator} (?, ?)')
+
+    select = columns
+    if keyset:
+        select += f', {column} AS _sort_key, id AS _sort_id'
+    paging = 'LIMIT ?' if keyset else 'LIMIT ? OFFSET ?'
+    return (
+        f'SELECT {select} FROM news{_where(conditions)} '
+        f'ORDER BY {column} {direction}, id {direction} {paging}'
+    )
+
+@lru_cache(maxsize=64)
+def compile_count(shape: tuple) -> str:
+    """COUNT(*) statement for a filter shape"""
+    return 'SELECT COUNT(*) FROM news' + _where(_conditions(shape))
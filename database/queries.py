@@ -2,8 +2,194 @@
 Database queries for all entities
 """
 from database.connection import db_connection
+from database.listing import DEFAULT_SORT, compile_count, compile_listing, listing_params, listing_shape
+from core.cache import ReadThroughCache, data_generation
+from core.serialization import encode_cursor, encode_row, encode_rows
+from core.search import BM25_RANK, build_infix_query, build_match_query, fold_case, trigrams
 from datetime import datetime
 
+# Article fields selectable with `fields=`, mapped to their SQL expressions
+ARTICLE_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'content': 'content',
+    'excerpt': 'substr(content, 1, 200) AS excerpt',
+    'author': 'author',
+    'category': '(SELECT name FROM categories WHERE categories.id = news.category_id) AS category',
+    'category_id': 'category_id',
+    'created_at': 'created_at',
+    'updated_at': 'updated_at'
+}
+
+# Full article rows (the historical `SELECT *` shape)
+ARTICLE_DEFAULT_FIELDS = ('id', 'title', 'content', 'author', 'category', 'category_id', 'created_at', 'updated_at')
+
+# Lightweight projection for card grids: an excerpt instead of the full body
+ARTICLE_CARD_FIELDS = ('id', 'title', 'excerpt', 'author', 'category', 'category_id', 'created_at', 'updated_at')
+
+# Single articles kept as encoded JSON; writes to an id drop just that entry
+ARTICLE_CACHE_SIZE = 1024
+article_cache = ReadThroughCache(ARTICLE_CACHE_SIZE)
+
+# Facets returned by search: category name, author and created_at month (YYYY-MM)
+SEARCH_FACETS = ('category', 'author', 'month')
+
+def article_field_names(fields=None) -> tuple:
+    """Validate requested article fields; the output column names, without duplicates"""
+    fields = fields or ARTICLE_DEFAULT_FIELDS
+    unknown = [f for f in fields if f not in ARTICLE_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    return tuple(dict.fromkeys(fields))
+
+def article_columns(fields=None) -> str:
+    """Build an explicit SELECT column list from whitelisted article fields"""
+    return ', '.join(ARTICLE_FIELDS[f] for f in article_field_names(fields))
+
+def _fetch_rows(cursor, as_json: bool = False):
+    """Return fetched rows as dicts, or as JSON array bytes when `as_json`"""
+    if as_json:
+        return encode_cursor(cursor)
+    return [dict(row) for row in cursor.fetchall()]
+
+def _resolve_category_id(cursor, name: str):
+    """Map a category name to its id, creating the category on first use"""
+    if not name:
+        return None
+    
+    cursor.execute('SELECT id FROM categories WHERE name = ?', (name,))
+    row = cursor.fetchone()
+    if row:
+        return row[0]
+    
+    # OR IGNORE: a concurrent request may create the same category first
+    cursor.execute('''
+        INSERT OR IGNORE INTO categories (name, description, created_at)
+        VALUES (?, ?, ?)
+    ''', (name, '', datetime.now()))
+    cursor.execute('SELECT id FROM categories WHERE name = ?', (name,))
+    return cursor.fetchone()[0]
+
+def _search_category_filter(category: str = None) -> tuple:
+    """Join restricting full-text matches to a category, and its parameters
+
+    CROSS JOIN keeps news_fts as the outer loop: the match set is filtered
+    row by row instead of probing the FTS index once per category article.
+    """
+    if not category:
+        return '', ()
+    join = '''
+        CROSS JOIN news AS matched ON matched.id = news_fts.rowid
+            AND matched.category_id = (SELECT id FROM categories WHERE name = ?)
+    '''
+    return join, (category,)
+
+def _infix_filter(cursor, term: str, category: str = None) -> tuple:
+    """WHERE condition for articles whose title or author contains `term`
+
+    Uses the FTS5 trigram index when this database has one, otherwise the
+    news_trigrams fallback table, with instr() confirming candidate rows.
+    """
+    match = build_infix_query(term)
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'news_trigram'")
+    if cursor.fetchone():
+        condition = 'news.id IN (SELECT rowid FROM news_trigram WHERE news_trigram MATCH ?)'
+        params = (match,)
+    else:
+        grams = trigrams(term)
+        fragment = fold_case(term)
+        condition = f'''news.id IN (
+                SELECT news_id FROM news_trigrams
+                WHERE trigram IN ({', '.join('?' * len(grams))})
+                GROUP BY news_id HAVING COUNT(*) = ?
+            )
+            AND (instr(lower(news.title), ?) > 0 OR instr(lower(news.author), ?) > 0)'''
+        params = (*grams, len(grams), fragment, fragment)
+    
+    if category:
+        condition += ' AND news.category_id = (SELECT id FROM categories WHERE name = ?)'
+        params += (category,)
+    return condition, params
+
+def _empty_facets() -> dict:
+    """Facet result for an empty match set"""
+    return {'total': 0, 'facets': {name: {'values': [], 'distinct': 0} for name in SEARCH_FACETS}}
+
+def _facet_counts(cursor, matched_ids: str, params: tuple, limit: int) -> dict:
+    """Category, author and month counts over the articles in `matched_ids`
+
+    The match set is read once into a materialized CTE and grouped three
+    ways from there. Each facet keeps its `limit` largest buckets (months:
+    the most recent) and reports how many distinct buckets it had; `total`
+    is the size of the match set.
+    """
+    cursor.execute(f'''
+        WITH matched AS MATERIALIZED (
+            SELECT category_id, author, substr(created_at, 1, 7) AS month
+            FROM news WHERE news.id IN ({matched_ids})
+        ),
+        buckets AS (
+            SELECT 'category' AS facet, category_id AS value, COUNT(*) AS hits FROM matched GROUP BY category_id
+            UNION ALL
+            SELECT 'author', author, COUNT(*) FROM matched GROUP BY author
+            UNION ALL
+            SELECT 'month', month, COUNT(*) FROM matched GROUP BY month
+        ),
+        ranked AS (
+            SELECT facet, value, hits,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY facet
+                       ORDER BY CASE WHEN facet = 'month' THEN 0 ELSE hits END DESC, value DESC
+                   ) AS position,
+                   COUNT(*) OVER (PARTITION BY facet) AS distinct_values,
+                   SUM(hits) OVER (PARTITION BY facet) AS total
+            FROM buckets
+        )
+        SELECT facet,
+               CASE WHEN facet = 'category' THEN (SELECT name FROM categories WHERE id = value) ELSE value END,
+               hits, distinct_values, total
+        FROM ranked
+        WHERE position <= ?
+        ORDER BY facet, position
+    ''', params + (limit,))
+    
+    result = _empty_facets()
+    for facet, value, hits, distinct_values, total in cursor.fetchall():
+        result['facets'][facet]['values'].append({'value': value, 'count': hits})
+        result['facets'][facet]['distinct'] = distinct_values
+        result['total'] = total
+    return result
+
+def _read_row_count(table_name: str) -> int:
+    """Read a trigger-maintained row count from row_counts"""
+    conn = db_connection.get_connection()
+    cursor = conn.cursor()
+    
+    cursor.execute('SELECT row_count FROM row_counts WHERE table_name = ?', (table_name,))
+    row = cursor.fetchone()
+    return row[0] if row else 0
+
+def _fetch_keyset_page(cursor, limit: int, as_json: bool = False) -> tuple:
+    """Fetch a keyset page whose last two selected columns are the sort key
+
+    The query must select `limit + 1` rows. Returns (rows, next_position),
+    where next_position is the key of the last returned row, or None when
+    there are no further rows.
+    """
+    columns = [column[0] for column in cursor.description][:-2]
+    cursor.row_factory = None
+    rows = cursor.fetchall()
+    
+    next_position = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_position = tuple(rows[-1][-2:])
+    rows = [row[:-2] for row in rows]
+    
+    if as_json:
+        return encode_rows(columns, rows), next_position
+    return [dict(zip(columns, row)) for row in rows], next_position
+
 class ArticleQueries:
     @staticmethod
     def create_article(article_data: dict) -> int:
@@ -11,74 +197,209 @@ class ArticleQueries:
         conn = db_connection.get_connection()
         cursor = conn.cursor()
         
+        category_id = _resolve_category_id(cursor, article_data['category'])
         cursor.execute('''
-            INSERT INTO news (title, content, author, category, created_at, updated_at)
+            INSERT INTO news (title, content, author, category_id, created_at, updated_at)
             VALUES (?, ?, ?, ?, ?, ?)
         ''', (
             article_data['title'],
             article_data['content'],
             article_data['author'],
-            article_data['category'],
+            category_id,
             datetime.now(),
             datetime.now()
         ))
         
         conn.commit()
+        data_generation.bump()
         return cursor.lastrowid
     
     @staticmethod
-    def get_articles_paginated(limit: int, offset: int) -> list:
-        """Get paginated articles"""
+    def get_articles_paginated(limit: int, offset: int, as_json: bool = False, fields=None,
+                               filters: dict = None, sort: str = DEFAULT_SORT):
+        """Get a page of articles matching `filters`, ordered by `sort` (see database/listing.py)"""
         conn = db_connection.get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT * FROM news 
-            ORDER BY created_at DESC 
-            LIMIT ? OFFSET ?
-        ''', (limit, offset))
+        shape = listing_shape(filters)
+        query = compile_listing(shape, sort, article_columns(fields))
+        cursor.execute(query, listing_params(shape, filters) + (limit, offset))
         
-        return [dict(row) for row in cursor.fetchall()]
+        return _fetch_rows(cursor, as_json)
+    
+    @staticmethod
+    def get_articles_after(limit: int, after: tuple = None, as_json: bool = False, fields=None,
+                           filters: dict = None, sort: str = DEFAULT_SORT) -> tuple:
+        """Get a keyset page of articles past the `(sort value, id)` position `after`"""
+        conn = db_connection.get_connection()
+        cursor = conn.cursor()
+        
+        shape = listing_shape(filters)
+        query = compile_listing(shape, sort, article_columns(fields), keyset=True, after=bool(after))
+        params = listing_params(shape, filters) + tuple(after or ()) + (limit + 1,)
+        cursor.execute(query, params)
+        
+        return _fetch_keyset_page(cursor, limit, as_json)
+    
+    @staticmethod
+    def iter_articles(filters: dict = None, sort: str = DEFAULT_SORT, fields=None,
+                      batch_size: int = 500) -> tuple:
+        """Every article matching `filters`, ordered by `sort`, as row tuple batches
+        
+        Returns `(column names, iterator of row lists)`. The statement runs
+        before returning, so invalid filters raise here; rows are fetched
+        `batch_size` at a time as the iterator is consumed.
+        """
+        conn = db_connection.get_connection()
+        cursor = conn.cursor()
+        
+        shape = listing_shape(filters)
+        query = compile_listing(shape, sort, article_columns(fields))
+        cursor.execute(query, listing_params(shape, filters) + (-1, 0))
+        cursor.row_factory = None
+        columns = [column[0] for column in cursor.description]
+        
+        def batches():
+            try:
+                rows = cursor.fetchmany(batch_size)
+                while rows:
+                    yield rows
+                    rows = cursor.fetchmany(batch_size)
+            finally:
+                cursor.close()
+        
+        return columns, batches()
     
     @staticmethod
-    def get_articles_count() -> int:
-        """Get total articles count"""
+    def get_articles_count(filters: dict = None) -> int:
+        """Count the articles matching `filters`
+        
+        Unfiltered and category-only counts come from the trigger-maintained
+        counters; other filter combinations count through the listing indexes.
+        """
+        shape = listing_shape(filters)
+        if not shape:
+            return _read_row_count('news')
+        
         conn = db_connection.get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('SELECT COUNT(*) FROM news')
+        if shape == ('category',):
+            cursor.execute('''
+                SELECT cc.article_count FROM category_article_counts cc
+                JOIN categories c ON c.id = cc.category_id
+                WHERE c.name = ?
+            ''', (filters['category'],))
+            row = cursor.fetchone()
+            return row[0] if row else 0
+        
+        cursor.execute(compile_count(shape), listing_params(shape, filters))
         return cursor.fetchone()[0]
     
+    @staticmethod
+    def get_author_counts(limit: int = None) -> dict:
+        """Get article counts per author ('' for anonymous), most prolific first"""
+        conn = db_connection.get_connection()
+        cursor = conn.cursor()
+        
+        query = 'SELECT author, article_count FROM author_article_counts ORDER BY article_count DESC'
+        if limit:
+            cursor.execute(query + ' LIMIT ?', (limit,))
+        else:
+            cursor.execute(query)
+        return {row[0]: row[1] for row in cursor.fetchall()}
+    
+    @staticmethod
+    def get_category_counts() -> dict:
+        """Get article counts per category name (None for uncategorized, as in listings)"""
+        conn = db_connection.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT c.name, cc.article_count
+            FROM category_article_counts cc
+            LEFT JOIN categories c ON c.id = cc.category_id
+        ''')
+        return {row[0]: row[1] for row in cursor.fetchall()}
+    
+    @staticmethod
+    def get_suggestion_rows() -> list:
+        """Get the short fields of every article that typeahead indexes"""
+        conn = db_connection.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT id, title, author, category_id, created_at FROM news')
+        return [dict(row) for row in cursor.fetchall()]
+    
     @staticmethod
     def get_article_by_id(article_id: int) -> dict:
         """Get article by ID"""
         conn = db_connection.get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('SELECT * FROM news WHERE id = ?', (article_id,))
+        cursor.execute(f'SELECT {article_columns()} FROM news WHERE id = ?', (article_id,))
         row = cursor.fetchone()
         return dict(row) if row else None
     
+    @staticmethod
+    def get_article_json(article_id: int) -> bytes:
+        """Get article by ID as JSON object bytes, from `article_cache` when cached"""
+        return article_cache.get(article_id, ArticleQueries._load_article_json)
+    
+    @staticmethod
+    def _load_article_json(article_id: int) -> bytes:
+        conn = db_connection.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute(f'SELECT {article_columns()} FROM news WHERE id = ?', (article_id,))
+        cursor.row_factory = None
+        row = cursor.fetchone()
+        return encode_row([column[0] for column in cursor.description], row) if row else None
+    
+    @staticmethod
+    def get_articles_by_ids(article_ids, fields=None, as_json: bool = False) -> dict:
+        """Map each existing id in `article_ids` to its row (always with `id`), in one query
+        
+        Rows are dicts, or JSON object bytes when `as_json`.
+        """
+        article_ids = list(article_ids)
+        if not article_ids:
+            return {}
+        names = ('id',) + article_field_names(fields)
+        conn = db_connection.get_connection()
+        cursor = conn.cursor()
+        
+        placeholders = ', '.join('?' * len(article_ids))
+        cursor.execute(f'SELECT {article_columns(names)} FROM news WHERE id IN ({placeholders})', article_ids)
+        if not as_json:
+            return {row['id']: dict(row) for row in cursor.fetchall()}
+        cursor.row_factory = None
+        columns = [column[0] for column in cursor.description]
+        return {row[0]: encode_row(columns, row) for row in cursor.fetchall()}
+    
     @staticmethod
     def update_article(article_id: int, article_data: dict) -> bool:
         """Update article"""
         conn = db_connection.get_connection()
         cursor = conn.cursor()
         
+        category_id = _resolve_category_id(cursor, article_data['category'])
         cursor.execute('''
             UPDATE news 
-            SET title = ?, content = ?, author = ?, category = ?, updated_at = ?
+            SET title = ?, content = ?, author = ?, category_id = ?, updated_at = ?
             WHERE id = ?
         ''', (
             article_data['title'],
             article_data['content'],
             article_data['author'],
-            article_data['category'],
+            category_id,
             datetime.now(),
             article_id
         ))
         
         conn.commit()
+        data_generation.bump()
+        article_cache.invalidate(article_id)
         return cursor.rowcount > 0
     
     @staticmethod
@@ -89,64 +410,130 @@ class ArticleQueries:
         
         cursor.execute('DELETE FROM news WHERE id = ?', (article_id,))
         conn.commit()
+        data_generation.bump()
+        article_cache.invalidate(article_id)
         return cursor.rowcount > 0
     
     @staticmethod
-    def search_articles(search_term: str) -> list:
-        """Search articles"""
+    def search_articles(search_term: str, limit: int = 20, offset: int = 0, category: str = None,
+                        as_json: bool = False, fields=None):
+        """Search articles with the FTS5 index, best BM25 match first
+        
+        Each row carries a `snippet` of the best matching column with the
+        matched terms wrapped in <mark>. FTS5 returns matches in rank order
+        itself, so snippets are only built for the rows of the page.
+        """
+        match = build_match_query(search_term)
+        if not match:
+            return b'[]' if as_json else []
+        
         conn = db_connection.get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT * FROM news 
-            WHERE title LIKE ? OR content LIKE ? OR author LIKE ?
-            ORDER BY created_at DESC
-        ''', (f'%{search_term}%', f'%{search_term}%', f'%{search_term}%'))
+        join, params = _search_category_filter(category)
+        cursor.execute(f'''
+            SELECT {article_columns(fields)}, hits.snippet
+            FROM (
+                SELECT news_fts.rowid AS hit_id, news_fts.rank AS score,
+                       snippet(news_fts, -1, '<mark>', '</mark>', '…', 24) AS snippet
+                FROM news_fts {join}
+                WHERE news_fts MATCH ? AND news_fts.rank MATCH ?
+                ORDER BY news_fts.rank
+                LIMIT ? OFFSET ?
+            ) AS hits
+            CROSS JOIN news ON news.id = hits.hit_id
+            ORDER BY hits.score
+        ''', params + (match, BM25_RANK, limit, offset))
         
-        return [dict(row) for row in cursor.fetchall()]
+        return _fetch_rows(cursor, as_json)
     
     @staticmethod
-    def get_articles_by_category(category: str) -> list:
-        """Get articles by category"""
+    def count_search_results(search_term: str, category: str = None) -> int:
+        """Count the articles matching a search (index only, no ranking)"""
+        match = build_match_query(search_term)
+        if not match:
+            return 0
+        
         conn = db_connection.get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT * FROM news 
-            WHERE category = ?
-            ORDER BY created_at DESC
-        ''', (category,))
+        join, params = _search_category_filter(category)
+        cursor.execute(f'SELECT COUNT(*) FROM news_fts {join} WHERE news_fts MATCH ?', params + (match,))
+        return cursor.fetchone()[0]
+    
+    @staticmethod
+    def search_facets(search_term: str, category: str = None, limit: int = 10) -> dict:
+        """Facet counts (and the total) for the articles matching a full-text search"""
+        match = build_match_query(search_term)
+        if not match:
+            return _empty_facets()
         
-        return [dict(row) for row in cursor.fetchall()]
+        conn = db_connection.get_connection()
+        cursor = conn.cursor()
+        
+        join, params = _search_category_filter(category)
+        matched_ids = f'SELECT news_fts.rowid FROM news_fts {join} WHERE news_fts MATCH ?'
+        return _facet_counts(cursor, matched_ids, params + (match,), limit)
     
     @staticmethod
-    def get_latest_articles(limit: int) -> list:
-        """Get latest articles"""
+    def search_articles_infix(term: str, limit: int = 20, offset: int = 0, category: str = None,
+                              as_json: bool = False, fields=None):
+        """Find articles whose title or author contains `term`, newest first"""
         conn = db_connection.get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT * FROM news 
-            ORDER BY created_at DESC 
-            LIMIT ?
-        ''', (limit,))
+        condition, params = _infix_filter(cursor, term, category)
+        cursor.execute(f'''
+            SELECT {article_columns(fields)} FROM news
+            WHERE {condition}
+            ORDER BY created_at DESC, id DESC
+            LIMIT ? OFFSET ?
+        ''', params + (limit, offset))
         
-        return [dict(row) for row in cursor.fetchall()]
+        return _fetch_rows(cursor, as_json)
     
     @staticmethod
-    def get_statistics() -> dict:
-        """Get article statistics"""
+    def count_infix_results(term: str, category: str = None) -> int:
+        """Count the articles whose title or author contains `term`"""
         conn = db_connection.get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('SELECT COUNT(*) FROM news')
-        total_articles = cursor.fetchone()[0]
+        condition, params = _infix_filter(cursor, term, category)
+        cursor.execute(f'SELECT COUNT(*) FROM news WHERE {condition}', params)
+        return cursor.fetchone()[0]
+    
+    @staticmethod
+    def infix_facets(term: str, category: str = None, limit: int = 10) -> dict:
+        """Facet counts (and the total) for the articles whose title or author contains `term`"""
+        conn = db_connection.get_connection()
+        cursor = conn.cursor()
         
-        cursor.execute('SELECT COUNT(DISTINCT category) FROM news')
-        total_categories = cursor.fetchone()[0]
+        condition, params = _infix_filter(cursor, term, category)
+        return _facet_counts(cursor, f'SELECT news.id FROM news WHERE {condition}', params, limit)
+    
+    @staticmethod
+    def get_articles_by_category(category: str, as_json: bool = False, fields=None):
+        """Get all articles of a category name, newest first"""
+        return ArticleQueries.get_articles_paginated(-1, 0, as_json, fields, {'category': category})
+    
+    @staticmethod
+    def get_latest_articles(limit: int, as_json: bool = False, fields=None):
+        """Get latest articles"""
+        return ArticleQueries.get_articles_paginated(limit, 0, as_json, fields)
+    
+    @staticmethod
+    def get_statistics() -> dict:
+        """Get article statistics from the trigger-maintained aggregates"""
+        conn = db_connection.get_connection()
+        cursor = conn.cursor()
         
-        cursor.execute('SELECT COUNT(DISTINCT author) FROM news')
-        total_authors = cursor.fetchone()[0]
+        cursor.execute('''
+            SELECT
+                (SELECT row_count FROM row_counts WHERE table_name = 'news'),
+                (SELECT value FROM news_statistics WHERE name = 'distinct_categories'),
+                (SELECT value FROM news_statistics WHERE name = 'distinct_authors')
+        ''')
+        total_articles, total_categories, total_authors = (value or 0 for value in cursor.fetchone())
         
         return {
             'total_articles': total_articles,
@@ -180,6 +567,7 @@ class CategoryQueries:
         ))
         
         conn.commit()
+        data_generation.bump()
         return cursor.lastrowid
     
     @staticmethod
@@ -192,6 +580,18 @@ class CategoryQueries:
         row = cursor.fetchone()
         return dict(row) if row else None
     
+    @staticmethod
+    def get_categories_by_ids(category_ids) -> dict:
+        """Map each existing id in `category_ids` to its category, in one query"""
+        category_ids = list(category_ids)
+        if not category_ids:
+            return {}
+        conn = db_connection.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute(f'SELECT * FROM categories WHERE id IN ({", ".join("?" * len(category_ids))})', category_ids)
+        return {row['id']: dict(row) for row in cursor.fetchall()}
+    
     @staticmethod
     def update_category(category_id: int, category_data: dict) -> bool:
         """Update category"""
@@ -209,6 +609,9 @@ class CategoryQueries:
         ))
         
         conn.commit()
+        data_generation.bump()
+        # Cached articles embed the category name
+        article_cache.clear()
         return cursor.rowcount > 0
     
     @staticmethod
@@ -219,6 +622,8 @@ class CategoryQueries:
         
         cursor.execute('DELETE FROM categories WHERE id = ?', (category_id,))
         conn.commit()
+        data_generation.bump()
+        article_cache.clear()
         return cursor.rowcount > 0
 
 class MediaQueries:
@@ -234,6 +639,40 @@ class MediaQueries:
         except Exception:
             return []
     
+    @staticmethod
+    def get_media_after(limit: int, after: tuple = None) -> tuple:
+        """Get a keyset page of media ordered by (uploaded_at, id) descending"""
+        conn = db_connection.get_connection()
+        cursor = conn.cursor()
+        
+        where = 'WHERE (uploaded_at, id) < (?, ?)' if after else ''
+        params = tuple(after or ()) + (limit + 1,)
+        cursor.execute(f'''
+            SELECT *, uploaded_at AS _sort_uploaded_at, id AS _sort_id
+            FROM media {where}
+            ORDER BY uploaded_at DESC, id DESC
+            LIMIT ?
+        ''', params)
+        
+        return _fetch_keyset_page(cursor, limit)
+    
+    @staticmethod
+    def get_media_by_ids(media_ids) -> dict:
+        """Map each existing id in `media_ids` to its media record, in one query"""
+        media_ids = list(media_ids)
+        if not media_ids:
+            return {}
+        conn = db_connection.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute(f'SELECT * FROM media WHERE id IN ({", ".join("?" * len(media_ids))})', media_ids)
+        return {row['id']: dict(row) for row in cursor.fetchall()}
+    
+    @staticmethod
+    def get_media_count() -> int:
+        """Get total media count (trigger-maintained, no table scan)"""
+        return _read_row_count('media')
+    
     @staticmethod
     def create_media(media_data: dict) -> int:
         """Create media record"""
@@ -268,4 +707,81 @@ class MediaQueries:
             conn.commit()
             return cursor.rowcount > 0
         except Exception:
-            return False
\ No newline at end of file
+            return False
+
+class ChangeQueries:
+    @staticmethod
+    def get_changes_after(seq: int, limit: int, entities=None) -> list:
+        """change_log rows after sequence number `seq`, oldest first, optionally of some entities only"""
+        conn = db_connection.get_connection()
+        cursor = conn.cursor()
+        
+        where = 'seq > ?'
+        params = (seq,)
+        if entities:
+            where += f' AND entity IN ({", ".join("?" * len(entities))})'
+            params += tuple(entities)
+        cursor.execute(f'''
+            SELECT seq, entity, entity_id, action, changed_at FROM change_log
+            WHERE {where} ORDER BY seq LIMIT ?
+        ''', params + (limit,))
+        return [dict(row) for row in cursor.fetchall()]
+    
+    @staticmethod
+    def get_last_seq() -> int:
+        """Highest sequence number ever assigned, 0 if none (compaction never lowers it)"""
+        conn = db_connection.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'")
+        row = cursor.fetchone()
+        return row[0] if row else 0
+    
+    @staticmethod
+    def get_horizon() -> int:
+        """Highest seq of a tombstone dropped by compaction; changes after an earlier seq are incomplete"""
+        conn = db_connection.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT seq FROM change_log_horizon WHERE id = 1')
+        row = cursor.fetchone()
+        return row[0] if row else 0
+    
+    @staticmethod
+    def compact(superseded_age: int, tombstone_age: int) -> dict:
+        """Drop superseded changes older than `superseded_age` seconds, and tombstones older than `tombstone_age`
+        
+        A superseded row is one with a later change to the same entity row,
+        which tells every reader at least as much. Reset markers expire like
+        tombstones; dropping either raises the horizon to its seq.
+        """
+        conn = db_connection.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute('''
+                DELETE FROM change_log
+                WHERE changed_at <= datetime('now', ?)
+                  AND seq < (
+                      SELECT MAX(newer.seq) FROM change_log AS newer
+                      WHERE newer.entity = change_log.entity AND newer.entity_id = change_log.entity_id
+                  )
+            ''', (f'-{int(superseded_age)} seconds',))
+            superseded = cursor.rowcount
+            
+            cursor.execute(
+                "SELECT MAX(seq) FROM change_log WHERE action IN ('deleted', 'reset') AND changed_at <= datetime('now', ?)",
+                (f'-{int(tombstone_age)} seconds',)
+            )
+            horizon = cursor.fetchone()[0]
+            tombstones = 0
+            if horizon is not None:
+                cursor.execute("DELETE FROM change_log WHERE action IN ('deleted', 'reset') AND seq <= ?", (horizon,))
+                tombstones = cursor.rowcount
+                cursor.execute('UPDATE change_log_horizon SET seq = MAX(seq, ?) WHERE id = 1', (horizon,))
+            
+            conn.commit()
+            return {'superseded': superseded, 'tombstones': tombstones}
+        except Exception:
+            conn.rollback()
+            raise
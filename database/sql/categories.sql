@@ -0,0 +1,24 @@
+-- Article to category link maintenance.
+--
+-- news.category_id references categories(id). Category filters and joins go
+-- through idx_news_category_created_id, and deleting a category detaches its
+-- articles instead of leaving them pointing at a missing row. Renaming a
+-- category needs no work: articles follow the id, not the name.
+--
+-- The index is ascending on purpose: scanned backwards it yields
+-- (created_at DESC, id DESC) within a category, which the DESC-declared
+-- idx_news_category_created it replaces could only do with a sort.
+
+BEGIN;
+
+DROP INDEX IF EXISTS idx_news_category_created;
+
+CREATE INDEX IF NOT EXISTS idx_news_category_created_id
+    ON news(category_id, created_at, id);
+
+CREATE TRIGGER IF NOT EXISTS categories_detach_news AFTER DELETE ON categories
+BEGIN
+    UPDATE news SET category_id = NULL WHERE category_id = OLD.id;
+END;
+
+COMMIT;
@@ -0,0 +1,88 @@
+-- Change log: one row per article, category or media write, from any process.
+--
+-- Triggers append (entity, entity_id, action) in commit order, so a
+-- process that caches reads can ask for every change past the last seq it
+-- has seen, including writes made by other workers, the importer or the
+-- backend stack, and drop just the affected entries. A 'deleted' row is the
+-- tombstone telling such readers that the row is gone. A 'reset' row (entity
+-- id 0) stands for a batch of changes too large to log one by one, such as
+-- a bulk import: readers reaching it reload everything of that entity.
+--
+-- Compaction (services/change_feed_service.py) drops rows superseded by a
+-- later change to the same row, which loses nothing for any reader, and
+-- eventually old tombstones and reset markers. The highest seq of a dropped
+-- tombstone or marker is kept in change_log_horizon: a reader synced to an
+-- earlier seq may have missed a delete or a reset and has to reload.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS change_log (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    entity TEXT NOT NULL,
+    entity_id INTEGER NOT NULL,
+    action TEXT NOT NULL,
+    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Latest change per row, for compaction
+CREATE INDEX IF NOT EXISTS idx_change_log_entity ON change_log(entity, entity_id, seq);
+
+CREATE TABLE IF NOT EXISTS change_log_horizon (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    seq INTEGER NOT NULL
+);
+
+INSERT OR IGNORE INTO change_log_horizon (id, seq) VALUES (1, 0);
+
+-- news
+
+CREATE TRIGGER IF NOT EXISTS news_change_insert AFTER INSERT ON news
+BEGIN
+    INSERT INTO change_log (entity, entity_id, action) VALUES ('article', NEW.id, 'created');
+END;
+
+CREATE TRIGGER IF NOT EXISTS news_change_update AFTER UPDATE ON news
+BEGIN
+    INSERT INTO change_log (entity, entity_id, action) VALUES ('article', NEW.id, 'updated');
+END;
+
+CREATE TRIGGER IF NOT EXISTS news_change_delete AFTER DELETE ON news
+BEGIN
+    INSERT INTO change_log (entity, entity_id, action) VALUES ('article', OLD.id, 'deleted');
+END;
+
+-- categories
+
+CREATE TRIGGER IF NOT EXISTS categories_change_insert AFTER INSERT ON categories
+BEGIN
+    INSERT INTO change_log (entity, entity_id, action) VALUES ('category', NEW.id, 'created');
+END;
+
+CREATE TRIGGER IF NOT EXISTS categories_change_update AFTER UPDATE ON categories
+BEGIN
+    INSERT INTO change_log (entity, entity_id, action) VALUES ('category', NEW.id, 'updated');
+END;
+
+CREATE TRIGGER IF NOT EXISTS categories_change_delete AFTER DELETE ON categories
+BEGIN
+    INSERT INTO change_log (entity, entity_id, action) VALUES ('category', OLD.id, 'deleted');
+END;
+
+-- media
+
+CREATE TRIGGER IF NOT EXISTS media_change_insert AFTER INSERT ON media
+BEGIN
+    INSERT INTO change_log (entity, entity_id, action) VALUES ('media', NEW.id, 'created');
+END;
+
+CREATE TRIGGER IF NOT EXISTS media_change_update AFTER UPDATE ON media
+BEGIN
+    INSERT INTO change_log (entity, entity_id, action) VALUES ('media', NEW.id, 'updated');
+END;
+
+CREATE TRIGGER IF NOT EXISTS media_change_delete AFTER DELETE ON media
+BEGIN
+    INSERT INTO change_log (entity, entity_id, action) VALUES ('media', OLD.id, 'deleted');
+END;
+
+COMMIT;
@@ -0,0 +1,82 @@
+-- Row counters maintained by triggers so counts never scan a table.
+--
+-- row_counts holds one row per counted table; category_article_counts holds
+-- the number of articles per category_id (0 for uncategorized). Both are
+-- seeded from the tables once, when first created, and kept current by the
+-- triggers below on every insert, delete and category change.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS row_counts (
+    table_name TEXT PRIMARY KEY,
+    row_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS category_article_counts (
+    category_id INTEGER PRIMARY KEY,
+    article_count INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT OR IGNORE INTO row_counts (table_name, row_count) SELECT 'news', COUNT(*) FROM news;
+INSERT OR IGNORE INTO row_counts (table_name, row_count) SELECT 'categories', COUNT(*) FROM categories;
+INSERT OR IGNORE INTO row_counts (table_name, row_count) SELECT 'media', COUNT(*) FROM media;
+
+INSERT OR IGNORE INTO category_article_counts (category_id, article_count)
+    SELECT COALESCE(category_id, 0), COUNT(*) FROM news GROUP BY COALESCE(category_id, 0);
+
+-- news
+
+CREATE TRIGGER IF NOT EXISTS news_counts_insert AFTER INSERT ON news
+BEGIN
+    UPDATE row_counts SET row_count = row_count + 1 WHERE table_name = 'news';
+    INSERT INTO category_article_counts (category_id, article_count)
+        VALUES (COALESCE(NEW.category_id, 0), 1)
+        ON CONFLICT(category_id) DO UPDATE SET article_count = article_count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS news_counts_delete AFTER DELETE ON news
+BEGIN
+    UPDATE row_counts SET row_count = row_count - 1 WHERE table_name = 'news';
+    UPDATE category_article_counts SET article_count = article_count - 1
+        WHERE category_id = COALESCE(OLD.category_id, 0);
+    DELETE FROM category_article_counts
+        WHERE category_id = COALESCE(OLD.category_id, 0) AND article_count <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS news_counts_category AFTER UPDATE OF category_id ON news
+WHEN COALESCE(OLD.category_id, 0) IS NOT COALESCE(NEW.category_id, 0)
+BEGIN
+    UPDATE category_article_counts SET article_count = article_count - 1
+        WHERE category_id = COALESCE(OLD.category_id, 0);
+    DELETE FROM category_article_counts
+        WHERE category_id = COALESCE(OLD.category_id, 0) AND article_count <= 0;
+    INSERT INTO category_article_counts (category_id, article_count)
+        VALUES (COALESCE(NEW.category_id, 0), 1)
+        ON CONFLICT(category_id) DO UPDATE SET article_count = article_count + 1;
+END;
+
+-- categories
+
+CREATE TRIGGER IF NOT EXISTS categories_counts_insert AFTER INSERT ON categories
+BEGIN
+    UPDATE row_counts SET row_count = row_count + 1 WHERE table_name = 'categories';
+END;
+
+CREATE TRIGGER IF NOT EXISTS categories_counts_delete AFTER DELETE ON categories
+BEGIN
+    UPDATE row_counts SET row_count = row_count - 1 WHERE table_name = 'categories';
+END;
+
+-- media
+
+CREATE TRIGGER IF NOT EXISTS media_counts_insert AFTER INSERT ON media
+BEGIN
+    UPDATE row_counts SET row_count = row_count + 1 WHERE table_name = 'media';
+END;
+
+CREATE TRIGGER IF NOT EXISTS media_counts_delete AFTER DELETE ON media
+BEGIN
+    UPDATE row_counts SET row_count = row_count - 1 WHERE table_name = 'media';
+END;
+
+COMMIT;
@@ -0,0 +1,24 @@
+-- Composite indexes behind the /api/articles listing engine (database/listing.py).
+--
+-- Every listing is an optional equality prefix (category, author) followed
+-- by the sort column and id, so each supported filter/sort shape reads
+-- rows in order from one of these indexes (or idx_news_created_id and
+-- idx_news_category_created_id) and stops at LIMIT, with no sort step.
+-- Date range and updated-since filters narrow the scan on the sort column
+-- or are checked row by row while walking it.
+
+BEGIN;
+
+CREATE INDEX IF NOT EXISTS idx_news_author_created
+    ON news(author, created_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_news_updated_id
+    ON news(updated_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_news_category_updated
+    ON news(category_id, updated_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_news_author_updated
+    ON news(author, updated_at, id);
+
+COMMIT;
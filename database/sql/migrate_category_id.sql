@@ -0,0 +1,41 @@
+-- One-off migration from the free-text news.category column to category_id.
+--
+-- Run by init_db only while news still has a `category` column. Every
+-- category name used by an article gets a row in categories, news is
+-- rebuilt with a category_id referencing it, and the name-keyed
+-- category_article_counts table is dropped so counters.sql recreates it
+-- keyed by id. Indexes and triggers on news are recreated by init_db.
+-- Articles with an empty category become uncategorized (category_id NULL),
+-- as they would when written through the API.
+
+BEGIN;
+
+INSERT OR IGNORE INTO categories (name)
+    SELECT DISTINCT category FROM news WHERE category IS NOT NULL AND category != '';
+
+ALTER TABLE news RENAME TO news_old;
+
+CREATE TABLE news (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    author TEXT,
+    category_id INTEGER REFERENCES categories(id),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO news (id, title, content, author, category_id, created_at, updated_at)
+    SELECT n.id, n.title, n.content, n.author, c.id, n.created_at, n.updated_at
+    FROM news_old n
+    LEFT JOIN categories c ON c.name = NULLIF(n.category, '');
+
+-- Keep AUTOINCREMENT from reusing ids of articles deleted before the migration
+UPDATE sqlite_sequence
+    SET seq = MAX(seq, COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'news_old'), 0))
+    WHERE name = 'news';
+
+DROP TABLE news_old;
+DROP TABLE IF EXISTS category_article_counts;
+
+COMMIT;
@@ -0,0 +1,42 @@
+-- Full-text search index over news(title, content, author).
+--
+-- news_fts is an external-content FTS5 table: it stores only the inverted
+-- index and reads the text back from news by rowid. The triggers below keep
+-- it in step with every insert, delete and text change. The index is built
+-- from existing rows once, when the table is first created. Two and three
+-- character prefix indexes make `term*` queries cheap.
+
+BEGIN;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5(
+    title, content, author,
+    content='news', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3'
+);
+
+INSERT INTO news_fts (news_fts)
+    SELECT 'rebuild'
+    WHERE NOT EXISTS (SELECT 1 FROM news_fts_docsize) AND EXISTS (SELECT 1 FROM news);
+
+CREATE TRIGGER IF NOT EXISTS news_fts_insert AFTER INSERT ON news
+BEGIN
+    INSERT INTO news_fts (rowid, title, content, author)
+        VALUES (NEW.id, NEW.title, NEW.content, NEW.author);
+END;
+
+CREATE TRIGGER IF NOT EXISTS news_fts_delete AFTER DELETE ON news
+BEGIN
+    INSERT INTO news_fts (news_fts, rowid, title, content, author)
+        VALUES ('delete', OLD.id, OLD.title, OLD.content, OLD.author);
+END;
+
+CREATE TRIGGER IF NOT EXISTS news_fts_update AFTER UPDATE OF title, content, author ON news
+BEGIN
+    INSERT INTO news_fts (news_fts, rowid, title, content, author)
+        VALUES ('delete', OLD.id, OLD.title, OLD.content, OLD.author);
+    INSERT INTO news_fts (rowid, title, content, author)
+        VALUES (NEW.id, NEW.title, NEW.content, NEW.author);
+END;
+
+COMMIT;
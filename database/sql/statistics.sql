@@ -0,0 +1,83 @@
+-- Incrementally maintained statistics for /api/statistics and the home page.
+--
+-- Requires counters.sql. author_article_counts tallies articles per author
+-- ('' for anonymous) the same way category_article_counts does for
+-- categories, and news_statistics keeps the number of distinct non-empty
+-- categories and authors, adjusted whenever a tally row appears or goes away.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS author_article_counts (
+    author TEXT PRIMARY KEY,
+    article_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS news_statistics (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT OR IGNORE INTO author_article_counts (author, article_count)
+    SELECT COALESCE(author, ''), COUNT(*) FROM news GROUP BY COALESCE(author, '');
+
+INSERT OR IGNORE INTO news_statistics (name, value)
+    SELECT 'distinct_categories', COUNT(*) FROM category_article_counts WHERE category_id != 0;
+INSERT OR IGNORE INTO news_statistics (name, value)
+    SELECT 'distinct_authors', COUNT(*) FROM author_article_counts WHERE author != '';
+
+-- Per-author tallies
+
+CREATE TRIGGER IF NOT EXISTS news_authors_insert AFTER INSERT ON news
+BEGIN
+    INSERT INTO author_article_counts (author, article_count)
+        VALUES (COALESCE(NEW.author, ''), 1)
+        ON CONFLICT(author) DO UPDATE SET article_count = article_count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS news_authors_delete AFTER DELETE ON news
+BEGIN
+    UPDATE author_article_counts SET article_count = article_count - 1
+        WHERE author = COALESCE(OLD.author, '');
+    DELETE FROM author_article_counts
+        WHERE author = COALESCE(OLD.author, '') AND article_count <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS news_authors_update AFTER UPDATE OF author ON news
+WHEN COALESCE(OLD.author, '') IS NOT COALESCE(NEW.author, '')
+BEGIN
+    UPDATE author_article_counts SET article_count = article_count - 1
+        WHERE author = COALESCE(OLD.author, '');
+    DELETE FROM author_article_counts
+        WHERE author = COALESCE(OLD.author, '') AND article_count <= 0;
+    INSERT INTO author_article_counts (author, article_count)
+        VALUES (COALESCE(NEW.author, ''), 1)
+        ON CONFLICT(author) DO UPDATE SET article_count = article_count + 1;
+END;
+
+-- Distinct counts follow tally rows being created and removed
+
+CREATE TRIGGER IF NOT EXISTS distinct_categories_insert AFTER INSERT ON category_article_counts
+WHEN NEW.category_id != 0
+BEGIN
+    UPDATE news_statistics SET value = value + 1 WHERE name = 'distinct_categories';
+END;
+
+CREATE TRIGGER IF NOT EXISTS distinct_categories_delete AFTER DELETE ON category_article_counts
+WHEN OLD.category_id != 0
+BEGIN
+    UPDATE news_statistics SET value = value - 1 WHERE name = 'distinct_categories';
+END;
+
+CREATE TRIGGER IF NOT EXISTS distinct_authors_insert AFTER INSERT ON author_article_counts
+WHEN NEW.author != ''
+BEGIN
+    UPDATE news_statistics SET value = value + 1 WHERE name = 'distinct_authors';
+END;
+
+CREATE TRIGGER IF NOT EXISTS distinct_authors_delete AFTER DELETE ON author_article_counts
+WHEN OLD.author != ''
+BEGIN
+    UPDATE news_statistics SET value = value - 1 WHERE name = 'distinct_authors';
+END;
+
+COMMIT;
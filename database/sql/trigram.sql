@@ -0,0 +1,39 @@
+-- Substring (infix) search index over news(title, author).
+--
+-- news_trigram is an external-content FTS5 table using the trigram
+-- tokenizer, so any 3+ character fragment ("ohnson") is answered from the
+-- index. Kept in sync by triggers and built from existing rows once, when
+-- first created. Used when the SQLite build has the trigram tokenizer
+-- (3.34+); trigram_fallback.sql provides the same lookup otherwise.
+
+BEGIN;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS news_trigram USING fts5(
+    title, author,
+    content='news', content_rowid='id',
+    tokenize='trigram'
+);
+
+INSERT INTO news_trigram (news_trigram)
+    SELECT 'rebuild'
+    WHERE NOT EXISTS (SELECT 1 FROM news_trigram_docsize) AND EXISTS (SELECT 1 FROM news);
+
+CREATE TRIGGER IF NOT EXISTS news_trigram_insert AFTER INSERT ON news
+BEGIN
+    INSERT INTO news_trigram (rowid, title, author) VALUES (NEW.id, NEW.title, NEW.author);
+END;
+
+CREATE TRIGGER IF NOT EXISTS news_trigram_delete AFTER DELETE ON news
+BEGIN
+    INSERT INTO news_trigram (news_trigram, rowid, title, author)
+        VALUES ('delete', OLD.id, OLD.title, OLD.author);
+END;
+
+CREATE TRIGGER IF NOT EXISTS news_trigram_update AFTER UPDATE OF title, author ON news
+BEGIN
+    INSERT INTO news_trigram (news_trigram, rowid, title, author)
+        VALUES ('delete', OLD.id, OLD.title, OLD.author);
+    INSERT INTO news_trigram (rowid, title, author) VALUES (NEW.id, NEW.title, NEW.author);
+END;
+
+COMMIT;
@@ -0,0 +1,64 @@
+-- Substring (infix) search index for SQLite builds without the FTS5
+-- trigram tokenizer.
+--
+-- news_trigrams maps every lower-cased 3-character substring of an
+-- article's title and author to the article id. A search looks up the
+-- articles containing all trigrams of the fragment and confirms the match
+-- with instr(). Triggers cannot use recursive CTEs, so substring positions
+-- come from the small trigram_positions table (titles and authors are
+-- indexed up to 1024 characters).
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS trigram_positions (
+    i INTEGER PRIMARY KEY
+);
+
+INSERT OR IGNORE INTO trigram_positions (i)
+    WITH RECURSIVE seq(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM seq WHERE i < 1024)
+    SELECT i FROM seq;
+
+CREATE TABLE IF NOT EXISTS news_trigrams (
+    trigram TEXT NOT NULL,
+    news_id INTEGER NOT NULL,
+    PRIMARY KEY (trigram, news_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_news_trigrams_news ON news_trigrams(news_id);
+
+INSERT OR IGNORE INTO news_trigrams (trigram, news_id)
+    SELECT lower(substr(n.title, p.i, 3)), n.id
+    FROM news n JOIN trigram_positions p ON p.i <= length(n.title) - 2
+    WHERE NOT EXISTS (SELECT 1 FROM news_trigrams)
+    UNION
+    SELECT lower(substr(n.author, p.i, 3)), n.id
+    FROM news n JOIN trigram_positions p ON p.i <= length(n.author) - 2
+    WHERE NOT EXISTS (SELECT 1 FROM news_trigrams);
+
+CREATE TRIGGER IF NOT EXISTS news_trigrams_insert AFTER INSERT ON news
+BEGIN
+    INSERT OR IGNORE INTO news_trigrams (trigram, news_id)
+        SELECT lower(substr(NEW.title, i, 3)), NEW.id FROM trigram_positions
+        WHERE i <= length(NEW.title) - 2
+        UNION
+        SELECT lower(substr(NEW.author, i, 3)), NEW.id FROM trigram_positions
+        WHERE i <= length(NEW.author) - 2;
+END;
+
+CREATE TRIGGER IF NOT EXISTS news_trigrams_delete AFTER DELETE ON news
+BEGIN
+    DELETE FROM news_trigrams WHERE news_id = OLD.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS news_trigrams_update AFTER UPDATE OF title, author ON news
+BEGIN
+    DELETE FROM news_trigrams WHERE news_id = OLD.id;
+    INSERT OR IGNORE INTO news_trigrams (trigram, news_id)
+        SELECT lower(substr(NEW.title, i, 3)), NEW.id FROM trigram_positions
+        WHERE i <= length(NEW.title) - 2
+        UNION
+        SELECT lower(substr(NEW.author, i, 3)), NEW.id FROM trigram_positions
+        WHERE i <= length(NEW.author) - 2;
+END;
+
+COMMIT;
@@ -20,9 +20,9 @@ class AdminController {
     }
     
     async loadData() {
-        const [statsResponse, mediaResponse] = await Promise.all([
-            apiService.getStatistics(),
-            apiService.getMedia()
+        const [statsResponse, mediaResponse] = await apiService.batch([
+            '/api/statistics',
+            '/api/media'
         ]);
         
         this.statistics = statsResponse.data || {};
@@ -490,16 +490,16 @@ class AdminController {
         if (!startDate || !endDate) return;
         
         try {
-            const response = await apiService.getArticles(1, 1000);
-            const articles = response.data || [];
+            // `to` is exclusive: export through the end of the last day
+            const until = new Date(endDate);
+            until.setDate(until.getDate() + 1);
             
-            const filteredArticles = articles.filter(article => {
-                const articleDate = new Date(article.created_at);
-                return articleDate >= new Date(startDate) && articleDate <= new Date(endDate);
+            ExportUtil.exportArticles('ndjson', {
+                from: startDate,
+                to: until.toISOString().split('T')[0],
+                sort: 'oldest'
             });
-            
-            ExportUtil.downloadJSON(filteredArticles, `articles-${startDate}-to-${endDate}.json`);
-            window.app.toast.success(`Exported ${filteredArticles.length} articles`);
+            window.app.toast.success('Export started');
         } catch (error) {
             window.app.toast.error('Failed to export articles by date');
         }
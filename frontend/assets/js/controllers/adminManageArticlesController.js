@@ -12,6 +12,7 @@ class AdminManageArticlesController {
         this.searchTerm = '';
         this.filterCategory = '';
         this.editingArticle = null;
+        this.changeSeq = null;
     }
     
     async init() {
@@ -26,9 +27,13 @@ class AdminManageArticlesController {
     }
     
     async loadData() {
-        const [articlesResponse, categoriesResponse] = await Promise.all([
-            apiService.getArticles(this.currentPage, 10),
-            apiService.getCategories()
+        // Position in the change feed first, so no change after the load is missed
+        const changesResponse = await apiService.getChanges();
+        this.changeSeq = changesResponse.data.next;
+        
+        const [articlesResponse, categoriesResponse] = await apiService.batch([
+            `/api/articles?page=${this.currentPage}&limit=10`,
+            '/api/categories'
         ]);
         
         this.articles = articlesResponse.data || [];
@@ -36,6 +41,56 @@ class AdminManageArticlesController {
         this.totalPages = articlesResponse.pagination?.pages || 1;
     }
     
+    /**
+     * Bring the loaded page up to date from the change feed instead of
+     * reloading it. Falls back to a full reload when the feed says so.
+     */
+    async syncChanges() {
+        if (this.changeSeq === null) {
+            await this.loadData();
+            return;
+        }
+        
+        let result;
+        do {
+            const response = await apiService.getChanges(this.changeSeq, ['article', 'category']);
+            result = response.data;
+            if (result.reset || !this.applyChanges(result.changes)) {
+                await this.loadData();
+                return;
+            }
+            this.changeSeq = result.next;
+        } while (result.has_more);
+    }
+    
+    /**
+     * Patch the loaded articles and categories in place. Returns false when
+     * the page has to be reloaded: a new article shifts the page, and a
+     * renamed or deleted category changes the articles showing it.
+     */
+    applyChanges(changes) {
+        for (const change of changes) {
+            if (change.entity === 'category') {
+                if (change.action !== 'created') return false;
+                if (change.data && !this.categories.some(category => category.id === change.id)) {
+                    this.categories.push(change.data);
+                }
+                continue;
+            }
+            
+            if (change.action === 'created') return false;
+            const index = this.articles.findIndex(article => article.id === change.id);
+            if (index === -1) continue;
+            if (change.data) {
+                this.articles[index] = change.data;
+            } else {
+                this.articles.splice(index, 1);
+                this.selectedArticles.delete(change.id);
+            }
+        }
+        return true;
+    }
+    
     setupEventListeners() {
         // Article count button
         const articleCountBtn = document.getElementById('admin-article-count-btn');
@@ -276,7 +331,7 @@ class AdminManageArticlesController {
             await apiService.updateArticle(id, formData);
             window.app.toast.success('Article updated successfully');
             this.hideEditModal();
-            await this.loadData();
+            await this.syncChanges();
             this.render();
         } catch (error) {
             window.app.toast.error('Failed to update article');
@@ -289,7 +344,7 @@ class AdminManageArticlesController {
         try {
             await apiService.deleteArticle(id);
             window.app.toast.success('Article deleted successfully');
-            await this.loadData();
+            await this.syncChanges();
             this.render();
         } catch (error) {
             window.app.toast.error('Failed to delete article');
@@ -309,7 +364,7 @@ class AdminManageArticlesController {
             await Promise.all(deletePromises);
             window.app.toast.success(`${this.selectedArticles.size} articles deleted successfully`);
             this.selectedArticles.clear();
-            await this.loadData();
+            await this.syncChanges();
             this.render();
         } catch (error) {
             window.app.toast.error('Failed to delete some articles');
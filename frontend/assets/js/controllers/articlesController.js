@@ -11,9 +11,10 @@ class ArticlesController {
         this.viewMode = 'grid';
         this.searchTerm = '';
         this.selectedCategory = '';
-        this.sortBy = 'created_at';
+        this.sortBy = 'newest';
         this.selectedArticles = new Set();
         this.editingArticle = null;
+        this.facets = null;
     }
     
     async init() {
@@ -34,7 +35,10 @@ class ArticlesController {
     }
     
     async loadArticles(page = 1) {
-        const response = await apiService.getArticles(page, 12);
+        const response = await apiService.getArticles(page, 12, null, {
+            category: this.selectedCategory,
+            sort: this.sortBy
+        });
         this.articles = response.data || [];
         this.currentPage = response.pagination?.page || 1;
         this.totalPages = response.pagination?.pages || 1;
@@ -58,6 +62,7 @@ class ArticlesController {
         if (searchInput) {
             searchInput.addEventListener('input', (e) => {
                 this.searchTerm = e.target.value;
+                this.loadSuggestions();
                 this.debounceSearch();
             });
         }
@@ -174,11 +179,14 @@ class ArticlesController {
         const categoryFilter = document.getElementById('category-filter');
         if (!categoryFilter) return;
         
+        // While searching, show how many matches each category has
+        const counts = new Map((this.facets?.category.values || []).map(bucket => [bucket.value, bucket.count]));
+        
         categoryFilter.innerHTML = `
             <option value="">All Categories</option>
             ${this.categories.map(category => `
                 <option value="${category.name}" ${this.selectedCategory === category.name ? 'selected' : ''}>
-                    ${category.name}
+                    ${category.name}${counts.has(category.name) ? ` (${counts.get(category.name)})` : ''}
                 </option>
             `).join('')}
         `;
@@ -247,7 +255,7 @@ class ArticlesController {
                         ${article.title}
                     </h3>
                     <p class="text-gray-700 text-sm mb-4 line-clamp-3">
-                        ${article.content.substring(0, 150)}...
+                        ${article.snippet || article.content.substring(0, 150) + '...'}
                     </p>
                     <div class="flex items-center justify-between text-sm text-gray-600">
                         <span>By ${article.author || 'Anonymous'}</span>
@@ -280,7 +288,7 @@ class ArticlesController {
                                 ${article.title}
                             </h3>
                             <p class="text-gray-700 mb-2">
-                                ${article.content.substring(0, 200)}...
+                                ${article.snippet || article.content.substring(0, 200) + '...'}
                             </p>
                             <p class="text-sm text-gray-600">
                                 By ${article.author || 'Anonymous'}
@@ -386,6 +394,29 @@ class ArticlesController {
         this.renderArticles();
     }
     
+    async loadSuggestions() {
+        const datalist = document.getElementById('search-suggestions');
+        const query = this.searchTerm.trim();
+        if (!datalist) return;
+        if (query.length < 2) {
+            datalist.innerHTML = '';
+            return;
+        }
+        
+        try {
+            const response = await apiService.suggestArticles(query);
+            if (query !== this.searchTerm.trim()) return;
+            datalist.replaceChildren(...(response.data || []).map(suggestion => {
+                const option = document.createElement('option');
+                option.value = suggestion.text;
+                option.label = suggestion.type;
+                return option;
+            }));
+        } catch (error) {
+            datalist.innerHTML = '';
+        }
+    }
+    
     debounceSearch() {
         clearTimeout(this.searchTimeout);
         this.searchTimeout = setTimeout(() => {
@@ -394,12 +425,15 @@ class ArticlesController {
     }
     
     async performSearch() {
-        if (!this.searchTerm && !this.selectedCategory) {
+        this.facets = null;
+        if (!this.searchTerm) {
             await this.loadArticles();
         } else {
             try {
-                const response = await apiService.searchArticles(this.searchTerm, this.selectedCategory);
+                const facets = !this.selectedCategory;
+                const response = await apiService.searchArticles(this.searchTerm, this.selectedCategory, null, null, facets);
                 this.articles = response.data || [];
+                this.facets = response.facets || null;
                 this.currentPage = 1;
                 this.totalPages = 1;
             } catch (error) {
@@ -95,7 +95,7 @@ class HomeController {
                         ${article.title}
                     </h3>
                     <p class="text-gray-600 dark:text-gray-300 text-sm mb-4 line-clamp-3">
-                        ${article.content.substring(0, 150)}...
+                        ${(article.excerpt || article.content || '').substring(0, 150)}...
                     </p>
                     <div class="flex items-center justify-between">
                         <span class="text-sm text-gray-500 dark:text-gray-400">
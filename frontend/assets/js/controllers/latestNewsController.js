@@ -34,7 +34,7 @@ class LatestNewsController {
         try {
             console.log('Loading latest news with limit:', this.limit);
             // Fetch articles from the articles endpoint
-            const response = await apiService.getArticles(1, this.limit);
+            const response = await apiService.getArticles(1, this.limit, apiService.cardFields);
             console.log('API Response:', response);
             this.articles = response.data || [];
             console.log('Articles loaded:', this.articles.length);
@@ -225,7 +225,7 @@ class LatestNewsController {
                             ${article.title}
                         </h3>
                         <p class="text-gray-700 mb-2">
-                            ${article.content.substring(0, 200)}...
+                            ${(article.excerpt || article.content || '').substring(0, 200)}...
                         </p>
                         <p class="text-sm text-gray-600">
                             By ${article.author || 'Anonymous'}
@@ -304,7 +304,7 @@ class LatestNewsController {
         const exportData = this.filteredArticles.map(article => ({
             id: article.id,
             title: article.title,
-            content: article.content,
+            content: article.content || article.excerpt,
             author: article.author,
             category: article.category,
             created_at: article.created_at
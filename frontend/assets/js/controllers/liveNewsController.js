@@ -5,9 +5,12 @@
 class LiveNewsController {
     constructor() {
         this.articles = [];
+        this.limit = 15;
         this.autoRefresh = true;
-        this.refreshInterval = 60; // seconds
+        this.refreshInterval = 60; // seconds, when polling
         this.intervalId = null;
+        this.eventSource = null;
+        this.etag = null;
     }
     
     async init() {
@@ -22,9 +25,17 @@ class LiveNewsController {
         }
     }
     
+    /**
+     * Fetch the latest articles unless they are unchanged since the last load.
+     * Returns true when new data arrived.
+     */
     async loadLiveNews() {
-        const response = await apiService.getLatestNews(15);
-        this.articles = response.data.latest_articles || [];
+        const result = await apiService.getLatestNewsIfChanged(this.limit, this.etag);
+        if (!result) return false;
+        
+        this.etag = result.etag;
+        this.articles = result.data.data.latest_articles || [];
+        return true;
     }
     
     setupEventListeners() {
@@ -46,7 +57,7 @@ class LiveNewsController {
         if (refreshIntervalSelect) {
             refreshIntervalSelect.addEventListener('change', (e) => {
                 this.refreshInterval = parseInt(e.target.value);
-                if (this.autoRefresh) {
+                if (this.autoRefresh && !this.eventSource) {
                     this.startAutoRefresh();
                 }
             });
@@ -88,7 +99,7 @@ class LiveNewsController {
                             ${article.title}
                         </h3>
                         <p class="text-gray-600 dark:text-gray-300 mb-2">
-                            ${article.content.substring(0, 200)}...
+                            ${(article.excerpt || article.content || '').substring(0, 200)}...
                         </p>
                         <p class="text-sm text-gray-500 dark:text-gray-400">
                             By ${article.author || 'Anonymous'}
@@ -111,10 +122,10 @@ class LiveNewsController {
                 refreshBtn.disabled = true;
             }
             
-            await this.loadLiveNews();
-            this.render();
-            
-            window.app.toast.success('News updated');
+            if (await this.loadLiveNews()) {
+                this.render();
+                window.app.toast.success('News updated');
+            }
             
             if (refreshBtn) {
                 refreshBtn.innerHTML = '<i class="fas fa-sync-alt mr-2"></i>Refresh Now';
@@ -125,16 +136,81 @@ class LiveNewsController {
         }
     }
     
+    /**
+     * Apply one article change pushed by the server to the list in place.
+     */
+    applyChange(action, change) {
+        const index = this.articles.findIndex(article => article.id === change.id);
+        if (index !== -1) {
+            this.articles.splice(index, 1);
+        }
+        
+        // Updates to articles older than the list don't belong in it
+        if (change.article && (action === 'created' || index !== -1)) {
+            this.articles.push(change.article);
+            this.articles.sort((a, b) =>
+                (b.created_at || '').localeCompare(a.created_at || '') || b.id - a.id);
+            this.articles = this.articles.slice(0, this.limit);
+        }
+        
+        this.render();
+        if (action === 'created') {
+            window.app.toast.success('News updated');
+        }
+    }
+    
+    /**
+     * Follow article changes over server-sent events instead of polling.
+     * Returns false when the browser can't, so the caller polls instead.
+     */
+    startLiveStream() {
+        const source = apiService.openArticleStream();
+        if (!source) return false;
+        
+        ['created', 'updated', 'deleted'].forEach(action => {
+            source.addEventListener(action, (e) => this.applyChange(action, JSON.parse(e.data)));
+        });
+        // Too far behind to replay: reload the list
+        source.addEventListener('reset', () => this.refreshNews());
+        
+        let opened = false;
+        source.onopen = () => {
+            // Catch changes made between the initial load and the first connection
+            if (!opened) {
+                opened = true;
+                this.refreshNews();
+            }
+        };
+        source.onerror = () => {
+            // EventSource retries by itself unless the server refused the stream
+            if (source.readyState === EventSource.CLOSED && this.eventSource === source) {
+                this.eventSource = null;
+                this.startPolling();
+            }
+        };
+        
+        this.eventSource = source;
+        return true;
+    }
+    
+    startPolling() {
+        this.intervalId = setInterval(() => {
+            this.refreshNews();
+        }, this.refreshInterval * 1000);
+    }
+    
     startAutoRefresh() {
         this.stopAutoRefresh();
-        if (this.autoRefresh) {
-            this.intervalId = setInterval(() => {
-                this.refreshNews();
-            }, this.refreshInterval * 1000);
+        if (this.autoRefresh && !this.startLiveStream()) {
+            this.startPolling();
         }
     }
     
     stopAutoRefresh() {
+        if (this.eventSource) {
+            this.eventSource.close();
+            this.eventSource = null;
+        }
         if (this.intervalId) {
             clearInterval(this.intervalId);
             this.intervalId = null;
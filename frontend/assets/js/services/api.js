@@ -5,6 +5,8 @@
 class ApiService {
     constructor() {
         this.baseUrl = window.ENV?.API_BASE_URL || '';
+        // Lightweight projection for card grids (excerpt instead of full content)
+        this.cardFields = ['id', 'title', 'excerpt', 'author', 'category', 'created_at', 'updated_at'];
     }
     
     async request(endpoint, options = {}) {
@@ -37,10 +39,82 @@ class ApiService {
         }
     }
     
+    /**
+     * Several GETs in one round trip through POST /api/batch. Resolves to
+     * their response bodies in order; rejects if any of them failed.
+     */
+    async batch(endpoints) {
+        const response = await this.request('/api/batch', {
+            method: 'POST',
+            body: JSON.stringify({ requests: endpoints.map(path => ({ path })) }),
+        });
+        
+        return response.data.map(({ status, body }, index) => {
+            if (status >= 400) {
+                throw new Error(body.error || `HTTP error! status: ${status} (${endpoints[index]})`);
+            }
+            return body;
+        });
+    }
+    
+    /**
+     * Conditional GET: sends If-None-Match when an ETag is known.
+     * Resolves to null when the server answers 304 Not Modified,
+     * otherwise to { data, etag } for the fresh response.
+     */
+    async requestIfChanged(endpoint, etag = null) {
+        const url = `${this.baseUrl}${endpoint}`;
+        const headers = etag ? { 'If-None-Match': etag } : {};
+        
+        try {
+            // no-store: handle the 304 here instead of letting the browser cache answer it
+            const response = await fetch(url, { headers, cache: 'no-store' });
+            if (response.status === 304) {
+                return null;
+            }
+            
+            const data = await response.json();
+            if (!response.ok) {
+                throw new Error(data.error || `HTTP error! status: ${response.status}`);
+            }
+            
+            return { data, etag: response.headers.get('ETag') };
+        } catch (error) {
+            console.error('API request failed:', error, 'URL:', url);
+            throw error;
+        }
+    }
+    
     // Article endpoints
-    async getArticles(page = 1, limit = 10) {
+    async getArticles(page = 1, limit = 10, fields = null, filters = {}) {
         console.log('getArticles called with page:', page, 'limit:', limit);
-        return this.request(`/api/articles?page=${page}&limit=${limit}`);
+        const params = new URLSearchParams({ page, limit });
+        if (fields) params.append('fields', fields.join(','));
+        // category, author, from, to, updated_since, sort
+        Object.entries(filters).forEach(([name, value]) => {
+            if (value) params.append(name, value);
+        });
+        return this.request(`/api/articles?${params.toString()}`);
+    }
+    
+    getExportUrl(format = 'csv', filters = {}, gzip = false) {
+        const params = new URLSearchParams({ format });
+        // category, author, from, to, updated_since, sort, fields
+        Object.entries(filters).forEach(([name, value]) => {
+            if (value) params.append(name, value);
+        });
+        if (gzip) params.append('gzip', 'true');
+        return `${this.baseUrl}/api/articles/export?${params.toString()}`;
+    }
+    
+    /**
+     * Open the server-sent event stream of article changes (created, updated,
+     * deleted, reset). The browser reconnects by itself and resumes with
+     * Last-Event-ID. Returns null where EventSource is unavailable.
+     */
+    openArticleStream() {
+        if (typeof EventSource === 'undefined') return null;
+        return new EventSource(`${this.baseUrl}/api/stream/articles`);
     }
     
     async getArticle(id) {
@@ -67,15 +141,34 @@ class ApiService {
         });
     }
     
-    async searchArticles(query, category = '') {
+    async searchArticles(query, category = '', page = null, limit = null, facets = false) {
         const params = new URLSearchParams();
         if (query) params.append('q', query);
         if (category) params.append('category', category);
+        if (page) params.append('page', page);
+        if (limit) params.append('limit', limit);
+        if (facets) params.append('facets', '1');
         
         return this.request(`/api/articles/search?${params.toString()}`);
     }
     
+    async suggestArticles(query, limit = 8) {
+        const params = new URLSearchParams({ q: query, limit });
+        return this.request(`/api/articles/suggest?${params.toString()}`);
+    }
+    
     // Category endpoints
+    /**
+     * Changes after change log seq `since` (omit it to get the seq to follow
+     * from). `entities` narrows the feed, e.g. ['article', 'category'].
+     */
+    async getChanges(since = null, entities = null, limit = 100) {
+        const params = new URLSearchParams({ limit });
+        if (since !== null) params.append('since', since);
+        if (entities) params.append('entity', entities.join(','));
+        return this.request(`/api/changes?${params.toString()}`);
+    }
+    
     async getCategories() {
         return this.request('/api/categories');
     }
@@ -132,6 +225,10 @@ class ApiService {
         return this.request(`/api/pages/latest?limit=${limit}`);
     }
     
+    async getLatestNewsIfChanged(limit = 20, etag = null) {
+        return this.requestIfChanged(`/api/pages/latest?limit=${limit}`, etag);
+    }
+    
     // Health check
     async healthCheck() {
         return this.request('/api/health');
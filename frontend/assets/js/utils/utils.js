@@ -150,6 +150,26 @@ class ExportUtil {
         this.downloadBlob(blob, filename);
     }
     
+    /**
+     * Export articles through the server's streaming endpoint. The browser
+     * saves the response straight to disk instead of building it in memory.
+     * @param {string} format - 'csv' or 'ndjson'
+     * @param {Object} filters - category, author, from, to, updated_since, sort
+     * @param {boolean} gzip - compress the file on the server
+     */
+    static exportArticles(format = 'csv', filters = {}, gzip = false) {
+        this.downloadURL(apiService.getExportUrl(format, filters, gzip));
+    }
+    
+    static downloadURL(url, filename = '') {
+        const a = document.createElement('a');
+        a.href = url;
+        a.download = filename;
+        document.body.appendChild(a);
+        a.click();
+        document.body.removeChild(a);
+    }
+    
     static downloadBlob(blob, filename) {
         const url = URL.createObjectURL(blob);
         const a = document.createElement('a');
@@ -6,10 +6,12 @@ from urllib.parse import urlparse, parse_qs
 import re
 
 class Route:
-    def __init__(self, method: str, pattern: str, handler: Callable):
+    def __init__(self, method: str, pattern: str, handler: Callable, streams: bool = False):
         self.method = method.upper()
         self.pattern = pattern
         self.handler = handler
+        # The handler returns a StreamResponse, so it can't be part of a batch
+        self.streams = streams
         self.regex = self._compile_pattern(pattern)
     
     def _compile_pattern(self, pattern: str) -> re.Pattern:
@@ -28,12 +30,12 @@ class Router:
     def __init__(self):
         self.routes = []
     
-    def add_route(self, method: str, pattern: str, handler: Callable):
-        route = Route(method, pattern, handler)
+    def add_route(self, method: str, pattern: str, handler: Callable, streams: bool = False):
+        route = Route(method, pattern, handler, streams)
         self.routes.append(route)
     
-    def add_get(self, pattern: str, handler: Callable):
-        self.add_route('GET', pattern, handler)
+    def add_get(self, pattern: str, handler: Callable, streams: bool = False):
+        self.add_route('GET', pattern, handler, streams)
     
     def add_post(self, pattern: str, handler: Callable):
         self.add_route('POST', pattern, handler)
@@ -44,12 +46,13 @@ class Router:
     def add_delete(self, pattern: str, handler: Callable):
         self.add_route('DELETE', pattern, handler)
     
-    def dispatch(self, method: str, path: str) -> tuple[Optional[Callable], Optional[Dict[str, Any]]]:
+    def dispatch(self, method: str, path: str) -> tuple[Optional[Route], Optional[Dict[str, Any]]]:
+        """The route matching the request and its path params, or (None, None)"""
         for route in self.routes:
             if route.method == method.upper():
                 matches, params = route.matches(path)
                 if matches:
-                    return route.handler, params or {}
+                    return route, params or {}
         return None, None
 
 def create_router() -> Router:
@@ -58,6 +61,10 @@ def create_router() -> Router:
     from controllers.manage_article import ManageArticleController
     from controllers.manage_category import ManageCategoryController
     from controllers.manage_media import ManageMediaController
+    from controllers.metrics import MetricsController
+    from controllers.live_feed import LiveFeedController
+    from controllers.change_feed import ChangeFeedController
+    from controllers.batch import BatchController
     
     router = Router()
     
@@ -70,6 +77,8 @@ def create_router() -> Router:
     router.add_put('/api/articles/{id}', ManageArticleController.update_article)
     router.add_delete('/api/articles/{id}', ManageArticleController.delete_article)
     router.add_get('/api/articles/search', ManageArticleController.search_articles)
+    router.add_get('/api/articles/suggest', ManageArticleController.suggest)
+    router.add_get('/api/articles/export', ManageArticleController.export_articles, streams=True)
     
     # Category management endpoints
     router.add_get('/api/categories', ManageCategoryController.get_all_categories)
@@ -88,11 +97,40 @@ def create_router() -> Router:
     router.add_get('/api/pages/latest', ManageArticleController.get_latest_news)
     router.add_get('/api/statistics', ManageArticleController.get_statistics)
     
+    # Live updates and incremental sync
+    router.add_get('/api/stream/articles', LiveFeedController.stream_articles, streams=True)
+    router.add_get('/api/changes', ChangeFeedController.get_changes)
+    
+    # Several GET requests in one round trip
+    router.add_post('/api/batch', BatchController(router).batch)
+    
+    # Instrumentation
+    router.add_get('/api/metrics/queries', MetricsController.get_query_stats)
+    router.add_get('/api/metrics/caches', MetricsController.get_cache_stats)
+    
     # Health check
     router.add_get('/api/health', lambda query_params=None: (200, {'success': True, 'message': 'Server is running'}))
     
     return router
 
+def call_handler(handler: Callable, params: Dict[str, Any], query_params: Dict[str, str], body: bytes = b'') -> tuple:
+    """Call a route handler with its path id and body (each only when present) and the query parameters"""
+    if params:
+        handler_params = {}
+        for key, value in params.items():
+            try:
+                handler_params[key] = int(value)
+            except (ValueError, TypeError):
+                handler_params[key] = value
+        
+        if body:
+            return handler(handler_params.get('id'), body, query_params)
+        return handler(handler_params.get('id'), query_params)
+    
+    if body:
+        return handler(body, query_params)
+    return handler(query_params)
+
 def parse_query_string(url: str) -> Dict[str, str]:
     parsed_url = urlparse(url)
     query_dict = {}
@@ -3,12 +3,35 @@
 Main application entry point
 """
 import http.server
+import logging
 import ssl
 import os
 import sys
 from router import create_router
-from database.connection import init_db, close_db
+from database.connection import init_db, close_db, db_connection
+from services.suggest_service import suggest_service
+from services.hot_set_service import hot_set
+from services.change_log_service import change_log
+from services.live_feed_service import live_feed
+from services.change_feed_service import change_feed
 from core.middleware import RequestHandler
+from core import json_encoding
+
+class NewsServer(http.server.ThreadingHTTPServer):
+    """One thread per request; the deeper accept queue absorbs bursts of connections
+    
+    Before handling a request, writes committed by other processes are
+    applied to the in-memory caches (see services/change_log_service.py).
+    """
+    daemon_threads = True
+    request_queue_size = 128
+    
+    def process_request_thread(self, request, client_address):
+        try:
+            change_log.poll()
+            super().process_request_thread(request, client_address)
+        finally:
+            db_connection.release()
 
 def setup_ssl_certificates(cert_path: str, key_path: str):
     """Setup SSL certificates"""
@@ -26,13 +49,20 @@ def run_server(host: str = '', port: int = 8443, use_ssl: bool = True):
     """Run the HTTPS server"""
     print("Initializing database...")
     init_db()
+    # Follow the change log before loading, so no write between the two is missed
+    change_log.start()
+    suggest_service.build()
+    hot_set.build()
+    live_feed.start()
+    change_feed.start()
     print("Database initialized")
     
     RequestHandler.router = create_router()
     print("Router configured")
+    print(f"JSON encoder: {json_encoding.engine_name}")
     
     server_address = (host, port)
-    httpd = http.server.HTTPServer(server_address, RequestHandler)
+    httpd = NewsServer(server_address, RequestHandler)
     
     if use_ssl:
         cert_path = os.path.join(os.path.dirname(__file__), 'backend', 'cert.pem')
@@ -54,6 +84,9 @@ def run_server(host: str = '', port: int = 8443, use_ssl: bool = True):
     except KeyboardInterrupt:
         print("\nShutting down server...")
         httpd.server_close()
+        live_feed.stop()
+        change_feed.stop()
+        change_log.close()
         close_db()
         print("Server stopped")
         sys.exit(0)
@@ -62,6 +95,8 @@ if __name__ == '__main__':
     # Allow disabling SSL for development (useful when running behind HTTP proxy)
     import argparse
 
+    logging.basicConfig(format='[%(asctime)s] %(levelname)s %(name)s: %(message)s')
+
     parser = argparse.ArgumentParser(add_help=False)
     parser.add_argument('--no-ssl', action='store_true', help='Disable SSL (use HTTP)')
     args, _ = parser.parse_known_args()
@@ -0,0 +1,146 @@
+"""
+Change Feed Service - incremental sync from the change log, and its compaction
+"""
+import logging
+import threading
+from database.connection import db_connection
+from database.queries import ArticleQueries, CategoryQueries, ChangeQueries, MediaQueries, article_field_names
+
+logger = logging.getLogger('nms.changes')
+
+# Entities written to the change log by triggers (database/sql/changes.sql)
+CHANGE_ENTITIES = ('article', 'category', 'media')
+
+# Changes returned per request by default, and the most a client may ask for
+CHANGES_LIMIT = 100
+MAX_CHANGES_LIMIT = 1000
+
+# Seconds between compactions
+COMPACT_INTERVAL = 3600
+
+# Superseded changes are kept this many seconds, so live readers still see each one
+SUPERSEDED_RETENTION = 3600
+
+# Tombstones are kept this many seconds; clients syncing less often have to reload
+TOMBSTONE_RETENTION = 30 * 24 * 3600
+
+def _current_rows(entity: str, ids: list, fields=None) -> dict:
+    """Current rows of `entity` by id; `fields` selects article columns"""
+    if entity == 'article':
+        return ArticleQueries.get_articles_by_ids(ids, fields)
+    if entity == 'category':
+        return CategoryQueries.get_categories_by_ids(ids)
+    return MediaQueries.get_media_by_ids(ids)
+
+class ChangeFeedService:
+    """Deltas since a change log seq, for clients that sync incrementally
+
+    `get_changes(since)` returns the rows created, updated or deleted after
+    seq `since`, newest state only: several changes to one row within a page
+    collapse into its last one, carrying the row as it is now. A delete is a
+    tombstone with no data. The caller passes the returned `next` seq as
+    `since` on its next call.
+
+    A background thread compacts the log every COMPACT_INTERVAL seconds (see
+    database/sql/changes.sql). A client whose `since` is older than the
+    dropped tombstones, or newer than any seq issued, gets `reset` and
+    reloads in full, as does one reaching a bulk import's reset marker.
+    """
+
+    def __init__(self, compact_interval: float = COMPACT_INTERVAL):
+        self.compact_interval = compact_interval
+        self._stopped = threading.Event()
+        self._thread = None
+        self.compactions = 0
+
+    def get_changes(self, since: int = None, limit: int = CHANGES_LIMIT, entities=None, fields=None) -> dict:
+        """Changes after seq `since` (none, when omitted: just the seq to follow from)"""
+        entities = tuple(entities or CHANGE_ENTITIES)
+        unknown = [entity for entity in entities if entity not in CHANGE_ENTITIES]
+        if unknown:
+            raise ValueError(f"Unknown entity: {', '.join(unknown)}")
+        article_field_names(fields)
+        if not 1 <= limit <= MAX_CHANGES_LIMIT:
+            raise ValueError(f"limit must be between 1 and {MAX_CHANGES_LIMIT}")
+
+        # Read before the changes, so `next` never skips one logged in between
+        head = ChangeQueries.get_last_seq()
+        if since is None:
+            return {'changes': [], 'next': head, 'has_more': False, 'reset': False}
+        if since > head:
+            # A seq this log never issued, e.g. from before the database was recreated
+            return {'changes': [], 'next': head, 'has_more': False, 'reset': True}
+
+        rows = ChangeQueries.get_changes_after(since, limit + 1, entities)
+        # Checked after reading, so a compaction in between can't go unnoticed;
+        # a reset marker (e.g. from a bulk import) stands for changes never logged one by one
+        if since < ChangeQueries.get_horizon() or any(row['action'] == 'reset' for row in rows[:limit]):
+            return {'changes': [], 'next': head, 'has_more': False, 'reset': True}
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        latest = {}
+        for row in rows:
+            key = (row['entity'], row['entity_id'])
+            latest.pop(key, None)
+            latest[key] = row
+
+        current = {}
+        for entity in entities:
+            ids = [entity_id for (name, entity_id), row in latest.items()
+                   if name == entity and row['action'] != 'deleted']
+            current[entity] = _current_rows(entity, ids, fields)
+
+        changes = [{
+            'seq': row['seq'],
+            'entity': row['entity'],
+            'id': row['entity_id'],
+            'action': row['action'],
+            'changed_at': row['changed_at'],
+            'data': current[row['entity']].get(row['entity_id'])
+        } for row in latest.values()]
+
+        if has_more:
+            next_seq = rows[-1]['seq']
+        else:
+            next_seq = max([since, head] + [row['seq'] for row in rows[-1:]])
+        return {'changes': changes, 'next': next_seq, 'has_more': has_more, 'reset': False}
+
+    def compact(self, superseded_retention: int = SUPERSEDED_RETENTION,
+                tombstone_retention: int = TOMBSTONE_RETENTION) -> dict:
+        """Drop superseded changes and expired tombstones now; how many of each"""
+        result = ChangeQueries.compact(superseded_retention, tombstone_retention)
+        self.compactions += 1
+        return result
+
+    def start(self):
+        """Compact now and then every `compact_interval` seconds in the background"""
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='change-log-compaction', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop compacting"""
+        if self._thread is None:
+            return
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        while True:
+            try:
+                result = self.compact()
+                if result['superseded'] or result['tombstones']:
+                    logger.info('change log compacted: %(superseded)d superseded, %(tombstones)d tombstones', result)
+            except Exception:
+                logger.exception('change log compaction failed')
+            finally:
+                db_connection.release()
+            if self._stopped.wait(self.compact_interval):
+                return
+
+# Global instance
+change_feed = ChangeFeedService()
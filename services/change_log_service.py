@@ -0,0 +1,134 @@
+"""
+Change Log Service - keep in-process caches coherent with writes from other processes
+"""
+import logging
+import sqlite3
+import threading
+from core.cache import data_generation
+from core.events import events
+from database.connection import db_connection
+from database.queries import article_cache
+
+logger = logging.getLogger('nms.changes')
+
+# More changes than this in one poll reset the caches instead of being replayed
+RESET_THRESHOLD = 1000
+
+class ChangeLogService:
+    """Replay `change_log` rows written since the last poll
+
+    Triggers (database/sql/changes.sql) log every article, category and
+    media write, whichever process made it. `poll()` runs before each
+    request: `PRAGMA data_version` on a private connection tells whether any
+    other connection has committed since the last poll, and only then are
+    the new log rows read. Each article row drops that article's cached JSON
+    and response and search caches move to a new data generation; then each
+    row is published on the event bus, so the hot set and suggestions re-read
+    just that row.
+
+    The write path polls right after committing instead of publishing its
+    own events, so every write reaches subscribers exactly once, through
+    the log, whichever process made it.
+    """
+
+    def __init__(self, reset_threshold: int = RESET_THRESHOLD):
+        self.reset_threshold = reset_threshold
+        self._lock = threading.Lock()
+        self._conn = None
+        self._path = None
+        self._data_version = None
+        self._last_seq = None
+        self.replayed = 0
+        self.resets = 0
+
+    def start(self):
+        """Follow writes committed from now on"""
+        with self._lock:
+            self._open()
+
+    def poll(self) -> int:
+        """Apply changes committed by other connections since the last poll; returns how many
+        
+        Caches are invalidated under the lock, before it is released, so no
+        request reads a stale entry once the poller has seen a change. Events
+        are published after that, so request threads polling meanwhile aren't
+        held up by subscribers reloading.
+        """
+        if self._last_seq is None:
+            return 0
+
+        with self._lock:
+            try:
+                if db_connection.path != self._path:
+                    self._open()
+                    return 0
+
+                version = self._conn.execute('PRAGMA data_version').fetchone()[0]
+                if version == self._data_version:
+                    return 0
+                self._data_version = version
+
+                rows = self._conn.execute(
+                    'SELECT seq, entity, entity_id, action FROM change_log WHERE seq > ? ORDER BY seq LIMIT ?',
+                    (self._last_seq, self.reset_threshold + 1)
+                ).fetchall()
+                if len(rows) > self.reset_threshold:
+                    self._last_seq = self._max_seq()
+                elif rows:
+                    self._last_seq = rows[-1][0]
+                # Too many rows to replay, or a reset marker written by a bulk import
+                reset = len(rows) > self.reset_threshold or any(row[3] == 'reset' for row in rows)
+                if reset:
+                    article_cache.clear()
+                elif rows:
+                    self._invalidate(rows)
+                if rows:
+                    data_generation.bump()
+            except sqlite3.Error:
+                logger.exception('change log poll failed')
+                return 0
+
+        if reset:
+            for entity in sorted({entity for _, entity, _, _ in rows}):
+                events.publish(entity, 'reset', None)
+            self.resets += 1
+        else:
+            for _, entity, entity_id, action in rows:
+                events.publish(entity, action, entity_id)
+            self.replayed += len(rows)
+        return len(rows)
+
+    def close(self):
+        """Stop following writes and close the private connection"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = None
+            self._path = None
+            self._last_seq = None
+
+    def stats(self) -> dict:
+        """Last applied sequence number, rows replayed and cache resets"""
+        return {'last_seq': self._last_seq, 'replayed': self.replayed, 'resets': self.resets}
+
+    def _open(self):
+        if self._conn is not None:
+            self._conn.close()
+        self._path = db_connection.path
+        self._conn = sqlite3.connect(self._path, check_same_thread=False)
+        self._data_version = self._conn.execute('PRAGMA data_version').fetchone()[0]
+        self._last_seq = self._max_seq()
+
+    def _max_seq(self) -> int:
+        return self._conn.execute('SELECT COALESCE(MAX(seq), 0) FROM change_log').fetchone()[0]
+
+    def _invalidate(self, rows: list):
+        for _, entity, entity_id, _ in rows:
+            if entity == 'article':
+                article_cache.invalidate(entity_id)
+            elif entity == 'category':
+                # Cached articles embed the category name
+                article_cache.clear()
+
+# Global instance
+change_log = ChangeLogService()
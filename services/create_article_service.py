@@ -2,6 +2,7 @@
 Create Article Service - Business logic for article creation
 """
 from database.queries import ArticleQueries
+from services.change_log_service import change_log
 
 class CreateArticleService:
     @staticmethod
@@ -17,4 +18,7 @@ class CreateArticleService:
         article_data.setdefault('author', 'Anonymous')
         article_data.setdefault('category', 'General')
         
-        return ArticleQueries.create_article(article_data)
\ No newline at end of file
+        article_id = ArticleQueries.create_article(article_data)
+        # Subscribers hear of the new row from the change log
+        change_log.poll()
+        return article_id
\ No newline at end of file
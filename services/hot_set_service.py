@@ -0,0 +1,148 @@
+"""
+Hot Set Service - the newest articles held in memory as a read model
+"""
+import threading
+from bisect import bisect_left, insort
+from operator import itemgetter
+from core.events import events
+from core.serialization import encode_rows
+from database.queries import ArticleQueries, ARTICLE_DEFAULT_FIELDS, article_field_names
+
+# Articles kept in the window
+HOT_SET_SIZE = 500
+
+# The only ordering the window can serve
+HOT_SET_SORT = 'newest'
+
+# Rows are tuples of the default article fields plus the card excerpt
+_ROW_FIELDS = ARTICLE_DEFAULT_FIELDS + ('excerpt',)
+_FIELD_INDEX = {name: i for i, name in enumerate(_ROW_FIELDS)}
+_ID = itemgetter(_FIELD_INDEX['id'])
+_CATEGORY = itemgetter(_FIELD_INDEX['category'])
+_CREATED_AT = itemgetter(_FIELD_INDEX['created_at'])
+
+def _row(article: dict) -> tuple:
+    """Compact row for an article dict; excerpt matches substr(content, 1, 200)"""
+    content = article['content']
+    excerpt = None if content is None else content[:200]
+    return tuple(article[name] for name in ARTICLE_DEFAULT_FIELDS) + (excerpt,)
+
+def _projection(names: tuple):
+    """Function from a row to the tuple of `names`"""
+    if len(names) == 1:
+        index = _FIELD_INDEX[names[0]]
+        return lambda row: (row[index],)
+    return itemgetter(*(_FIELD_INDEX[name] for name in names))
+
+def _sort_key(row: tuple) -> tuple:
+    """(created_at, id): ascending order is the reverse of ORDER BY created_at DESC, id DESC"""
+    created_at = _CREATED_AT(row)
+    return ('' if created_at is None else str(created_at), _ID(row))
+
+class HotSetService:
+    """The latest HOT_SET_SIZE articles, by id and by category name
+
+    The window holds every article whose `(created_at, id)` is at or above
+    `_floor` (all articles when `_floor` is None), so any newest-first page
+    that ends inside the window is exact. It is loaded once and then kept
+    current from `article` and `category` events: an article event re-reads
+    that one row, a category event reloads the window since rows embed the
+    category name. Pages reaching past the window return None and the
+    caller queries the database.
+    """
+
+    def __init__(self, size: int = HOT_SET_SIZE):
+        self.size = size
+        self._lock = threading.Lock()
+        self._rows = {}
+        self._order = []
+        self._by_category = {}
+        self._floor = None
+        self._built = False
+
+    def build(self):
+        """Load the window from the database and start following writes"""
+        with self._lock:
+            self._reload()
+            self._built = True
+
+        events.subscribe('article', self._on_article)
+        events.subscribe('category', self._on_category)
+
+    def get_page(self, offset: int, limit: int, filters: dict = None, sort: str = HOT_SET_SORT,
+                 fields=None, as_json: bool = False):
+        """Rows like ArticleQueries.get_articles_paginated, or None if the window can't answer"""
+        filters = filters or {}
+        if sort != HOT_SET_SORT or any(name != 'category' for name in filters):
+            return None
+        names = article_field_names(fields)
+
+        with self._lock:
+            if not self._built:
+                return None
+            category = filters.get('category')
+            keys = self._by_category.get(category, []) if category else self._order
+            end = len(keys) - max(offset, 0)
+            start = end - limit if limit >= 0 else -1
+            if start < 0:
+                if self._floor is not None:
+                    return None
+                start = 0
+            rows = [self._rows[key[1]] for key in reversed(keys[start:max(end, 0)])]
+
+        rows = list(map(_projection(names), rows))
+        if as_json:
+            return encode_rows(names, rows)
+        return [dict(zip(names, row)) for row in rows]
+
+    def _on_article(self, entity: str, action: str, article_id: int):
+        # Re-read under the lock so events handled out of order still converge on the committed row
+        with self._lock:
+            if action == 'reset':
+                self._reload()
+                return
+            self._remove(article_id)
+            article = ArticleQueries.get_article_by_id(article_id)
+            if article:
+                row = _row(article)
+                if self._floor is None or _sort_key(row) >= self._floor:
+                    self._insert(row)
+                    if len(self._rows) > self.size:
+                        self._remove(self._order[0][1])
+                        self._floor = self._order[0]
+            elif self._floor is not None and len(self._rows) < self.size // 2:
+                self._reload()
+
+    def _on_category(self, entity: str, action: str, category_id: int):
+        if action != 'created':
+            with self._lock:
+                self._reload()
+
+    def _reload(self):
+        articles = ArticleQueries.get_articles_paginated(self.size, 0, fields=ARTICLE_DEFAULT_FIELDS)
+        self._rows = {}
+        self._order = []
+        self._by_category = {}
+        for article in articles:
+            self._insert(_row(article))
+        self._floor = self._order[0] if len(articles) >= self.size else None
+
+    def _insert(self, row: tuple):
+        key = _sort_key(row)
+        self._rows[key[1]] = row
+        insort(self._order, key)
+        insort(self._by_category.setdefault(_CATEGORY(row), []), key)
+
+    def _remove(self, article_id: int):
+        row = self._rows.pop(article_id, None)
+        if row is None:
+            return
+        key = _sort_key(row)
+        category_keys = self._by_category[_CATEGORY(row)]
+        for keys in (self._order, category_keys):
+            del keys[bisect_left(keys, key)]
+        if not category_keys:
+            del self._by_category[_CATEGORY(row)]
+
+# Global instance
+hot_set = HotSetService()
@@ -0,0 +1,173 @@
+"""
+Live Feed Service - article changes pushed to open streams as server-sent events
+"""
+import logging
+import threading
+from core.events import events
+from core.responses import RawJSON
+from core.sse import EventHub, sse_comment, sse_event
+from database.connection import db_connection
+from database.queries import ArticleQueries, ChangeQueries, ARTICLE_CARD_FIELDS
+
+logger = logging.getLogger('nms.live')
+
+# Frames a stream may fall behind by before it is closed
+CLIENT_BUFFER_SIZE = 256
+
+# Seconds of silence before a heartbeat comment is sent
+HEARTBEAT_INTERVAL = 15
+
+# Seconds between change log reads when no write in this process wakes the pump
+POLL_INTERVAL = 1.0
+
+# Changes read per query by the pump
+BATCH_SIZE = 500
+
+# Most changes replayed to a reconnecting client; further behind, it gets a reset
+RESUME_LIMIT = 1000
+
+# Reconnection delay suggested to EventSource, in milliseconds
+RETRY_MS = 3000
+
+class LiveFeedService:
+    """Fan article changes out to every open /api/stream/articles stream
+
+    One pump thread reads `change_log` (database/sql/changes.sql) past the
+    last seq it published and turns each article change into one SSE frame,
+    `id: <seq>`, `event: created|updated|deleted`, with the article's card
+    fields as data (`article` is null once the row is gone). Article events
+    in this process wake the pump at once; writes by other processes are
+    picked up within POLL_INTERVAL. Each frame is encoded once and appended
+    to every stream's bounded buffer by the hub.
+
+    The seq doubles as the SSE event id, so a client reconnecting with
+    Last-Event-ID gets the changes it missed straight from the log, or a
+    `reset` event when it is too far behind and should reload.
+    """
+
+    def __init__(self, client_buffer_size: int = CLIENT_BUFFER_SIZE, heartbeat_interval: float = HEARTBEAT_INTERVAL,
+                 poll_interval: float = POLL_INTERVAL):
+        self.client_buffer_size = client_buffer_size
+        self.heartbeat_interval = heartbeat_interval
+        self.poll_interval = poll_interval
+        self.hub = EventHub()
+        self._pump_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._last_seq = 0
+
+    def start(self):
+        """Publish changes committed from now on"""
+        if self._thread is not None:
+            return
+        self._last_seq = ChangeQueries.get_last_seq()
+        self.hub.advance(self._last_seq)
+        self._stopped.clear()
+        events.subscribe('article', self._on_article)
+        self._thread = threading.Thread(target=self._run, name='live-feed', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the pump thread; open streams only get heartbeats from then on"""
+        if self._thread is None:
+            return
+        events.unsubscribe('article', self._on_article)
+        self._stopped.set()
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+
+    def pump(self) -> int:
+        """Publish the article changes logged since the last pump; returns how many"""
+        with self._pump_lock:
+            total = 0
+            while True:
+                changes = ChangeQueries.get_changes_after(self._last_seq, BATCH_SIZE, ('article',))
+                if not changes:
+                    return total
+                self._last_seq = changes[-1]['seq']
+                total += len(changes)
+                if not self.hub.advance(self._last_seq):
+                    for seq, frame in self._frames(changes):
+                        self.hub.publish(seq, frame)
+                if len(changes) < BATCH_SIZE:
+                    return total
+
+    def stream(self, last_event_id: int = None):
+        """SSE byte chunks for one client: changes after `last_event_id`, then live ones
+
+        Subscribes when iteration starts and unsubscribes when the generator
+        is closed. Ends when the client falls more than `client_buffer_size`
+        frames behind.
+        """
+        subscription = self.hub.subscribe(self.client_buffer_size)
+        try:
+            yield b'retry: %d\n\n' % RETRY_MS
+            sent = subscription.start_seq
+            if last_event_id is not None and last_event_id != sent:
+                sent = yield from self._resume(last_event_id, sent)
+            # Idle streams hold no pooled connection
+            db_connection.release()
+
+            while not subscription.overflowed:
+                frames = subscription.wait(self.heartbeat_interval)
+                if not frames:
+                    if not subscription.overflowed:
+                        yield sse_comment('heartbeat')
+                    continue
+                for seq, frame in frames:
+                    if seq > sent:
+                        sent = seq
+                        yield frame
+        finally:
+            self.hub.unsubscribe(subscription)
+
+    def stats(self) -> dict:
+        """Open streams and frames published or dropped by the hub"""
+        return self.hub.stats()
+
+    def _resume(self, after: int, current: int):
+        """Yield the frames a client missed after seq `after`; returns the last seq sent"""
+        changes = [] if after > current else ChangeQueries.get_changes_after(after, RESUME_LIMIT + 1, ('article',))
+        if (after > current or len(changes) > RESUME_LIMIT or after < ChangeQueries.get_horizon()
+                or any(change['action'] == 'reset' for change in changes)):
+            # Unknown id (e.g. a recreated database), too far behind, deletes compacted away or a bulk import
+            yield sse_event(b'{}', 'reset', current)
+            return current
+
+        sent = after
+        for seq, frame in self._frames(changes):
+            sent = seq
+            yield frame
+        return max(sent, current)
+
+    def _frames(self, changes: list):
+        """(seq, frame) for each change, with current card fields read in one query"""
+        ids = {change['entity_id'] for change in changes if change['action'] not in ('deleted', 'reset')}
+        cards = ArticleQueries.get_articles_by_ids(ids, ARTICLE_CARD_FIELDS, as_json=True)
+        for change in changes:
+            if change['action'] == 'reset':
+                # A bulk import's marker: clients reload instead
+                yield change['seq'], sse_event(b'{}', 'reset', change['seq'])
+                continue
+            card = cards.get(change['entity_id'])
+            data = RawJSON.object(id=change['entity_id'], article=RawJSON(card) if card else None)
+            yield change['seq'], sse_event(data.body, change['action'], change['seq'])
+
+    def _on_article(self, entity: str, action: str, article_id: int):
+        self._wake.set()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            try:
+                self.pump()
+            except Exception:
+                logger.exception('live feed pump failed')
+            finally:
+                db_connection.release()
+
+# Global instance
+live_feed = LiveFeedService()
@@ -1,31 +1,153 @@
 """
 Manage Article Service - Business logic for article management
 """
-from database.queries import ArticleQueries
+import csv
+import io
+from datetime import datetime
+from database.queries import ArticleQueries, ARTICLE_CARD_FIELDS, article_cache
+from database.listing import DEFAULT_SORT, LISTING_FILTERS
+from core.pagination import encode_page_token, decode_page_token
+from services.change_log_service import change_log
+from core.cache import LRUCache, data_generation
+from core.search import build_match_query, fold_case
+from core.serialization import encode_ndjson
+from services.hot_set_service import hot_set
+
+SEARCH_MODES = ('words', 'infix')
+
+# Buckets returned per facet by default, and the most a client may ask for
+FACET_LIMIT = 10
+MAX_FACET_LIMIT = 50
+
+# Search results kept in memory, keyed on the data generation (see core/cache.py)
+SEARCH_CACHE_SIZE = 256
+search_cache = LRUCache(SEARCH_CACHE_SIZE)
+
+# Most articles a listing page may ask for (the admin pages load 1000 at once)
+MAX_PAGE_SIZE = 1000
+
+# Export format -> Content-Type
+EXPORT_FORMATS = {'csv': 'text/csv; charset=utf-8', 'ndjson': 'application/x-ndjson'}
+
+# Listing filters holding timestamps, compared as text with created_at/updated_at
+TIMESTAMP_FILTERS = ('from', 'to', 'updated_since')
+
+def _listing_filters(filters: dict = None) -> dict:
+    """Drop unset filters and normalize ISO dates to the stored timestamp format
+    
+    Timestamps are stored as local `datetime.now()` text, so a date with a
+    UTC offset is converted to local time before it is compared.
+    """
+    normalized = {}
+    for name, value in (filters or {}).items():
+        if value in (None, ''):
+            continue
+        if name in TIMESTAMP_FILTERS:
+            try:
+                value = datetime.fromisoformat(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid date for {name}: {value}")
+            if value.tzinfo is not None:
+                value = value.astimezone().replace(tzinfo=None)
+            value = str(value)
+        normalized[name] = value
+    return normalized
+
+def _check_paging(page: int, limit: int):
+    """Reject page sizes outside 1..MAX_PAGE_SIZE and pages before the first"""
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    if page < 1:
+        raise ValueError('page must be at least 1')
+
+def _csv_chunks(columns: list, batches):
+    """CSV with a header row, one chunk per batch of rows"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
 
 class ManageArticleService:
     @staticmethod
-    def get_paginated_articles(page: int, limit: int) -> dict:
-        """Get paginated articles"""
+    def get_paginated_articles(page: int, limit: int, as_json: bool = False, fields=None,
+                               include_total: bool = True, filters: dict = None,
+                               sort: str = DEFAULT_SORT) -> dict:
+        """Get a page of articles, optionally filtered and sorted (see database/listing.py)"""
+        _check_paging(page, limit)
+        filters = _listing_filters(filters)
         offset = (page - 1) * limit
-        articles = ArticleQueries.get_articles_paginated(limit, offset)
-        total_count = ArticleQueries.get_articles_count()
+        articles = hot_set.get_page(offset, limit, filters, sort, fields, as_json)
+        if articles is None:
+            articles = ArticleQueries.get_articles_paginated(limit, offset, as_json, fields, filters, sort)
+        
+        pagination = {'page': page, 'limit': limit}
+        if include_total:
+            total_count = ArticleQueries.get_articles_count(filters)
+            pagination['total'] = total_count
+            pagination['pages'] = (total_count + limit - 1) // limit
+        
+        return {'data': articles, 'pagination': pagination}
+    
+    @staticmethod
+    def get_articles_after(limit: int, after: str = None, as_json: bool = False, fields=None,
+                           include_total: bool = False, filters: dict = None,
+                           sort: str = DEFAULT_SORT) -> dict:
+        """Get a keyset page of articles following the opaque `after` token
+        
+        The token holds the sort value and id of the last row, so it must be
+        used with the same `filters` and `sort` as the page it came from.
+        """
+        _check_paging(1, limit)
+        filters = _listing_filters(filters)
+        position = decode_page_token(after) if after else None
+        articles, next_position = ArticleQueries.get_articles_after(limit, position, as_json, fields, filters, sort)
         
-        return {
-            'data': articles,
-            'pagination': {
-                'page': page,
-                'limit': limit,
-                'total': total_count,
-                'pages': (total_count + limit - 1) // limit
-            }
+        pagination = {
+            'limit': limit,
+            'next': encode_page_token(next_position) if next_position else None,
+            'has_more': next_position is not None
         }
+        if include_total:
+            pagination['total'] = ArticleQueries.get_articles_count(filters)
+        
+        return {'data': articles, 'pagination': pagination}
+    
+    @staticmethod
+    def export_articles(fmt: str = 'csv', filters: dict = None, sort: str = DEFAULT_SORT, fields=None):
+        """Every article matching the listing `filters` as CSV or NDJSON byte chunks
+        
+        Rows are encoded one cursor batch at a time, so neither the result
+        set nor the file is ever held in memory.
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {fmt}")
+        columns, batches = ArticleQueries.iter_articles(_listing_filters(filters), sort, fields)
+        
+        if fmt == 'ndjson':
+            return (encode_ndjson(columns, rows) for rows in batches)
+        return _csv_chunks(columns, batches)
     
     @staticmethod
     def get_article_by_id(article_id: int) -> dict:
         """Get article by ID"""
         return ArticleQueries.get_article_by_id(article_id)
     
+    @staticmethod
+    def get_article_json(article_id: int) -> bytes:
+        """Get article by ID as JSON object bytes (None if missing), cached per id"""
+        return ArticleQueries.get_article_json(article_id)
+    
+    @staticmethod
+    def get_cache_stats() -> dict:
+        """Size and hit/miss counters of the article and search caches"""
+        return {'articles': article_cache.stats(), 'search': search_cache.stats()}
+    
     @staticmethod
     def update_article(article_id: int, article_data: dict) -> bool:
         """Update article"""
@@ -34,31 +156,99 @@ class ManageArticleService:
         if not article_data.get('content'):
             raise ValueError('Content is required')
         
-        return ArticleQueries.update_article(article_id, article_data)
+        updated = ArticleQueries.update_article(article_id, article_data)
+        if updated:
+            change_log.poll()
+        return updated
     
     @staticmethod
     def delete_article(article_id: int) -> bool:
         """Delete article"""
-        return ArticleQueries.delete_article(article_id)
+        deleted = ArticleQueries.delete_article(article_id)
+        if deleted:
+            change_log.poll()
+        return deleted
+    
+    @staticmethod
+    def search_articles(search_term: str, category: str = None, page: int = 1, limit: int = 20,
+                        as_json: bool = False, fields=None, mode: str = 'words',
+                        facets: bool = False, facet_limit: int = FACET_LIMIT) -> dict:
+        """Paginated search: ranked full-text (`words`) or title/author substring (`infix`)
+        
+        With `facets`, the result also carries category, author and month
+        counts over the whole match set, capped at `facet_limit` buckets
+        each. The facet pass counts the matches too, replacing the separate
+        count query.
+        
+        Results are cached per normalized query, filters and page until the
+        next article or category write.
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode}")
+        
+        page = max(page, 1)
+        limit = min(max(limit, 1), 100)
+        facet_limit = min(max(facet_limit, 1), MAX_FACET_LIMIT) if facets else None
+        
+        # Inputs that differ only in spacing, case or quoting run the same query
+        normalized = fold_case(search_term) if mode == 'infix' else build_match_query(search_term).lower()
+        key = (data_generation.value, mode, normalized, category or None, page, limit,
+               as_json, tuple(fields) if fields else None, facet_limit)
+        result = search_cache.get(key)
+        if result is None:
+            result = ManageArticleService._run_search(
+                search_term, category, page, limit, as_json, fields, mode, facet_limit
+            )
+            search_cache.put(key, result)
+        return result
+    
+    @staticmethod
+    def _run_search(search_term: str, category: str, page: int, limit: int, as_json: bool,
+                    fields, mode: str, facet_limit: int = None) -> dict:
+        facets = facet_limit is not None
+        if mode == 'infix':
+            articles = ArticleQueries.search_articles_infix(
+                search_term, limit, (page - 1) * limit, category, as_json, fields
+            )
+            counts = (ArticleQueries.infix_facets(search_term, category, facet_limit) if facets
+                      else {'total': ArticleQueries.count_infix_results(search_term, category)})
+        else:
+            articles = ArticleQueries.search_articles(
+                search_term, limit, (page - 1) * limit, category, as_json, fields
+            )
+            counts = (ArticleQueries.search_facets(search_term, category, facet_limit) if facets
+                      else {'total': ArticleQueries.count_search_results(search_term, category)})
+        
+        total = counts['total']
+        pagination = {
+            'page': page,
+            'limit': limit,
+            'total': total,
+            'pages': (total + limit - 1) // limit
+        }
+        result = {'data': articles, 'pagination': pagination}
+        if facets:
+            result['facets'] = counts['facets']
+        return result
     
     @staticmethod
-    def search_articles(search_term: str, category: str = None) -> list:
-        """Search articles"""
-        if search_term:
-            return ArticleQueries.search_articles(search_term)
-        elif category:
-            return ArticleQueries.get_articles_by_category(category)
-        return []
+    def get_articles_by_category(category: str, as_json: bool = False, fields=None):
+        """Get all articles of a category"""
+        return ArticleQueries.get_articles_by_category(category, as_json, fields)
     
     @staticmethod
-    def get_featured_articles(limit: int) -> list:
-        """Get featured articles"""
-        return ArticleQueries.get_latest_articles(limit)
+    def get_featured_articles(limit: int, as_json: bool = False, fields=None):
+        """Get featured articles (card projection unless fields are given)"""
+        return ManageArticleService.get_latest_articles(limit, as_json, fields)
     
     @staticmethod
-    def get_latest_articles(limit: int) -> list:
-        """Get latest articles"""
-        return ArticleQueries.get_latest_articles(limit)
+    def get_latest_articles(limit: int, as_json: bool = False, fields=None):
+        """Get latest articles (card projection unless fields are given), from the hot set when possible"""
+        fields = fields or ARTICLE_CARD_FIELDS
+        articles = hot_set.get_page(0, limit, fields=fields, as_json=as_json)
+        if articles is None:
+            articles = ArticleQueries.get_latest_articles(limit, as_json, fields)
+        return articles
     
     @staticmethod
     def get_statistics() -> dict:
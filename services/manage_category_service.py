@@ -2,6 +2,7 @@
 Manage Category Service - Business logic for category management
 """
 from database.queries import CategoryQueries
+from services.change_log_service import change_log
 
 class ManageCategoryService:
     @staticmethod
@@ -16,7 +17,9 @@ class ManageCategoryService:
             raise ValueError('Category name is required')
         
         category_data.setdefault('description', '')
-        return CategoryQueries.create_category(category_data)
+        category_id = CategoryQueries.create_category(category_data)
+        change_log.poll()
+        return category_id
     
     @staticmethod
     def get_category_by_id(category_id: int) -> dict:
@@ -29,9 +32,15 @@ class ManageCategoryService:
         if not category_data.get('name'):
             raise ValueError('Category name is required')
         
-        return CategoryQueries.update_category(category_id, category_data)
+        updated = CategoryQueries.update_category(category_id, category_data)
+        if updated:
+            change_log.poll()
+        return updated
     
     @staticmethod
     def delete_category(category_id: int) -> bool:
         """Delete category"""
-        return CategoryQueries.delete_category(category_id)
\ No newline at end of file
+        deleted = CategoryQueries.delete_category(category_id)
+        if deleted:
+            change_log.poll()
+        return deleted
\ No newline at end of file
@@ -2,6 +2,7 @@
 Manage Media Service - Business logic for media management
 """
 from database.queries import MediaQueries
+from core.pagination import encode_page_token, decode_page_token
 
 class ManageMediaService:
     @staticmethod
@@ -9,6 +10,22 @@ class ManageMediaService:
         """Get all media"""
         return MediaQueries.get_all_media()
     
+    @staticmethod
+    def get_media_after(limit: int, after: str = None, include_total: bool = False) -> dict:
+        """Get a keyset page of media following the opaque `after` token"""
+        position = decode_page_token(after) if after else None
+        media_list, next_position = MediaQueries.get_media_after(limit, position)
+        
+        pagination = {
+            'limit': limit,
+            'next': encode_page_token(next_position) if next_position else None,
+            'has_more': next_position is not None
+        }
+        if include_total:
+            pagination['total'] = MediaQueries.get_media_count()
+        
+        return {'data': media_list, 'pagination': pagination}
+    
     @staticmethod
     def create_media(media_data: dict) -> int:
         """Create media record"""
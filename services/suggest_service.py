@@ -0,0 +1,149 @@
+"""
+Suggest Service - typeahead suggestions from an in-memory prefix index
+"""
+import threading
+from core.events import events
+from core.prefix_index import PrefixIndex
+from database.queries import ArticleQueries, CategoryQueries
+
+class SuggestService:
+    """Article titles, authors and category names, ranked by recency
+    
+    The index is built from the database once and then kept current from
+    `article` and `category` events published by the change log, so a
+    lookup never touches SQLite. Author and category recency is the newest
+    article seen for them.
+    """
+    
+    MIN_PREFIX_LENGTH = 2
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index = PrefixIndex()
+        self._articles = {}
+        self._authors = {}
+        self._categories = {}
+        self._built = False
+    
+    def build(self):
+        """Load the index from the database and start following writes"""
+        articles = ArticleQueries.get_suggestion_rows()
+        categories = CategoryQueries.get_all_categories()
+        
+        with self._lock:
+            self._categories = {c['id']: {'name': c['name'], 'latest': ''} for c in categories}
+            self._articles = {}
+            self._authors = {}
+            items = []
+            for article in articles:
+                created_at = str(article['created_at'] or '')
+                self._articles[article['id']] = {
+                    'title': article['title'],
+                    'author': article['author'],
+                    'category_id': article['category_id']
+                }
+                items.append((('article', article['id']), article['title'], created_at))
+                if article['author']:
+                    author = self._authors.setdefault(article['author'], {'count': 0, 'latest': ''})
+                    author['count'] += 1
+                    author['latest'] = max(author['latest'], created_at)
+                category = self._categories.get(article['category_id'])
+                if category:
+                    category['latest'] = max(category['latest'], created_at)
+            
+            items.extend((('author', name), name, author['latest']) for name, author in self._authors.items())
+            items.extend((('category', category_id), category['name'], category['latest'])
+                         for category_id, category in self._categories.items())
+            self._index = PrefixIndex()
+            self._index.load(items)
+            self._built = True
+        
+        events.subscribe('article', self._on_article)
+        events.subscribe('category', self._on_category)
+    
+    def suggest(self, prefix: str, limit: int = 10) -> list:
+        """Top `limit` suggestions whose words start with `prefix`, newest first"""
+        if not self._built:
+            self.build()
+        if len(PrefixIndex.normalize(prefix)) < self.MIN_PREFIX_LENGTH:
+            return []
+        
+        with self._lock:
+            refs = self._index.search(prefix, limit)
+            suggestions = []
+            for kind, key in refs:
+                if kind == 'article':
+                    suggestions.append({'type': 'article', 'id': key, 'text': self._articles[key]['title']})
+                elif kind == 'category':
+                    suggestions.append({'type': 'category', 'id': key, 'text': self._categories[key]['name']})
+                else:
+                    suggestions.append({'type': 'author', 'text': key})
+            return suggestions
+    
+    def _on_article(self, entity: str, action: str, article_id: int):
+        if action == 'reset':
+            self.build()
+            return
+        # Re-read under the lock so events handled out of order still converge on the committed row
+        with self._lock:
+            article = ArticleQueries.get_article_by_id(article_id)
+            self._remove_article(article_id)
+            if article:
+                if article['category_id'] and article['category_id'] not in self._categories:
+                    self._set_category(article['category_id'], article['category'])
+                self._add_article(article)
+    
+    def _on_category(self, entity: str, action: str, category_id: int):
+        if action == 'reset':
+            self.build()
+            return
+        with self._lock:
+            category = CategoryQueries.get_category_by_id(category_id)
+            if category:
+                self._set_category(category_id, category['name'])
+            else:
+                self._categories.pop(category_id, None)
+                self._index.remove(('category', category_id))
+    
+    def _set_category(self, category_id: int, name: str):
+        entry = self._categories.setdefault(category_id, {'name': name, 'latest': ''})
+        entry['name'] = name
+        self._index.add(('category', category_id), name, entry['latest'])
+    
+    def _add_article(self, article: dict):
+        created_at = str(article['created_at'] or '')
+        self._articles[article['id']] = {
+            'title': article['title'],
+            'author': article['author'],
+            'category_id': article['category_id']
+        }
+        self._index.add(('article', article['id']), article['title'], created_at)
+        
+        author = article['author']
+        if author:
+            entry = self._authors.setdefault(author, {'count': 0, 'latest': ''})
+            entry['count'] += 1
+            if created_at > entry['latest']:
+                entry['latest'] = created_at
+                self._index.add(('author', author), author, created_at)
+        
+        category = self._categories.get(article['category_id'])
+        if category and created_at > category['latest']:
+            category['latest'] = created_at
+            self._index.add(('category', article['category_id']), category['name'], created_at)
+    
+    def _remove_article(self, article_id: int):
+        article = self._articles.pop(article_id, None)
+        if article is None:
+            return
+        self._index.remove(('article', article_id))
+        
+        author = self._authors.get(article['author'])
+        if author is not None:
+            author['count'] -= 1
+            if author['count'] <= 0:
+                del self._authors[article['author']]
+                self._index.remove(('author', article['author']))
+
+# Global instance
+suggest_service = SuggestService()
@@ -94,6 +94,23 @@ class ApiSmokeTest:
             print(f"✗ Get statistics failed: {e}")
             return False
     
+    def test_batch(self):
+        """Test batch endpoint returns each GET's own response, in order"""
+        try:
+            response = self.session.post(
+                f'{self.base_url}/api/batch',
+                json={'requests': [{'path': '/api/statistics'}, {'path': '/api/categories'}, {'path': '/api/missing'}]}
+            )
+            assert response.status_code == 200
+            results = response.json()['data']
+            assert [result['status'] for result in results] == [200, 200, 404]
+            assert results[1]['body'] == self.session.get(f'{self.base_url}/api/categories').json()
+            print("✓ Batch passed")
+            return True
+        except Exception as e:
+            print(f"✗ Batch failed: {e}")
+            return False
+    
     def cleanup(self):
         """Clean up test data"""
         if hasattr(self, 'test_article_id'):
@@ -114,7 +131,8 @@ class ApiSmokeTest:
             self.test_get_articles,
             self.test_create_article,
             self.test_get_categories,
-            self.test_get_statistics
+            self.test_get_statistics,
+            self.test_batch
         ]
         
         passed = 0
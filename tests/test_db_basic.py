@@ -5,17 +5,68 @@ Database Basic Tests - Test database operations
 import sys
 import os
 import sqlite3
-from datetime import datetime
+import csv
+import gzip
+import importlib
+import io
+import itertools
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
 
 # Add parent directory to path to import modules
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
 
-from database.connection import init_db, close_db, db_connection
-from database.queries import ArticleQueries, CategoryQueries, MediaQueries
+from database.connection import init_db, close_db, db_connection, run_sql_script
+from database.queries import ArticleQueries, CategoryQueries, MediaQueries, article_cache
+from database.listing import LISTING_FILTERS, LISTING_SORTS, compile_listing
+from core.instrumentation import query_stats, set_current_route
+from router import create_router
+from controllers.batch import BatchController
+from controllers.metrics import MetricsController
+from controllers.manage_article import ManageArticleController
+from core.cache import ResponseCache, data_generation
+from core.events import events
+from core.pagination import decode_page_token, encode_page_token
+from core.responses import RawJSON, compute_etag, etag_matches, gzip_chunks
+from core.json_encoding import ENGINES
+from core.prefix_index import PrefixIndex
+from core.serialization import encode_ndjson, encode_row, encode_rows
+from services.create_article_service import CreateArticleService
+from services.manage_article_service import ManageArticleService, search_cache
+from services.suggest_service import SuggestService
+from services.hot_set_service import HotSetService
+from services.change_log_service import ChangeLogService, change_log
+from services.live_feed_service import LiveFeedService
+from services.change_feed_service import ChangeFeedService
+
+_backend_modules = {}
+
+def backend_module(name: str):
+    """A module of the legacy backend/ stack
+    
+    Its `database`, `services` and `controllers` modules shadow the root
+    packages of the same names, so those are taken out of sys.modules while it loads.
+    """
+    if not _backend_modules:
+        backend_dir = os.path.join(ROOT_DIR, 'backend')
+        shadowed = {module: sys.modules.pop(module) for module in ('database', 'services', 'controllers') if module in sys.modules}
+        sys.path.insert(0, backend_dir)
+        try:
+            for module in ('database', 'models', 'services', 'controllers', 'import_news'):
+                _backend_modules[module] = importlib.import_module(module)
+        finally:
+            sys.path.remove(backend_dir)
+            sys.modules.update(shadowed)
+    return _backend_modules[name]
 
 class DatabaseBasicTest:
     def __init__(self):
         self.test_db_path = 'test_news.db'
+        self.backend_db_path = 'test_backend_news.db'
         
     def setup(self):
         """Setup test database"""
@@ -23,6 +74,8 @@ class DatabaseBasicTest:
             # Use test database
             db_connection.connect(self.test_db_path)
             init_db()
+            # Writes reach the event bus through the change log, as in the server
+            change_log.start()
             print("✓ Test database setup completed")
             return True
         except Exception as e:
@@ -37,7 +90,7 @@ class DatabaseBasicTest:
                 'title': 'Test Article',
                 'content': 'This is test content',
                 'author': 'Test Author',
-                'category': 'Test Category'
+                'category': 'Test Article Category'
             }
             
             article_id = ArticleQueries.create_article(article_data)
@@ -55,7 +108,7 @@ class DatabaseBasicTest:
                 'title': 'Updated Test Article',
                 'content': 'Updated content',
                 'author': 'Updated Author',
-                'category': 'Updated Category'
+                'category': 'Updated Article Category'
             }
             
             success = ArticleQueries.update_article(article_id, updated_data)
@@ -203,6 +256,13 @@ class DatabaseBasicTest:
             assert 'total_articles' in stats
             assert 'total_categories' in stats
             assert 'total_authors' in stats
+            
+            cursor = db_connection.get_connection().cursor()
+            cursor.execute('SELECT COUNT(*), COUNT(DISTINCT category_id), COUNT(DISTINCT author) FROM news')
+            total, categories, authors = cursor.fetchone()
+            assert stats['total_articles'] == total
+            assert stats['total_categories'] == categories
+            assert stats['total_authors'] == authors
             print("✓ Statistics retrieval passed")
             return True
             
@@ -210,12 +270,1093 @@ class DatabaseBasicTest:
             print(f"✗ Statistics test failed: {e}")
             return False
     
+    def test_query_instrumentation(self):
+        """Test that statements are timed and tagged with the calling route"""
+        try:
+            query_stats.reset()
+            set_current_route('GET /api/test')
+            ArticleQueries.get_articles_paginated(5, 0)
+            ArticleQueries.get_articles_count()
+            set_current_route(None)
+            
+            statements = {entry['sql']: entry for entry in query_stats.snapshot()}
+            paginated = [s for s in statements if 'FROM news ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?' in s]
+            assert len(paginated) == 1
+            assert statements[paginated[0]]['calls'] == 1
+            assert statements[paginated[0]]['routes'] == {'GET /api/test': 1}
+            
+            plan = query_stats.explain(db_connection.get_connection(), 'SELECT * FROM news WHERE id = ?', (1,))
+            assert any('news' in line for line in plan)
+            
+            # Requests are tagged with their route pattern, not the concrete path
+            router = create_router()
+            route, params = router.dispatch('GET', '/api/articles/999999')
+            assert route.pattern == '/api/articles/{id}' and params == {'id': '999999'}
+            assert router.dispatch('GET', '/api/nothing-here') == (None, None)
+            query_stats.reset()
+            batch = BatchController(router)
+            for url in ('/api/articles/999999', '/api/articles/999998'):
+                batch._run(url)
+            routes = {}
+            for entry in query_stats.snapshot():
+                for name, calls in entry['routes'].items():
+                    routes[name] = routes.get(name, 0) + calls
+            assert set(routes) == {'GET /api/articles/{id}'} and routes['GET /api/articles/{id}'] >= 2
+            
+            # Streaming routes are refused by a batch without running their handler
+            query_stats.reset()
+            refused = json.loads(batch._run('/api/articles/export?format=csv'))
+            assert refused['status'] == 400 and not refused['body']['success']
+            assert query_stats.snapshot() == []
+            
+            # Distinct statements are capped, least recently executed evicted first
+            query_stats.reset()
+            conn = db_connection.get_connection()
+            cap = query_stats.MAX_STATEMENTS
+            query_stats.record(conn, 'SELECT 0', (), 1.0, 1)
+            for i in range(1, cap + 10):
+                query_stats.record(conn, f'SELECT {i}', (), 1.0, 1)
+                if i % 100 == 0:
+                    query_stats.record(conn, 'SELECT 0', (), 1.0, 1)
+            recorded = {entry['sql'] for entry in query_stats.snapshot(cap * 2)}
+            assert len(recorded) == cap
+            assert 'SELECT 0' in recorded and 'SELECT 1' not in recorded
+            for i in range(cap + 10):
+                query_stats.explain(conn, f'SELECT {i}')
+            assert len(query_stats._plans) == cap
+            query_stats.reset()
+            
+            for bad in ('abc', '0'):
+                status, body = MetricsController.get_query_stats({'limit': bad})
+                assert status == 400 and not body['success']
+            assert MetricsController.get_query_stats({'limit': '5'})[0] == 200
+            print("✓ Query instrumentation passed")
+            return True
+            
+        except Exception as e:
+            print(f"✗ Query instrumentation failed: {e}")
+            return False
+    
+    def test_keyset_pagination(self):
+        """Test that keyset pages cover every article exactly once"""
+        try:
+            article_ids = []
+            for i in range(5):
+                article_ids.append(ArticleQueries.create_article({
+                    'title': f'Keyset Article {i}',
+                    'content': 'Keyset pagination content',
+                    'author': 'Test Author',
+                    'category': 'Test'
+                }))
+            
+            seen = []
+            position = None
+            while True:
+                rows, position = ArticleQueries.get_articles_after(2, position, fields=['id'])
+                seen.extend(row['id'] for row in rows)
+                if position is None:
+                    break
+            
+            assert seen == sorted(seen, reverse=True)
+            assert set(article_ids) <= set(seen)
+            assert len(seen) == len(set(seen)) == ArticleQueries.get_articles_count()
+            
+            # Tokens round-trip, and forged ones are rejected instead of reaching SQLite
+            assert decode_page_token(encode_page_token(('2024-01-01 00:00:00', 7))) == ('2024-01-01 00:00:00', 7)
+            for position in ([[1], {}], ['a'], [1, 2, 3]):
+                try:
+                    decode_page_token(encode_page_token(position))
+                    assert False, f'cursor {position} accepted'
+                except ValueError:
+                    pass
+            
+            # Page sizes and numbers are validated on both listing paths
+            for params in ({'limit': '0'}, {'limit': '-1'}, {'limit': '1001'}, {'page': '0'},
+                           {'pagination': 'cursor', 'limit': '0'}):
+                assert ManageArticleController.get_all_articles(params)[0] == 400, params
+            assert ManageArticleController.get_all_articles({'limit': '1000', 'fields': 'id'})[0] == 200
+            print("✓ Keyset pagination passed")
+            
+            for article_id in article_ids:
+                ArticleQueries.delete_article(article_id)
+            return True
+            
+        except Exception as e:
+            print(f"✗ Keyset pagination failed: {e}")
+            return False
+    
+    def test_row_counters(self):
+        """Test that trigger-maintained counters match COUNT(*)"""
+        try:
+            cursor = db_connection.get_connection().cursor()
+            
+            article_id = ArticleQueries.create_article({
+                'title': 'Counter Article',
+                'content': 'Counter content',
+                'author': 'Test Author',
+                'category': 'Counters'
+            })
+            assert ArticleQueries.get_category_counts().get('Counters') == 1
+            
+            ArticleQueries.update_article(article_id, {
+                'title': 'Counter Article',
+                'content': 'Counter content',
+                'author': 'Test Author',
+                'category': 'Moved'
+            })
+            counts = ArticleQueries.get_category_counts()
+            assert 'Counters' not in counts and counts.get('Moved') == 1
+            
+            ArticleQueries.delete_article(article_id)
+            
+            cursor.execute('SELECT COUNT(*) FROM news')
+            assert ArticleQueries.get_articles_count() == cursor.fetchone()[0]
+            cursor.execute('SELECT COUNT(*) FROM media')
+            assert MediaQueries.get_media_count() == cursor.fetchone()[0]
+            assert 'Moved' not in ArticleQueries.get_category_counts()
+            print("✓ Row counters passed")
+            return True
+            
+        except Exception as e:
+            print(f"✗ Row counters failed: {e}")
+            return False
+    
+    def test_category_foreign_key(self):
+        """Test that articles follow their category through renames and deletes"""
+        try:
+            article_id = ArticleQueries.create_article({
+                'title': 'Linked Article',
+                'content': 'Linked content',
+                'author': 'Test Author',
+                'category': 'Linked'
+            })
+            article = ArticleQueries.get_article_by_id(article_id)
+            category = CategoryQueries.get_category_by_id(article['category_id'])
+            assert article['category'] == category['name'] == 'Linked'
+            
+            CategoryQueries.update_category(category['id'], {'name': 'Renamed', 'description': ''})
+            assert ArticleQueries.get_article_by_id(article_id)['category'] == 'Renamed'
+            assert [a['id'] for a in ArticleQueries.get_articles_by_category('Renamed')] == [article_id]
+            assert ArticleQueries.get_articles_by_category('Linked') == []
+            assert ArticleQueries.get_category_counts().get('Renamed') == 1
+            
+            CategoryQueries.delete_category(category['id'])
+            article = ArticleQueries.get_article_by_id(article_id)
+            assert article['category_id'] is None and article['category'] is None
+            assert 'Renamed' not in ArticleQueries.get_category_counts()
+            ArticleQueries.delete_article(article_id)
+            
+            # Uncategorized articles read as None in listings and in the counts
+            uncategorized = ArticleQueries.get_category_counts().get(None, 0)
+            article_id = ArticleQueries.create_article({
+                'title': 'Uncategorized Article',
+                'content': 'No category',
+                'author': 'Test Author',
+                'category': ''
+            })
+            assert ArticleQueries.get_article_by_id(article_id)['category'] is None
+            counts = ArticleQueries.get_category_counts()
+            assert counts[None] == uncategorized + 1 and '' not in counts
+            ArticleQueries.delete_article(article_id)
+            
+            # The migration maps empty free-text categories the same way
+            legacy = sqlite3.connect(':memory:')
+            legacy.executescript('''
+                CREATE TABLE categories (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL UNIQUE,
+                                         description TEXT, created_at TIMESTAMP);
+                CREATE TABLE news (id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL, content TEXT NOT NULL,
+                                   author TEXT, category TEXT, created_at TIMESTAMP, updated_at TIMESTAMP);
+                INSERT INTO categories (name) VALUES ('');
+                INSERT INTO news (title, content, category) VALUES ('a', 'a', 'World'), ('b', 'b', ''), ('c', 'c', NULL);
+            ''')
+            run_sql_script(legacy.cursor(), 'migrate_category_id.sql')
+            migrated = legacy.execute('''
+                SELECT news.title, categories.name FROM news
+                LEFT JOIN categories ON categories.id = news.category_id ORDER BY news.id
+            ''').fetchall()
+            legacy.close()
+            assert migrated == [('a', 'World'), ('b', None), ('c', None)]
+            print("✓ Category foreign key passed")
+            return True
+            
+        except Exception as e:
+            print(f"✗ Category foreign key failed: {e}")
+            return False
+    
+    def test_full_text_search(self):
+        """Test FTS5 search: ranking, prefixes, phrases, snippets and sync triggers"""
+        try:
+            title_hit = ArticleQueries.create_article({
+                'title': 'Quantum computing breakthrough',
+                'content': 'Researchers report a new error correction scheme',
+                'author': 'Test Author',
+                'category': 'Science'
+            })
+            body_hit = ArticleQueries.create_article({
+                'title': 'Weekly roundup',
+                'content': 'Also this week: quantum sensors and computing budgets',
+                'author': 'Test Author',
+                'category': 'Science'
+            })
+            
+            results = ArticleQueries.search_articles('quantum')
+            assert [r['id'] for r in results] == [title_hit, body_hit]
+            assert '<mark>Quantum</mark>' in results[0]['snippet']
+            assert [r['id'] for r in ArticleQueries.search_articles('quant')] == [title_hit, body_hit]
+            assert [r['id'] for r in ArticleQueries.search_articles('"quantum computing"')] == [title_hit]
+            assert ArticleQueries.count_search_results('quantum', 'Science') == 2
+            assert ArticleQueries.search_articles('quantum', limit=1, offset=1)[0]['id'] == body_hit
+            assert ArticleQueries.search_articles('"unbalanced (') == []
+            
+            ArticleQueries.update_article(body_hit, {
+                'title': 'Weekly roundup',
+                'content': 'Nothing to see here',
+                'author': 'Test Author',
+                'category': 'Science'
+            })
+            assert [r['id'] for r in ArticleQueries.search_articles('quantum')] == [title_hit]
+            
+            ArticleQueries.delete_article(title_hit)
+            ArticleQueries.delete_article(body_hit)
+            assert ArticleQueries.count_search_results('quantum') == 0
+            print("✓ Full-text search passed")
+            return True
+            
+        except Exception as e:
+            print(f"✗ Full-text search failed: {e}")
+            return False
+    
+    def test_infix_search(self):
+        """Test substring search on titles and authors through the trigram index"""
+        try:
+            article_id = ArticleQueries.create_article({
+                'title': 'Interview with the mayor',
+                'content': 'Infix search content',
+                'author': 'Dana Johnson',
+                'category': 'Test'
+            })
+            
+            assert [r['id'] for r in ArticleQueries.search_articles_infix('OHNSO')] == [article_id]
+            assert [r['id'] for r in ArticleQueries.search_articles_infix('rview wi')] == [article_id]
+            assert ArticleQueries.count_infix_results('ohnson', 'Test') == 1
+            assert ArticleQueries.count_infix_results('ohnson', 'Other') == 0
+            assert ArticleQueries.search_articles_infix('content') == []
+            try:
+                ArticleQueries.search_articles_infix('oh')
+                assert False, 'two-character fragment accepted'
+            except ValueError:
+                pass
+            
+            ArticleQueries.delete_article(article_id)
+            assert ArticleQueries.count_infix_results('ohnson') == 0
+            print("✓ Infix search passed")
+            return True
+            
+        except Exception as e:
+            print(f"✗ Infix search failed: {e}")
+            return False
+    
+    def test_search_facets(self):
+        """Test category/author/month facet counts over the search match set"""
+        try:
+            article_ids = [
+                ArticleQueries.create_article({
+                    'title': f'Glacier survey {n}',
+                    'content': 'Facet content',
+                    'author': author,
+                    'category': category
+                })
+                for n, (author, category) in enumerate([
+                    ('Ines Facet', 'Facet One'), ('Ines Facet', 'Facet Two'), ('Omar Facet', 'Facet One')
+                ])
+            ]
+            
+            result = ArticleQueries.search_facets('glacier')
+            assert result['total'] == 3
+            assert result['facets']['category']['values'] == [
+                {'value': 'Facet One', 'count': 2}, {'value': 'Facet Two', 'count': 1}
+            ]
+            assert result['facets']['author']['values'][0] == {'value': 'Ines Facet', 'count': 2}
+            assert result['facets']['month']['values'] == [{'value': datetime.now().strftime('%Y-%m'), 'count': 3}]
+            
+            capped = ArticleQueries.search_facets('glacier', limit=1)
+            assert capped['facets']['category'] == {'values': [{'value': 'Facet One', 'count': 2}], 'distinct': 2}
+            assert ArticleQueries.search_facets('glacier', 'Facet Two')['total'] == 1
+            assert ArticleQueries.infix_facets('mar fac')['facets']['author']['values'] == [{'value': 'Omar Facet', 'count': 1}]
+            assert ArticleQueries.search_facets('nomatchxyz')['total'] == 0
+            
+            for article_id in article_ids:
+                ArticleQueries.delete_article(article_id)
+            print("✓ Search facets passed")
+            return True
+            
+        except Exception as e:
+            print(f"✗ Search facets failed: {e}")
+            return False
+    
+    def test_listing_engine(self):
+        """Test filtered/sorted listings and that every shape reads in index order"""
+        try:
+            conn = db_connection.get_connection()
+            cursor = conn.cursor()
+            article_ids = []
+            for created_at, updated_at, author in [
+                ('2020-01-05 10:00:00', '2020-03-01 00:00:00', 'Lena Listing'),
+                ('2020-02-05 10:00:00', '2020-02-06 00:00:00', 'Lena Listing'),
+                ('2020-02-20 10:00:00', '2020-02-21 00:00:00', 'Max Listing')
+            ]:
+                article_ids.append(ArticleQueries.create_article({
+                    'title': 'Listing article',
+                    'content': 'Listing content',
+                    'author': author,
+                    'category': 'Listing'
+                }))
+                cursor.execute('UPDATE news SET created_at = ?, updated_at = ? WHERE id = ?',
+                               (created_at, updated_at, article_ids[-1]))
+            conn.commit()
+            
+            def listed(filters, sort='newest'):
+                rows = ArticleQueries.get_articles_paginated(10, 0, fields=['id'], filters=filters, sort=sort)
+                return [row['id'] for row in rows]
+            
+            first, second, third = article_ids
+            assert listed({'category': 'Listing'}) == [third, second, first]
+            assert listed({'category': 'Listing'}, 'oldest') == [first, second, third]
+            assert listed({'category': 'Listing'}, 'updated') == [first, third, second]
+            assert listed({'author': 'Lena Listing', 'category': 'Listing'}) == [second, first]
+            assert listed({'category': 'Listing', 'from': '2020-02-01', 'to': '2020-02-20 10:00:00'}) == [second]
+            assert listed({'category': 'Listing', 'updated_since': '2020-02-15'}, 'oldest') == [first, third]
+            
+            # Dates with a UTC offset mean the same instant as the stored local times
+            plus_five = timezone(timedelta(hours=5))
+            offset_filters = {
+                'category': 'Listing',
+                'from': datetime(2020, 2, 1).astimezone(plus_five).isoformat(),
+                'to': datetime(2020, 2, 20, 10).astimezone(plus_five).isoformat()
+            }
+            page = ManageArticleService.get_paginated_articles(1, 10, fields=['id'], filters=offset_filters)
+            assert [row['id'] for row in page['data']] == [second]
+            assert ArticleQueries.get_articles_count({'category': 'Listing', 'author': 'Max Listing'}) == 1
+            assert ArticleQueries.get_articles_count({'category': 'Listing'}) == 3
+            
+            rows, position = ArticleQueries.get_articles_after(2, None, fields=['id'], filters={'category': 'Listing'}, sort='oldest')
+            assert [row['id'] for row in rows] == [first, second]
+            rows, position = ArticleQueries.get_articles_after(2, position, fields=['id'], filters={'category': 'Listing'}, sort='oldest')
+            assert [row['id'] for row in rows] == [third] and position is None
+            
+            # No filter/sort/paging combination may fall back to sorting
+            for size in range(len(LISTING_FILTERS) + 1):
+                for shape in itertools.combinations(LISTING_FILTERS, size):
+                    for sort in LISTING_SORTS:
+                        for keyset, after in ((False, False), (True, False), (True, True)):
+                            query = compile_listing(shape, sort, 'id', keyset, after)
+                            cursor.execute('EXPLAIN QUERY PLAN ' + query, ('x',) * query.count('?'))
+                            plan = ' | '.join(row[3] for row in cursor.fetchall())
+                            assert 'TEMP B-TREE' not in plan, (shape, sort, plan)
+            
+            for article_id in article_ids:
+                ArticleQueries.delete_article(article_id)
+            print("✓ Listing engine passed")
+            return True
+            
+        except Exception as e:
+            print(f"✗ Listing engine failed: {e}")
+            return False
+    
+    def test_search_cache(self):
+        """Test that repeated searches are served from memory until the next write"""
+        try:
+            article_id = ArticleQueries.create_article({
+                'title': 'Volcano eruption update',
+                'content': 'Search cache content',
+                'author': 'Cache Author',
+                'category': 'Test'
+            })
+            search_cache.clear()
+            
+            first = ManageArticleService.search_articles('volcano', as_json=True)
+            stats = search_cache.stats()
+            again = ManageArticleService.search_articles('  VOLCANO', as_json=True)
+            assert again is first
+            assert search_cache.stats()['hits'] == stats['hits'] + 1
+            assert ManageArticleService.search_articles('volcano', page=2, as_json=True) is not first
+            
+            ArticleQueries.delete_article(article_id)
+            after_write = ManageArticleService.search_articles('volcano', as_json=True)
+            assert after_write is not first
+            assert first['pagination']['total'] == 1 and after_write['pagination']['total'] == 0
+            print("✓ Search cache passed")
+            return True
+            
+        except Exception as e:
+            print(f"✗ Search cache failed: {e}")
+            return False
+    
+    def test_response_cache(self):
+        """Test that concurrent misses compute a response once and writes invalidate it"""
+        try:
+            cache = ResponseCache()
+            calls = []
+            
+            @cache.cached
+            def handler(query_params=None):
+                calls.append(query_params)
+                time.sleep(0.05)
+                return (200, {'success': True, 'calls': len(calls)})
+            
+            results = []
+            threads = [threading.Thread(target=lambda: results.append(handler({'limit': '5'}))) for _ in range(20)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            
+            assert len(calls) == 1
+            assert len({id(body) for _, body in results}) == 1
+            assert results[0][1].body == b'{"success":true,"calls":1}'
+            assert cache.stats()['coalesced'] + cache.stats()['hits'] == 19
+            
+            handler({'limit': '6'})
+            assert len(calls) == 2
+            data_generation.bump()
+            handler({'limit': '5'})
+            assert len(calls) == 3
+            print("✓ Response cache passed")
+            return True
+            
+        except Exception as e:
+            print(f"✗ Response cache failed: {e}")
+            return False
+    
+    def test_etags(self):
+        """Test cached responses carry an ETag and If-None-Match matching"""
+        try:
+            cache = ResponseCache()
+            handler = cache.cached(lambda query_params=None: (200, {'success': True}))
+            _, body = handler({})
+            etag = compute_etag(body.body)
+            assert body.etag == etag
+            assert handler({})[1].etag == etag
+            
+            assert etag_matches(etag, etag)
+            assert etag_matches(f'"other", W/{etag}', etag)
+            assert etag_matches('*', etag)
+            assert not etag_matches('"other"', etag)
+            assert not etag_matches(None, etag)
+            print("✓ ETags passed")
+            return True
+            
+        except Exception as e:
+            print(f"✗ ETags failed: {e}")
+            return False
+    
+    def test_json_encoding(self):
+        """Test every JSON engine produces compact, equivalent bytes"""
+        try:
+            value = {'success': True, 'data': [{'id': 1, 'title': 'Café — naïve', 'score': 1.5, 'tags': None}],
+                     'counts': {7: 2}}
+            expected = {'success': True, 'data': [{'id': 1, 'title': 'Café — naïve', 'score': 1.5, 'tags': None}],
+                        'counts': {'7': 2}}
+            for name, encode in ENGINES.items():
+                body = encode(value)
+                assert isinstance(body, bytes), name
+                assert json.loads(body) == expected, name
+                assert b', ' not in body and b': ' not in body, name
+            print(f"✓ JSON encoding passed ({', '.join(ENGINES)})")
+            return True
+            
+        except Exception as e:
+            print(f"✗ JSON encoding failed: {e}")
+            return False
+    
+    def test_row_serialization(self):
+        """Test row encoders match json.dumps of the same rows as dicts"""
+        try:
+            columns = ['id', 'title', 'score', 'note', '100% "quoted"']
+            rows = [
+                (1, 'Plain', 1.5, None, 'x'),
+                (2, '50% off, "quoted" \\ %s %%', 2, 'Café — naïve ✓', None),
+                (None, None, None, 'tab\tnew\nline', 3),
+                (3, 'emoji 🎉', -0.25, '', 1e20)
+            ]
+            expected = [dict(zip(columns, row)) for row in rows]
+            assert json.loads(encode_rows(columns, rows)) == json.loads(json.dumps(expected))
+            assert json.loads(encode_rows(columns, iter(rows))) == expected
+            assert [json.loads(line) for line in encode_ndjson(columns, rows).splitlines()] == expected
+            for row, record in zip(rows, expected):
+                assert json.loads(encode_row(columns, row)) == json.loads(json.dumps(record))
+            
+            assert encode_rows(columns, []) == b'[]' and json.loads(encode_rows(columns, [])) == []
+            assert encode_ndjson(columns, iter([])) == b''
+            print("✓ Row serialization passed")
+            return True
+            
+        except Exception as e:
+            print(f"✗ Row serialization failed: {e}")
+            return False
+    
+    def test_article_cache(self):
+        """Test single-article reads are cached and invalidated per id"""
+        try:
+            article_id = CreateArticleService.create_article({
+                'title': 'Cached article',
+                'content': 'Cache content',
+                'author': 'Cache Author',
+                'category': 'Test'
+            })
+            other_id = CreateArticleService.create_article({
+                'title': 'Other cached article',
+                'content': 'Cache content',
+                'author': 'Cache Author',
+                'category': 'Test'
+            })
+            
+            body = ArticleQueries.get_article_json(article_id)
+            assert json.loads(body) == ArticleQueries.get_article_by_id(article_id)
+            other = ArticleQueries.get_article_json(other_id)
+            hits = article_cache.stats()['hits']
+            assert ArticleQueries.get_article_json(article_id) is body
+            assert article_cache.stats()['hits'] == hits + 1
+            
+            ManageArticleService.update_article(article_id, {
+                'title': 'Cached article v2',
+                'content': 'Cache content',
+                'author': 'Cache Author',
+                'category': 'Test'
+            })
+            assert json.loads(ArticleQueries.get_article_json(article_id))['title'] == 'Cached article v2'
+            assert ArticleQueries.get_article_json(other_id) is other
+            
+            ManageArticleService.delete_article(article_id)
+            assert ArticleQueries.get_article_json(article_id) is None
+            
+            # A load racing with a write is not stored
+            def load(key):
+                article_cache.invalidate(other_id)
+                return b'{}'
+            article_cache.get(-1, load)
+            assert article_cache.get(-1, lambda key: None) is None
+            print("✓ Article cache passed")
+            return True
+            
+        except Exception as e:
+            print(f"✗ Article cache failed: {e}")
+            return False
+    
+    def test_hot_set(self):
+        """Test the latest-articles window matches the database and follows writes"""
+        try:
+            article_ids = [CreateArticleService.create_article({
+                'title': f'Hot article {i}',
+                'content': f'Hot content {i}',
+                'author': 'Hot Author',
+                'category': 'Hot' if i % 2 else 'Test'
+            }) for i in range(6)]
+            hot_set = HotSetService(size=5)
+            hot_set.build()
+            
+            def matches(offset, limit, filters, fields=None):
+                page = hot_set.get_page(offset, limit, filters, fields=fields, as_json=True)
+                return page == ArticleQueries.get_articles_paginated(limit, offset, True, fields, filters)
+            
+            assert matches(0, 5, {})
+            assert matches(1, 2, {'category': 'Hot'}, ['id', 'excerpt'])
+            assert hot_set.get_page(1, 3, {'category': 'Hot'}) is None
+            assert hot_set.get_page(3, 3, {}) is None
+            assert hot_set.get_page(0, 5, {}, sort='oldest') is None
+            assert hot_set.get_page(0, 5, {'author': 'Hot Author'}) is None
+            
+            ManageArticleService.delete_article(article_ids[5])
+            ManageArticleService.update_article(article_ids[3], {
+                'title': 'Hot article moved',
+                'content': 'Hot content',
+                'author': 'Hot Author',
+                'category': 'Test'
+            })
+            new_id = CreateArticleService.create_article({
+                'title': 'Hot article new',
+                'content': 'Hot content',
+                'author': 'Hot Author',
+                'category': 'Hot'
+            })
+            assert hot_set.get_page(0, 1, {})[0]['id'] == new_id
+            assert matches(0, 5, {})
+            assert matches(0, 1, {'category': 'Test'})
+            
+            for article_id in article_ids[:5] + [new_id]:
+                ManageArticleService.delete_article(article_id)
+            print("✓ Hot set passed")
+            return True
+            
+        except Exception as e:
+            print(f"✗ Hot set failed: {e}")
+            return False
+    
+    def test_export(self):
+        """Test streamed CSV/NDJSON exports honour listing filters"""
+        try:
+            article_ids = [CreateArticleService.create_article({
+                'title': f'Export, "quoted" {i}',
+                'content': f'Export content\nline {i}',
+                'author': 'Export Author',
+                'category': 'Test'
+            }) for i in range(3)]
+            filters = {'author': 'Export Author'}
+            
+            rows = list(csv.reader(io.StringIO(b''.join(
+                ManageArticleService.export_articles('csv', filters, 'oldest')).decode('utf-8'))))
+            assert rows[0] == ['id', 'title', 'content', 'author', 'category', 'category_id', 'created_at', 'updated_at']
+            assert [int(row[0]) for row in rows[1:]] == article_ids
+            assert rows[1][1] == 'Export, "quoted" 0' and rows[1][2] == 'Export content\nline 0'
+            
+            chunks = ManageArticleService.export_articles('ndjson', filters, fields=['id', 'title'])
+            lines = gzip.decompress(b''.join(gzip_chunks(chunks))).splitlines()
+            assert [json.loads(line) for line in lines] == [
+                {'id': article_id, 'title': f'Export, "quoted" {i}'} for i, article_id in reversed(list(enumerate(article_ids)))
+            ]
+            
+            empty = b''.join(ManageArticleService.export_articles('ndjson', {'author': 'Nobody at all'}))
+            assert empty == b''
+            try:
+                ManageArticleService.export_articles('xml')
+                assert False, 'unknown format accepted'
+            except ValueError:
+                pass
+            
+            for article_id in article_ids:
+                ArticleQueries.delete_article(article_id)
+            print("✓ Export passed")
+            return True
+            
+        except Exception as e:
+            print(f"✗ Export failed: {e}")
+            return False
+    
+    def test_change_log(self):
+        """Test writes from another connection invalidate this process's caches"""
+        try:
+            article_id = CreateArticleService.create_article({
+                'title': 'Logged article',
+                'content': 'Logged content',
+                'author': 'Log Author',
+                'category': 'Test'
+            })
+            watcher = ChangeLogService(reset_threshold=3)
+            watcher.start()
+            assert watcher.poll() == 0
+            # Subscribers run after poll has released its lock, with caches already invalidated
+            delivered = []
+            def on_article(entity, action, entity_id):
+                delivered.append((action, watcher._lock.locked(), data_generation.value > generation))
+            events.subscribe('article', on_article)
+            assert json.loads(ArticleQueries.get_article_json(article_id))['title'] == 'Logged article'
+            
+            # A second connection stands in for another worker process
+            other = sqlite3.connect(self.test_db_path)
+            other.execute("UPDATE news SET title = 'Edited elsewhere' WHERE id = ?", (article_id,))
+            other.commit()
+            generation = data_generation.value
+            assert watcher.poll() == 1
+            assert data_generation.value > generation
+            assert json.loads(ArticleQueries.get_article_json(article_id))['title'] == 'Edited elsewhere'
+            assert watcher.poll() == 0
+            
+            other.executemany("UPDATE news SET author = ? WHERE id = ?", [('Bulk', article_id)] * 4)
+            other.commit()
+            assert watcher.poll() == 4
+            assert watcher.stats()['resets'] == 1
+            assert json.loads(ArticleQueries.get_article_json(article_id))['author'] == 'Bulk'
+            events.unsubscribe('article', on_article)
+            assert delivered == [('updated', False, True), ('reset', False, True)]
+            
+            # A write by this process is published once, through the log
+            change_log.poll()
+            local = []
+            def on_local(entity, action, entity_id):
+                local.append((action, entity_id))
+            events.subscribe('article', on_local)
+            ManageArticleService.delete_article(article_id)
+            events.unsubscribe('article', on_local)
+            assert local == [('deleted', article_id)]
+            other.close()
+            watcher.close()
+            assert watcher.poll() == 0
+            print("✓ Change log passed")
+            return True
+            
+        except Exception as e:
+            print(f"✗ Change log failed: {e}")
+            return False
+    
+    def test_live_feed(self):
+        """Test article changes fan out as SSE frames, with resume and bounded client buffers"""
+        def parse(frame):
+            lines = frame.decode('utf-8').split('\n')
+            return int(lines[0][len('id: '):]), lines[1][len('event: '):], json.loads(lines[2][len('data: '):])
+        
+        try:
+            feed = LiveFeedService(client_buffer_size=2, heartbeat_interval=0.01)
+            feed.pump()
+            stream = feed.stream()
+            assert next(stream) == b'retry: 3000\n\n'
+            assert next(stream) == b': heartbeat\n\n'
+            
+            article_id = CreateArticleService.create_article({
+                'title': 'Live article',
+                'content': 'Live content',
+                'author': 'Live Author',
+                'category': 'Test'
+            })
+            assert feed.pump() == 1
+            seq, event, data = parse(next(stream))
+            assert event == 'created' and data['id'] == article_id
+            assert data['article']['title'] == 'Live article' and data['article']['excerpt'] == 'Live content'
+            
+            ManageArticleService.delete_article(article_id)
+            feed.pump()
+            assert parse(next(stream)) == (seq + 1, 'deleted', {'id': article_id, 'article': None})
+            
+            # A reconnecting client replays what it missed from the change log
+            resumed = feed.stream(seq - 1)
+            next(resumed)
+            assert [parse(next(resumed))[:2] for _ in range(2)] == [(seq, 'created'), (seq + 1, 'deleted')]
+            
+            # Clients more than client_buffer_size frames behind are dropped
+            article_ids = [CreateArticleService.create_article({
+                'title': f'Burst {i}', 'content': 'Burst content', 'author': 'Live Author', 'category': 'Test'
+            }) for i in range(3)]
+            assert feed.pump() == 3
+            for dropped in (stream, resumed):
+                assert list(dropped) == []
+            assert feed.stats()['subscribers'] == 0 and feed.stats()['dropped'] == 2
+            
+            for article_id in article_ids:
+                ArticleQueries.delete_article(article_id)
+            print("✓ Live feed passed")
+            return True
+            
+        except Exception as e:
+            print(f"✗ Live feed failed: {e}")
+            return False
+    
+    def test_change_feed(self):
+        """Test incremental changes since a seq, tombstones and compaction"""
+        try:
+            feed = ChangeFeedService()
+            start = feed.get_changes()['next']
+            article_id = CreateArticleService.create_article({
+                'title': 'Feed article',
+                'content': 'Feed content',
+                'author': 'Feed Author',
+                'category': 'Test'
+            })
+            ManageArticleService.update_article(article_id, {
+                'title': 'Feed article v2',
+                'content': 'Feed content',
+                'author': 'Feed Author',
+                'category': 'Test'
+            })
+            media_id = MediaQueries.create_media({
+                'filename': 'feed.png', 'filepath': '/uploads/feed.png', 'mime_type': 'image/png', 'size': 10
+            })
+            
+            # Changes to one row collapse into its latest state
+            result = feed.get_changes(start)
+            assert [(c['entity'], c['id'], c['action']) for c in result['changes']] == [
+                ('article', article_id, 'updated'), ('media', media_id, 'created')
+            ]
+            assert result['changes'][0]['data']['title'] == 'Feed article v2'
+            assert not result['has_more'] and not result['reset']
+            
+            page = feed.get_changes(start, limit=1, entities=['article'], fields=['id', 'title'])
+            assert page['has_more'] and page['changes'][0]['action'] == 'created'
+            assert page['changes'][0]['data'] == {'id': article_id, 'title': 'Feed article v2'}
+            assert feed.get_changes(page['next'], entities=['article'])['changes'][0]['action'] == 'updated'
+            
+            ArticleQueries.delete_article(article_id)
+            MediaQueries.delete_media(media_id)
+            deletes = feed.get_changes(result['next'])
+            assert [(c['entity'], c['action'], c['data']) for c in deletes['changes']] == [
+                ('article', 'deleted', None), ('media', 'deleted', None)
+            ]
+            assert feed.get_changes(deletes['next'])['changes'] == []
+            
+            # Dropping tombstones leaves earlier positions unable to sync
+            compacted = feed.compact(0, 0)
+            assert compacted['superseded'] >= 3 and compacted['tombstones'] >= 2
+            assert feed.get_changes(start)['reset']
+            assert not feed.get_changes(deletes['next'])['reset']
+            
+            # A seq past the head (e.g. from a recreated database) resets too
+            ahead = feed.get_changes(deletes['next'] + 1000)
+            assert ahead['reset'] and ahead['next'] == deletes['next']
+            
+            # So does reaching a bulk import's reset marker
+            conn = db_connection.get_connection()
+            conn.execute("INSERT INTO change_log (entity, entity_id, action) VALUES ('article', 0, 'reset')")
+            conn.commit()
+            marker = feed.get_changes(deletes['next'])
+            assert marker['reset'] and marker['next'] == deletes['next'] + 1
+            
+            try:
+                feed.get_changes(start, entities=['user'])
+                assert False, 'unknown entity accepted'
+            except ValueError:
+                pass
+            print("✓ Change feed passed")
+            return True
+            
+        except Exception as e:
+            print(f"✗ Change feed failed: {e}")
+            return False
+    
+    def test_prefix_index(self):
+        """Test cached short-prefix lookups agree with a full scan through adds and removes"""
+        try:
+            rng = random.Random(7)
+            words = ['alpha', 'alps', 'amber', 'beta', 'bent', 'apex', 'al', 'b']
+            index = PrefixIndex()
+            texts = {}
+            
+            def expected(prefix, limit):
+                matching = [(score, ref) for ref, (text, score) in texts.items()
+                            if any(key.startswith(prefix) for key in PrefixIndex.keys_for(text))]
+                return [ref for _, ref in sorted(matching, reverse=True)[:limit]]
+            
+            index.load((ref, text, score) for ref, (text, score) in texts.items())
+            for step in range(3000):
+                ref = rng.randrange(150)
+                if rng.random() < 0.3:
+                    texts.pop(ref, None)
+                    index.remove(ref)
+                else:
+                    texts[ref] = (' '.join(rng.choice(words) for _ in range(rng.randint(1, 3))), step)
+                    index.add(ref, *texts[ref])
+                if step % 10 == 0:
+                    for prefix in ('a', 'al', 'alp', 'b', 'be', 'apex', 'alpha a'):
+                        limit = rng.choice((1, 5, 10, 80))
+                        assert index.search(prefix, limit) == expected(prefix, limit), (step, prefix, limit)
+            assert index._top, 'short prefixes not cached'
+            print("✓ Prefix index passed")
+            return True
+            
+        except Exception as e:
+            print(f"✗ Prefix index failed: {e}")
+            return False
+    
+    def test_suggestions(self):
+        """Test typeahead suggestions follow article writes"""
+        try:
+            suggestions = SuggestService()
+            suggestions.build()
+            article_id = CreateArticleService.create_article({
+                'title': 'Quarterly zeppelin report',
+                'content': 'Suggest content',
+                'author': 'Zora Quill',
+                'category': 'Test'
+            })
+            
+            assert suggestions.suggest('zep') == [{'type': 'article', 'id': article_id, 'text': 'Quarterly zeppelin report'}]
+            assert suggestions.suggest('QUARTERLY ZE')[0]['id'] == article_id
+            assert suggestions.suggest('zora') == [{'type': 'author', 'text': 'Zora Quill'}]
+            assert suggestions.suggest('z') == []
+            
+            ManageArticleService.update_article(article_id, {
+                'title': 'Annual zeppelin report',
+                'content': 'Suggest content',
+                'author': 'Zora Quill',
+                'category': 'Test'
+            })
+            assert suggestions.suggest('quarterly') == []
+            assert suggestions.suggest('annual zep')[0]['id'] == article_id
+            
+            ManageArticleService.delete_article(article_id)
+            assert suggestions.suggest('zep') == []
+            assert suggestions.suggest('zora') == []
+            # An event handled after a later one can't bring back the deleted row
+            suggestions._on_article('article', 'updated', article_id)
+            assert suggestions.suggest('zep') == []
+            print("✓ Suggestions passed")
+            return True
+            
+        except Exception as e:
+            print(f"✗ Suggestions failed: {e}")
+            return False
+    
+    def test_bulk_import(self):
+        """Test the backend bulk importer: formats, rejects, batches and deferred indexes"""
+        try:
+            import_news = backend_module('import_news')
+            db_manager = backend_module('database').db_manager
+            db_manager.db_path, db_manager.initialized = self.backend_db_path, False
+            db_manager.init_db()
+            schema = "SELECT name FROM sqlite_master WHERE type = ? AND tbl_name = 'news' ORDER BY name"
+            with db_manager.get_connection() as conn:
+                indexes = conn.execute(schema, ('index',)).fetchall()
+                triggers = conn.execute(schema, ('trigger',)).fetchall()
+            
+            records = [{'title': f'Zeppelin report {i}', 'content': f'Airship sighting number {i}', 'author': 'Importer',
+                        'category': 'Imported', 'created_at': f'2024-03-0{i + 1}T10:00:00+02:00'} for i in range(5)]
+            lines = [json.dumps(record) for record in records] + [
+                'not json',
+                '[1, 2]',
+                json.dumps({'title': 12345, 'content': 'Numeric title is kept as text'}),
+                json.dumps({'title': 'Object author', 'content': 'Rejected for its author', 'author': {'name': 'x'}}),
+                json.dumps({'title': 'Epoch date', 'content': 'Rejected for its date', 'created_at': 1700000000}),
+                json.dumps({'title': 'Short', 'content': 'too short'})
+            ]
+            rejects, progress = io.StringIO(), io.StringIO()
+            before = str(datetime.now())
+            stats = import_news.import_articles(io.StringIO('\n'.join(lines) + '\n'), 'ndjson', batch_size=2,
+                                                rejects=rejects, progress=progress)
+            assert (stats.read, stats.inserted, stats.rejected) == (11, 6, 5)
+            # One transaction per full batch, then the remainder
+            assert [line.split()[0] for line in progress.getvalue().splitlines()[:-1]] == ['2', '4', '6']
+            rejected = [json.loads(line) for line in rejects.getvalue().splitlines()]
+            assert [reject['line'] for reject in rejected] == [6, 7, 9, 10, 11]
+            assert rejected[2]['error'] == 'author must be a string'
+            assert rejected[3]['record']['created_at'] == 1700000000
+            
+            csv_input = io.StringIO('title,content,author,category,created_at\r\n'
+                                    'Zeppelin from CSV,"Airship, sighted in CSV",CSV Author,Imported,2024-04-01\r\n'
+                                    'Bad CSV date,Rejected for its date,,,yesterday\r\n')
+            stats = import_news.import_articles(csv_input, 'csv', defer_indexes=False)
+            assert (stats.read, stats.inserted, stats.rejected) == (2, 1, 1)
+            
+            with db_manager.get_connection() as conn:
+                rows = conn.execute("SELECT title, created_at, updated_at FROM news ORDER BY id").fetchall()
+                assert [row['title'] for row in rows][-3:] == ['Zeppelin report 4', '12345', 'Zeppelin from CSV']
+                # Stored like the app's own datetime.now(): local time, str(datetime)
+                local = str(datetime.fromisoformat('2024-03-01T10:00:00+02:00').astimezone().replace(tzinfo=None))
+                assert (rows[0]['created_at'], rows[0]['updated_at']) == (local, local)
+                assert rows[-1]['created_at'] == '2024-04-01 00:00:00'
+                numeric = next(row for row in rows if row['title'] == '12345')
+                assert before <= numeric['created_at'] <= str(datetime.now()) and numeric['updated_at'] == numeric['created_at']
+                assert conn.execute("SELECT article_count FROM category_article_counts cc "
+                                    "JOIN categories c ON c.id = cc.category_id WHERE c.name = 'Imported'").fetchone()[0] == 6
+                
+                # Indexes are rebuilt and the deferred search indexes cover every imported row
+                assert conn.execute(schema, ('index',)).fetchall() == indexes
+                assert conn.execute(schema, ('trigger',)).fetchall() == triggers
+                conn.execute("INSERT INTO news_fts (news_fts, rank) VALUES ('integrity-check', 1)")
+                assert conn.execute("SELECT COUNT(*) FROM news_fts WHERE news_fts MATCH 'zeppelin'").fetchone()[0] == 6
+                assert conn.execute("SELECT COUNT(*) FROM news_fts WHERE news_fts MATCH 'numeric'").fetchone()[0] == 1
+                if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'news_trigram'").fetchone():
+                    infix = "SELECT COUNT(*) FROM news_trigram WHERE news_trigram MATCH 'eppel'"
+                else:
+                    infix = "SELECT COUNT(DISTINCT news_id) FROM news_trigrams WHERE trigram = 'epp'"
+                assert conn.execute(infix).fetchone()[0] == 6
+                assert conn.execute('PRAGMA integrity_check').fetchone()[0] == 'ok'
+                
+                # Counters are caught up per batch, and the change log gets one reset marker per batch
+                news_count = conn.execute('SELECT COUNT(*) FROM news').fetchone()[0]
+                assert conn.execute("SELECT row_count FROM row_counts WHERE table_name = 'news'").fetchone()[0] == news_count
+                assert conn.execute("SELECT article_count FROM author_article_counts WHERE author = 'Importer'").fetchone()[0] == 5
+                assert [tuple(row) for row in conn.execute("SELECT entity_id, action FROM change_log WHERE entity = 'article'")] == [(0, 'reset')] * 4
+            
+            # A batch interrupted part-way rolls back as a whole, triggers included
+            try:
+                with db_manager.get_connection() as conn:
+                    with import_news.deferred_triggers(conn):
+                        conn.execute(import_news.INSERT_SQL, import_news.record_to_row(records[0], lambda name: None))
+                        raise KeyboardInterrupt
+            except KeyboardInterrupt:
+                pass
+            with db_manager.get_connection() as conn:
+                assert conn.execute(schema, ('trigger',)).fetchall() == triggers
+                assert conn.execute('SELECT COUNT(*) FROM news').fetchone()[0] == news_count
+            
+            print("✓ Bulk import passed")
+            return True
+            
+        except Exception as e:
+            print(f"✗ Bulk import failed: {e}")
+            return False
+    
+    def test_categories_overview(self):
+        """Test the backend category overview: counts, latest dates and previews"""
+        try:
+            import_news = backend_module('import_news')
+            CategoryService = backend_module('services').CategoryService
+            Category = backend_module('models').Category
+            db_manager = backend_module('database').db_manager
+            db_manager.db_path, db_manager.initialized = self.backend_db_path, False
+            
+            records = [{'title': f'Busy article {day}', 'content': 'Overview preview content', 'category': 'Overview Busy',
+                        'created_at': f'2024-05-0{day} 09:00:00'} for day in (2, 3, 1)]
+            records.append({'title': 'Quiet article', 'content': 'Overview preview content', 'category': 'Overview Quiet',
+                            'created_at': '2024-04-01 09:00:00'})
+            stream = io.StringIO(''.join(json.dumps(record) + '\n' for record in records))
+            assert import_news.import_articles(stream, defer_indexes=False).inserted == 4
+            CategoryService.create_category(Category(name='Overview Empty', description=''))
+            
+            overview = CategoryService.get_categories_overview()
+            assert [c['name'] for c in overview] == sorted(c['name'] for c in overview)
+            by_name = {c['name']: c for c in overview}
+            assert (by_name['Overview Busy']['article_count'], by_name['Overview Busy']['latest_article_at']) == (3, '2024-05-03 09:00:00')
+            assert (by_name['Overview Quiet']['article_count'], by_name['Overview Quiet']['latest_article_at']) == (1, '2024-04-01 09:00:00')
+            assert (by_name['Overview Empty']['article_count'], by_name['Overview Empty']['latest_article_at']) == (0, None)
+            assert 'latest_articles' not in by_name['Overview Busy']
+            
+            # Previews are the newest articles per category, cut at preview_limit
+            by_name = {c['name']: c for c in CategoryService.get_categories_overview(preview_limit=2)}
+            busy = by_name['Overview Busy']['latest_articles']
+            assert [article['title'] for article in busy] == ['Busy article 3', 'Busy article 2']
+            assert busy[0]['excerpt'] == 'Overview preview content' and 'category_name' not in busy[0]
+            assert [article['title'] for article in by_name['Overview Quiet']['latest_articles']] == ['Quiet article']
+            assert by_name['Overview Empty']['latest_articles'] == []
+            
+            print("✓ Categories overview passed")
+            return True
+            
+        except Exception as e:
+            print(f"✗ Categories overview failed: {e}")
+            return False
+    
+    def test_backend_news_cache(self):
+        """Test that the backend serves cached articles as encoded JSON"""
+        try:
+            services = backend_module('services')
+            NewsController = backend_module('controllers').NewsController
+            News = backend_module('models').News
+            db_manager = backend_module('database').db_manager
+            db_manager.db_path, db_manager.initialized = self.backend_db_path, False
+            
+            news_id = services.NewsService.create_news(News(title='Cached story', content='Served from the cache',
+                                                            author='Cache', category='Cached'))
+            services.news_cache.clear()
+            status, first = NewsController.get_news_by_id(news_id)
+            assert status == 200 and isinstance(first, RawJSON)
+            misses = services.news_cache.stats()['misses']
+            status, second = NewsController.get_news_by_id(news_id)
+            assert status == 200 and second.body == first.body
+            assert services.news_cache.stats()['misses'] == misses
+            
+            payload = json.loads(second.body)
+            assert payload['success'] and payload['data']['title'] == 'Cached story'
+            assert payload['data']['category'] == 'Cached'
+            
+            # Updates and deletes drop the cached bytes
+            services.NewsService.update_news(news_id, News(title='Cached story, revised', content='Served from the cache',
+                                                           author='Cache', category='Cached'))
+            assert json.loads(NewsController.get_news_by_id(news_id)[1].body)['data']['title'] == 'Cached story, revised'
+            services.NewsService.delete_news(news_id)
+            assert NewsController.get_news_by_id(news_id)[0] == 404
+            print("✓ Backend news cache passed")
+            return True
+            
+        except Exception as e:
+            print(f"✗ Backend news cache failed: {e}")
+            return False
+    
     def cleanup(self):
         """Clean up test database"""
         try:
+            change_log.close()
             close_db()
-            if os.path.exists(self.test_db_path):
-                os.remove(self.test_db_path)
+            for path in (self.test_db_path, self.backend_db_path):
+                if os.path.exists(path):
+                    os.remove(path)
             print("✓ Test database cleaned up")
         except Exception as e:
             print(f"✗ Cleanup failed: {e}")
@@ -233,7 +1374,31 @@ class DatabaseBasicTest:
             self.test_category_operations,
             self.test_media_operations,
             self.test_search_operations,
-            self.test_statistics
+            self.test_statistics,
+            self.test_query_instrumentation,
+            self.test_keyset_pagination,
+            self.test_row_counters,
+            self.test_category_foreign_key,
+            self.test_full_text_search,
+            self.test_infix_search,
+            self.test_search_facets,
+            self.test_listing_engine,
+            self.test_search_cache,
+            self.test_response_cache,
+            self.test_etags,
+            self.test_json_encoding,
+            self.test_row_serialization,
+            self.test_article_cache,
+            self.test_hot_set,
+            self.test_export,
+            self.test_change_log,
+            self.test_live_feed,
+            self.test_change_feed,
+            self.test_prefix_index,
+            self.test_suggestions,
+            self.test_bulk_import,
+            self.test_categories_overview,
+            self.test_backend_news_cache
         ]
         
         passed = 0